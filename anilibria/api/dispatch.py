@@ -1,32 +1,318 @@
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, deque
+from enum import Enum
+from itertools import count
 from logging import getLogger
-from typing import Callable, Coroutine, Dict, List
+from typing import Callable, Coroutine, Dict, Hashable, List
+
+from .models.attrs_utils import define
 
 log = getLogger("anilibria.dispatch")
-__all__ = ("Dispatch",)
+__all__ = ("Dispatch", "OverflowPolicy", "DispatchStats")
 
 
-class Dispatch:
+class OverflowPolicy(Enum):
+    """
+    Представляет поведение диспетчера при заполненной очереди
+    """
+
+    BLOCK = "block"
+    """
+    Источник событий приостанавливается, пока в очереди не освободится место: чтение вебсокета,
+    опрос API, воспроизведение записи и запрос пропущенных обновлений.
+    Вызовы из обычного кода, например :meth:`Dispatch.call` или сброс :class:`EventCoalescer`,
+    не могут ждать и добавляются в очередь сверх ``queue_size``.
+    """
+    DROP_OLDEST = "drop_oldest"
+    "Из очереди удаляется самый старый вызов"
+    DROP_NEWEST = "drop_newest"
+    "Новый вызов не попадает в очередь"
+
+
+@define()
+class DispatchStats:
+    """
+    Статистика диспетчера событий
+    """
+
+    queue_depth: int = 0
+    "Количество вызовов обработчиков во всех очередях"
+    max_queue_depth: int = 0
+    "Наибольшее количество вызовов во всех очередях за всё время"
+    running: int = 0
+    "Количество выполняющихся обработчиков"
+    dropped: int = 0
+    "Количество вызовов, удалённых из-за переполнения очереди"
+
+
+def get_title_key(args: tuple) -> Hashable | None:
+    """
+    Возвращает ID тайтла, к которому относится событие
+    """
+    return getattr(args[0], "title_id", None) if args else None
+
+
+class _Lane:
     def __init__(self) -> None:
+        self.queue: deque[tuple[Callable[..., Coroutine], tuple]] = deque()
+        self.changed: asyncio.Event = asyncio.Event()
+
+
+class Dispatch:
+    """
+    Диспетчер событий.
+
+    По умолчанию каждый обработчик запускается в отдельной задаче.
+    Если указать ``max_workers``, обработчики выполняются ограниченным количеством задач из общей очереди.
+
+    С ``keyed=True`` у каждой задачи своя очередь, а события распределяются по ID тайтла.
+    События одного тайтла обрабатываются строго по очереди, события разных тайтлов - одновременно.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(
+           dispatch=Dispatch(max_workers=16, queue_size=1000, overflow=OverflowPolicy.DROP_OLDEST)
+       )
+
+    :param int | None max_workers: Максимальное количество одновременно выполняющихся обработчиков.
+    :param int queue_size: Максимальное количество вызовов в очереди. 0 - без ограничений.
+        С ``keyed=True`` ограничение относится к очереди каждой задачи.
+    :param OverflowPolicy overflow: Что делать при заполненной очереди.
+    :param bool keyed: Обрабатывать ли события одного тайтла по порядку. Требует ``max_workers``.
+    :param key: Функция, возвращающая ключ по аргументам события. По умолчанию - ID тайтла.
+        События с ключом ``None`` распределяются по задачам равномерно.
+
+    Обработчики, зарегистрированные с ``internal=True``, всегда запускаются в отдельных задачах:
+    на них не действуют ни ``max_workers``, ни политика переполнения.
+    Так библиотека поддерживает кеш, хранилище и индекс в актуальном состоянии.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        queue_size: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        keyed: bool = False,
+        key: Callable[[tuple], Hashable | None] = get_title_key,
+    ) -> None:
+        if keyed and max_workers is None:
+            raise ValueError("keyed dispatch requires max_workers")
+
         self._registered_events: Dict[str, List[Callable[..., Coroutine]]] = defaultdict(list)
+        self._raw_events: Dict[str, List[Callable[..., Coroutine]]] = defaultdict(list)
+        # Обработчики библиотеки, которые не должны теряться при переполнении очереди
+        self._internal_events: Dict[str, List[Callable[..., Coroutine]]] = defaultdict(list)
+        self._internal_raw_events: Dict[str, List[Callable[..., Coroutine]]] = defaultdict(list)
 
-    @staticmethod
-    async def _call(coro: Callable[..., Coroutine], *args):
+        self.max_workers: int | None = max_workers
+        self.queue_size: int = queue_size
+        self.overflow: OverflowPolicy = overflow
+        self.keyed: bool = keyed
+        self.key: Callable[[tuple], Hashable | None] = key
+
+        self._tasks: set[asyncio.Task] = set()
+        self._workers: list[asyncio.Task] = []
+        self._lanes: list[_Lane] = [_Lane() for _ in range(max_workers if keyed else 1)]
+        self._round_robin: count = count()
+
+        self._running: int = 0
+        # Устанавливается после каждого завершённого вызова, по нему ждёт `join`
+        self._finished: asyncio.Event = asyncio.Event()
+        self._dropped: int = 0
+        # Количество вызовов во всех очередях
+        self._queued: int = 0
+        self._max_queue_depth: int = 0
+
+    @property
+    def stats(self) -> DispatchStats:
+        return DispatchStats(
+            queue_depth=self._queued,
+            max_queue_depth=self._max_queue_depth,
+            running=self._running,
+            dropped=self._dropped,
+        )
+
+    async def _call(self, coro: Callable[..., Coroutine], *args):
+        self._running += 1
         try:
             await coro(*args)
         except Exception:  # noqa
             log.exception("")
+        finally:
+            self._running -= 1
+            self._finished.set()
+
+    def has_listeners(self, name: str, *, raw: bool | None = None) -> bool:
+        """
+        Есть ли у события обработчики.
+
+        :param str name: Название события.
+        :param bool | None raw: ``True`` - только обработчики сырых данных, ``False`` - только обработчики
+            объектов событий, ``None`` - любые.
+        """
+        if raw is None:
+            return self.has_listeners(name, raw=False) or self.has_listeners(name, raw=True)
+
+        if raw:
+            return bool(self._raw_events.get(name) or self._internal_raw_events.get(name))
+        return bool(self._registered_events.get(name) or self._internal_events.get(name))
 
     def call(self, name: str, *args):
         log.debug(f"Dispatching event {name}")
 
-        for coro in self._registered_events.get(name, []):
-            asyncio.create_task(self._call(coro, *args))
+        if coros := self._internal_events.get(name):
+            self._run_internal(coros, args)
+        if coros := self._registered_events.get(name):
+            self._dispatch(coros, args)
 
-    def register(self, name: str, coro: Callable[..., Coroutine]):
-        self._registered_events[name].append(coro)
+    def call_raw(self, name: str, data: dict):
+        """
+        Вызывает обработчики, зарегистрированные с ``raw=True``, передавая им словарь события.
+        """
+        log.debug(f"Dispatching raw event {name}")
 
-        log.debug(
-            f"Added coro to {name} event. Total coros for this event: {self._registered_events[name]}"
-        )
+        if coros := self._internal_raw_events.get(name):
+            self._run_internal(coros, (data,))
+        if coros := self._raw_events.get(name):
+            self._dispatch(coros, (data,))
+
+    def _run_internal(self, coros: List[Callable[..., Coroutine]], args: tuple):
+        for coro in coros:
+            self._create_task(self._call(coro, *args))
+
+    def _dispatch(self, coros: List[Callable[..., Coroutine]], args: tuple):
+        if self.max_workers is None:
+            for coro in coros:
+                self._create_task(self._call(coro, *args))
+            return
+
+        lane = self._get_lane(args)
+        for coro in coros:
+            self._enqueue(lane, coro, args)
+
+    def _get_lane(self, args: tuple) -> _Lane:
+        if not self.keyed:
+            return self._lanes[0]
+
+        if (key := self.key(args)) is None:
+            return self._lanes[next(self._round_robin) % len(self._lanes)]
+
+        return self._lanes[hash(key) % len(self._lanes)]
+
+    def _create_task(self, coro: Coroutine) -> asyncio.Task:
+        # Храним ссылки на задачи, иначе сборщик мусора может удалить их до завершения
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _start_workers(self):
+        if self.keyed:
+            self._workers = [self._create_task(self._worker(lane)) for lane in self._lanes]
+        else:
+            lane = self._lanes[0]
+            self._workers = [self._create_task(self._worker(lane)) for _ in range(self.max_workers)]
+
+    def _enqueue(self, lane: _Lane, coro: Callable[..., Coroutine], args: tuple):
+        if not self._workers:
+            self._start_workers()
+
+        if self.queue_size and len(lane.queue) >= self.queue_size:
+            if self.overflow is OverflowPolicy.DROP_NEWEST:
+                self._dropped += 1
+                return
+            if self.overflow is OverflowPolicy.DROP_OLDEST:
+                lane.queue.popleft()
+                self._queued -= 1
+                self._dropped += 1
+            # При OverflowPolicy.BLOCK источники событий ждут в `wait_for_capacity`
+
+        lane.queue.append((coro, args))
+        self._queued += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queued)
+        lane.changed.set()
+
+    async def _worker(self, lane: _Lane):
+        while True:
+            while not lane.queue:
+                lane.changed.clear()
+                await lane.changed.wait()
+
+            coro, args = lane.queue.popleft()
+            self._queued -= 1
+            lane.changed.set()
+
+            await self._call(coro, *args)
+
+    async def wait_for_capacity(self):
+        """
+        Ждёт, пока во всех очередях не появится место. Используется только с :attr:`OverflowPolicy.BLOCK`.
+        """
+        if self.max_workers is None or not self.queue_size:
+            return
+        if self.overflow is not OverflowPolicy.BLOCK:
+            return
+
+        for lane in self._lanes:
+            while len(lane.queue) >= self.queue_size:
+                lane.changed.clear()
+                await lane.changed.wait()
+
+    async def join(self):
+        """
+        Ждёт, пока очереди опустеют и все запущенные обработчики завершатся,
+        включая вызванные из других обработчиков. Обработчик, который сам ждёт ``join``, не учитывается.
+        """
+        current = asyncio.current_task()
+
+        while True:
+            if tasks := self._tasks.difference(self._workers, (current,)):
+                await asyncio.wait(tasks)
+                continue
+
+            own = 1 if current in self._tasks else 0
+            if not self._queued and self._running <= own:
+                return
+
+            self._finished.clear()
+            await self._finished.wait()
+
+    async def close(self):
+        """
+        Останавливает обработчики очереди. Вызовы, оставшиеся в очереди, отбрасываются.
+        Чтобы сначала обработать их, вызовите :meth:`join`.
+        """
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+        for lane in self._lanes:
+            lane.queue.clear()
+        self._queued = 0
+
+    def register(
+        self,
+        name: str,
+        coro: Callable[..., Coroutine],
+        *,
+        raw: bool = False,
+        internal: bool = False,
+    ):
+        """
+        Регистрирует обработчик события.
+
+        :param str name: Название события.
+        :param Callable[..., Coroutine] coro: Обработчик.
+        :param bool raw: Передавать ли обработчику словарь из вебсокета вместо объекта события.
+        :param bool internal: Запускать ли обработчик вне очереди. Используется обработчиками библиотеки.
+        """
+        if internal:
+            events = self._internal_raw_events if raw else self._internal_events
+        else:
+            events = self._raw_events if raw else self._registered_events
+        events[name].append(coro)
+
+        log.debug(f"Added coro to {name} event. Total coros for this event: {events[name]}")
@@ -1,2 +1,9 @@
 from .client import *  # noqa: F401 F403
+from .coalesce import *  # noqa: F401 F403
 from .events import *  # noqa: F401 F403
+from .polling import *  # noqa: F401 F403
+from .reconnect import *  # noqa: F401 F403
+from .recovery import *  # noqa: F401 F403
+from .replay import *  # noqa: F401 F403
+from .sharding import *  # noqa: F401 F403
+from .workers import *  # noqa: F401 F403
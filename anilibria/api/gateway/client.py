@@ -1,30 +1,69 @@
 import asyncio
+from functools import partial
 from logging import getLogger
+from time import monotonic
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
 
-from aiohttp import ClientWebSocketResponse, WSMessage, WSMsgType
+from aiohttp import ClientError, ClientWebSocketResponse, WSMessage, WSMsgType
 from orjson import dumps, loads
 
 from ...const import __api_url__
 from ..dispatch import Dispatch
 from ..http import HTTPClient
+from ..models import Title
 from ..models.cattrs_utils import converter
-from .events import Connect, EventType, Subscription
+from .coalesce import EventCoalescer, get_batch_name
+from .events import BaseEvent, Connect, Disconnect, EventType, Reconnect, Subscription, TitleUpdate
+from .reconnect import ReconnectPolicy, ReconnectStats
+from .recovery import GapRecovery
+
+if TYPE_CHECKING:
+    from .replay import FrameRecorder
+    from .workers import ProcessDecoder
 
 log = getLogger("anilibria.gateway")
 URL = f"wss://{__api_url__}/ws/"
 __all__ = ("GatewayClient",)
 
+RECONNECT_ERRORS = (ClientError, ConnectionError, asyncio.TimeoutError)
+
 
 class GatewayClient:
-    def __init__(self, http: HTTPClient):
+    def __init__(
+        self,
+        http: HTTPClient,
+        dispatch: Dispatch | None = None,
+        coalescer: EventCoalescer | None = None,
+        reconnect_policy: ReconnectPolicy | None = None,
+        gap_recovery: GapRecovery | None = None,
+        decoder: "ProcessDecoder | None" = None,
+        url: str | None = None,
+        recorder: "FrameRecorder | None" = None,
+        fetch_gap: Callable[[int], AsyncIterator[Title]] | None = None,
+    ):
         self._connection: ClientWebSocketResponse | None = None
         self._closed: bool = False
         self._stopped: bool = False
 
         self._http: HTTPClient = http
-        self.dispatch: Dispatch = Dispatch()
+        self.url: str = url or URL
+        self.dispatch: Dispatch = dispatch or Dispatch()
+        self.coalescer: EventCoalescer | None = coalescer
+        self.reconnect_policy: ReconnectPolicy = reconnect_policy or ReconnectPolicy()
+        self.stats: ReconnectStats = ReconnectStats()
+        self.gap_recovery: GapRecovery | None = gap_recovery
+        self.decoder: "ProcessDecoder | None" = decoder
+        self.recorder: "FrameRecorder | None" = recorder
+        # Возвращает тайтлы, изменённые с указанного времени. Нужна для GapRecovery
+        self.fetch_gap: Callable[[int], AsyncIterator[Title]] | None = fetch_gap
 
         self._started_up: bool = False
+        self._subscriptions: list[dict] = []
+        self._connected: bool = False
+        self._disconnected_at: float | None = None
+        self._failed_attempts: int = 0
+        self._established: bool = False
+        self._recovery_tasks: set[asyncio.Task] = set()
 
     @property
     def loop(self):
@@ -35,46 +74,181 @@ class GatewayClient:
 
         return loop
 
-    async def start(self):
-        await self.connect()
+    async def start(self, *, reconnect: bool = True):
+        """
+        Подключается к вебсокету и переподключается при потере соединения.
+
+        :param bool reconnect: Переподключаться ли при потере соединения.
+        """
+        self._stopped = False
+        attempt = 0
+
+        while not self._stopped:
+            try:
+                await self.connect()
+            except RECONNECT_ERRORS as error:
+                # Соединение было установлено, поэтому отсчёт попыток начинается заново
+                if self._established:
+                    attempt = 0
+                if not reconnect or not self.reconnect_policy.can_retry(attempt):
+                    raise
+                if not self._established:
+                    self.stats.failed_attempts += 1
+                    self._failed_attempts += 1
+                log.warning(f"Websocket connection failed: {error!r}")
+            else:
+                if not reconnect:
+                    return
+
+            if self._stopped:
+                return
+
+            if self._established:
+                attempt = 0
+
+            delay = self.reconnect_policy.get_delay(attempt)
+            attempt += 1
+            log.debug(f"Reconnecting in {delay:.2f} seconds (attempt {attempt})")
+            await asyncio.sleep(delay)
 
     async def close(self):
+        self._stopped = True
+        for task in self._recovery_tasks:
+            task.cancel()
+        await asyncio.gather(*self._recovery_tasks, return_exceptions=True)
         if self._connection is not None:
             await self._connection.close()
+        if self.decoder is not None:
+            await self.decoder.close()
+        if self.recorder is not None:
+            await self.recorder.close()
+        if self.coalescer is not None:
+            self.coalescer.flush_all(self.dispatch)
+        # Доставляем последние пачки событий до остановки очереди
+        await self.dispatch.join()
+        await self.dispatch.close()
 
     async def connect(self):
+        self._established = False
 
         if (session := self._http.session) is None or session.closed:
             session = await self._http.create_session()
 
-        async with session.ws_connect(URL) as self._connection:
+        heartbeat = self.reconnect_policy.heartbeat
+        async with session.ws_connect(self.url, heartbeat=heartbeat) as self._connection:
             self._closed = self._connection.closed
+            self._on_connected()
+
+            try:
+                await self._resubscribe()
+                await self._listen()
+            except RECONNECT_ERRORS as error:
+                self._on_disconnected(self._connection.close_code, repr(error))
+                raise
+            else:
+                error = self._connection.exception()
+                reason = repr(error) if error is not None else "Connection closed"
+                self._on_disconnected(self._connection.close_code, reason)
+
+    async def _listen(self):
+        if not self._started_up:
+            self.dispatch.call("on_startup")
+            self._started_up = True
+
+        while not self._closed:
+            text = await self._receive_data()
+
+            # Possible only when connection was closed
+            if isinstance(text, WSMessage):
+                return
+            if text is None:
+                continue
+
+            await self._handle_text(text)
+            await self.dispatch.wait_for_capacity()
+
+    def _on_connected(self):
+        self._connected = self._established = True
+        self.stats.connects += 1
+        if self.gap_recovery is not None:
+            self.gap_recovery.start()
+            self._start_recovery()
+        failed_attempts, self._failed_attempts = self._failed_attempts, 0
+
+        if self._disconnected_at is None:
+            return
 
-            if not self._started_up:
-                self.dispatch.call("on_startup")
-                self._started_up = True
+        downtime = monotonic() - self._disconnected_at
+        self.stats.reconnects += 1
+        self.stats.downtime += downtime
+        log.info(f"Websocket reconnected after {downtime:.2f} seconds")
 
-            data = await self._receive_data()
+        self.dispatch.call(
+            "on_reconnect", Reconnect(attempts=failed_attempts + 1, downtime=downtime)
+        )
+        self._disconnected_at = None
 
-            # Information about opened connection
-            if data.get("connection") == "success":
-                self.dispatch.call("on_connect", converter.structure(data, Connect))
+    def _start_recovery(self):
+        if self.fetch_gap is None or (since := self.gap_recovery.end_gap()) is None:
+            return
 
-            while not self._closed:
-                data = await self._receive_data()
+        # Восстановление выполняется вне обработчиков диспетчера: ожидание места в очереди
+        # из обработчика занимает задачу, которая должна эту очередь освобождать
+        task = asyncio.create_task(self._recover_gap(since))
+        self._recovery_tasks.add(task)
+        task.add_done_callback(self._recovery_tasks.discard)
 
-                # Possible only when connection was closed
-                if isinstance(data, WSMessage):
-                    return
-                if not data:
+    async def _recover_gap(self, since: int):
+        recovery = self.gap_recovery
+        log.debug("Requesting title updates missed since %s", since)
+
+        try:
+            async for title in self.fetch_gap(since):
+                timestamp = getattr(title, recovery.source.value)
+                if not recovery.track(title.id, timestamp, recovered=True):
                     continue
+                # Обработчикам сырых данных, в том числе кешу и хранилищу, тоже нужны пропущенные тайтлы
+                if self.dispatch.has_listeners("on_title_update", raw=True):
+                    self.dispatch.call_raw(
+                        "on_title_update",
+                        {"title": converter.unstructure(title), "diff": {}, "recovered": True},
+                    )
+                self.dispatch_event("on_title_update", TitleUpdate(title=title, recovered=True))
+                await self.dispatch.wait_for_capacity()
+        except Exception:  # noqa
+            log.exception("Failed to recover missed title updates")
+
+    def _on_disconnected(self, code: int | None, reason: str):
+        if not self._connected:
+            return
+
+        self._connected = False
+        self._disconnected_at = monotonic()
+        if self.gap_recovery is not None:
+            self.gap_recovery.begin_gap()
+
+        if self._stopped:
+            return
 
-                self._track_data(data)
+        self.stats.disconnects += 1
+        self.stats.last_disconnect_reason = reason
+        log.warning(f"Websocket disconnected with code {code}: {reason}")
 
-    async def _receive_data(self) -> dict | WSMessage | None:
-        response = await self._connection.receive()
+        self.dispatch.call("on_disconnect", Disconnect(code=code, reason=reason))
 
-        if response.type in {WSMsgType.CLOSING, WSMsgType.CLOSED, WSMsgType.CLOSE}:
+    async def _receive_data(self) -> str | WSMessage | None:
+        try:
+            response = await self._connection.receive(self.reconnect_policy.receive_timeout)
+        except asyncio.TimeoutError:
+            self.stats.stalls += 1
+            log.warning(
+                f"No messages received for {self.reconnect_policy.receive_timeout} seconds. "
+                f"Closing the connection"
+            )
+            await self._connection.close()
+            raise
+
+        if response.type in {WSMsgType.CLOSING, WSMsgType.CLOSED, WSMsgType.CLOSE, WSMsgType.ERROR}:
             self._closed = True
             return response
 
@@ -84,31 +258,110 @@ class GatewayClient:
             log.debug(f"Unexpected message's data: {response.data}")
             return
 
-        return response.json(loads=loads)
+        return response.data
+
+    async def _handle_text(self, text: str):
+        if self.decoder is None:
+            return self._handle_frame(text, loads(text))
+
+        # Сообщение разбирается и преобразуется в объект вне цикла событий,
+        # а результат возвращается в порядке получения сообщений
+        await self.decoder.submit(
+            text, self._get_structured_types(), partial(self._handle_frame, text)
+        )
+
+    def _handle_frame(self, text: str, data: Any, event: BaseEvent | None = None):
+        if not self._accept(data, text):
+            return
+        if self.recorder is not None:
+            self.recorder.write(text)
+        if not isinstance(data, dict) or not data:
+            return
+
+        # Information about opened connection
+        if data.get("connection") == "success":
+            return self.dispatch.call("on_connect", converter.structure(data, Connect))
+
+        self._track_data(data, event)
+
+    def _accept(self, data: Any, text: str) -> bool:
+        return True
 
-    def _track_data(self, data: dict):
-        log.debug(
-            f"Received an event with data {data}",
+    def _get_structured_types(self) -> frozenset[str]:
+        # Типы событий, которые нужно преобразовать в объекты для обработчиков
+        return frozenset(
+            event_type.name.lower()
+            for event_type in EventType
+            if event_type.value is not None and self._needs_object(f"on_{event_type.name.lower()}")
         )
 
+    def _needs_object(self, name: str) -> bool:
+        return self.dispatch.has_listeners(name, raw=False) or self._has_batch_listeners(name)
+
+    def _track_data(self, data: dict, event: BaseEvent | None = None):
+        log.debug("Received an event with data %s", data)
+
         type: str
         if not (type := data.get("type")):
             return self._track_unknown_event(data)
 
+        if type == "title_update" and self.gap_recovery is not None:
+            if not self.gap_recovery.track_raw(data["data"]):
+                return
+
+        name = f"on_{type}"
+        needs_object = self._needs_object(name)
+        # Не тратим время на преобразование событий, которые никто не слушает
+        if not needs_object and not self.dispatch.has_listeners(name, raw=True):
+            return
+
         event_model = EventType[type.upper()].value
 
         if event_model is None:
             return log.warning(f"Received a not excepted event `{type}`!")
 
-        obj = converter.structure(data["data"], event_model)
-        self.dispatch.call(f"on_{type}", obj)
+        self.dispatch.call_raw(name, data["data"])
+
+        if not needs_object:
+            return
+
+        # С ProcessDecoder событие уже преобразовано в другом процессе
+        if event is None:
+            event = converter.structure(data["data"], event_model)
+        self.dispatch_event(name, event)
+
+    def dispatch_event(self, name: str, obj: BaseEvent):
+        """
+        Передаёт объект события обработчикам, в том числе через :class:`EventCoalescer`.
+        """
+        if self.coalescer is not None and self.coalescer.handles(self.dispatch, name):
+            self.coalescer.push(self.dispatch, name, obj)
+        else:
+            self.dispatch.call(name, obj)
+
+    def _has_batch_listeners(self, name: str) -> bool:
+        if self.coalescer is None:
+            return False
+        return self.dispatch.has_listeners(get_batch_name(name), raw=False)
 
     def _track_unknown_event(self, data: dict):
-        if "subscribe" in data:
+        if "subscribe" not in data:
+            return
+
+        self.dispatch.call_raw("on_subscription", data)
+        if self.dispatch.has_listeners("on_subscription", raw=False):
             self.dispatch.call("on_subscription", converter.structure(data, Subscription))
 
     async def _send_message(self, data: dict):
         await self._connection.send_bytes(dumps(data))
 
     async def subscribe(self, data: dict):
-        await self._send_message(data)
+        # Подписки отправляются заново после переподключения
+        self._subscriptions.append(data)
+
+        if self._connection is not None and not self._connection.closed:
+            await self._send_message(data)
+
+    async def _resubscribe(self):
+        for data in self._subscriptions:
+            await self._send_message(data)
@@ -0,0 +1,132 @@
+import asyncio
+from itertools import count
+from logging import getLogger
+from typing import Callable, Hashable, Type
+
+from ..dispatch import Dispatch
+from .events import BaseEvent, EncodeProgress, EventType
+
+log = getLogger("anilibria.coalesce")
+__all__ = ("EventCoalescer", "get_batch_name")
+
+
+def get_batch_name(name: str) -> str:
+    """
+    Возвращает название события, которое получает список событий ``name`` за окно.
+    Например: ``on_encode_progress`` -> ``on_encode_progress_batch``.
+    """
+    return f"{name}_batch"
+
+
+def _get_encode_key(event: EncodeProgress) -> Hashable:
+    return event.id, event.episode
+
+
+DEFAULT_KEYS: dict[Type[BaseEvent], Callable[[BaseEvent], Hashable]] = {
+    EncodeProgress: _get_encode_key,
+}
+
+
+class _Window:
+    def __init__(self, handle: asyncio.TimerHandle) -> None:
+        self.handle: asyncio.TimerHandle = handle
+        self.events: dict[Hashable, BaseEvent] = {}
+
+
+class EventCoalescer:
+    """
+    Собирает события за окно времени перед тем, как передать их диспетчеру.
+
+    Для событий из ``keys`` за окно остаётся только последнее событие с каждым ключом.
+    Обычные обработчики таких событий вызываются в конце окна.
+
+    Обработчики, зарегистрированные с ``batch=True``, получают список событий за окно.
+    Для событий не из ``keys`` обычные обработчики по-прежнему вызываются сразу.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(coalescer=EventCoalescer(window=2))
+
+       @client.on(EncodeProgress, batch=True)
+       async def progress(events: list[EncodeProgress]):
+           ...
+
+    :param float window: Длительность окна в секундах.
+    :param dict | None keys: Функции, возвращающие ключ события, для событий, которые нужно объединять.
+        По умолчанию :class:`EncodeProgress` объединяются по ``id`` и ``episode``.
+    :param int max_size: Максимальное количество событий в окне. При достижении окно закрывается раньше.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float = 1.0,
+        keys: dict[Type[BaseEvent], Callable[[BaseEvent], Hashable]] | None = None,
+        max_size: int = 1000,
+    ) -> None:
+        self.window: float = window
+        self.max_size: int = max_size
+        self.keys: dict[str, Callable[[BaseEvent], Hashable]] = {
+            "on_" + EventType(event).name.lower(): key
+            for event, key in (DEFAULT_KEYS if keys is None else keys).items()
+        }
+
+        self._windows: dict[str, _Window] = {}
+        self._counter: count = count()
+
+        self.received: int = 0
+        "Количество полученных событий"
+        self.delivered: int = 0
+        "Количество событий, переданных обработчикам после объединения"
+
+    def handles(self, dispatch: Dispatch, name: str) -> bool:
+        """
+        Нужно ли передавать событие через объединитель.
+        """
+        return name in self.keys or dispatch.has_listeners(get_batch_name(name), raw=False)
+
+    def push(self, dispatch: Dispatch, name: str, event: BaseEvent):
+        self.received += 1
+
+        if (get_key := self.keys.get(name)) is None:
+            self.delivered += 1
+            dispatch.call(name, event)
+            key = next(self._counter)
+        else:
+            key = get_key(event)
+
+        if (window := self._windows.get(name)) is None:
+            handle = asyncio.get_running_loop().call_later(self.window, self.flush, dispatch, name)
+            window = self._windows[name] = _Window(handle)
+
+        # Событие переносится в конец, чтобы порядок соответствовал последним обновлениям
+        window.events.pop(key, None)
+        window.events[key] = event
+
+        if len(window.events) >= self.max_size:
+            self.flush(dispatch, name)
+
+    def flush(self, dispatch: Dispatch, name: str):
+        """
+        Закрывает окно события и передаёт накопленные события обработчикам.
+        """
+        if (window := self._windows.pop(name, None)) is None:
+            return
+
+        window.handle.cancel()
+        events = list(window.events.values())
+        log.debug(f"Flushing {len(events)} {name} events")
+
+        if name in self.keys:
+            self.delivered += len(events)
+            for event in events:
+                dispatch.call(name, event)
+
+        dispatch.call(get_batch_name(name), events)
+
+    def flush_all(self, dispatch: Dispatch):
+        """
+        Закрывает все окна. Вызывается при закрытии клиента.
+        """
+        for name in list(self._windows):
+            self.flush(dispatch, name)
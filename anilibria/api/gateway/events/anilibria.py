@@ -1,13 +1,13 @@
 from enum import Enum
 from typing import Optional
 
-from cattrs.gen import make_dict_structure_fn, make_dict_unstructure_fn, override
+from cattrs.gen import make_dict_unstructure_fn, override
 
 from ...models import Episode, Player, Title, Torrents
 from ...models.attrs_utils import define
-from ...models.cattrs_utils import converter
+from ...models.cattrs_utils import converter, make_structure_hook
 from .base import BaseEvent
-from .internal import Connect, TitleEpisode
+from .internal import Connect, Disconnect, Reconnect, TitleEpisode
 
 __all__ = (
     "EncodeStart",
@@ -33,6 +33,10 @@ class _BaseEncodeEvent(BaseEvent):
     episode: str
     "Номер эпизода"
 
+    @property
+    def title_id(self) -> int | None:
+        return int(self.id) if self.id else None
+
 
 @define()
 class _EncodeEvent(_BaseEncodeEvent):
@@ -134,6 +138,10 @@ class PlaylistUpdate(BaseEvent):
     reupload: bool | None = None
     "Является ли это перезаливом"
 
+    @property
+    def title_id(self) -> int | None:
+        return self.id
+
 
 @define()
 class TitleUpdate(BaseEvent):
@@ -152,6 +160,12 @@ class TitleUpdate(BaseEvent):
     "Объект тайтла"
     diff: dict = None
     "Предыдущие значения тайтла"
+    recovered: bool = False
+    "Было ли обновление пропущено во время переподключения и получено через API"
+
+    @property
+    def title_id(self) -> int | None:
+        return self.title.id if self.title is not None else None
 
 
 @define()
@@ -176,6 +190,10 @@ class TorrentUpdate(BaseEvent):
     diff: dict = None
     "Предыдущие значения"
 
+    @property
+    def title_id(self) -> int | None:
+        return int(self.id) if self.id else None
+
 
 @define()
 class Subscription(BaseEvent):
@@ -214,6 +232,8 @@ class EventType(Enum):
     # Internal events
     TITLE_EPISODE = TitleEpisode
     CONNECT = Connect
+    DISCONNECT = Disconnect
+    RECONNECT = Reconnect
 
 
 # Hooks
@@ -221,9 +241,7 @@ class EventType(Enum):
 unstruct_hook = make_dict_unstructure_fn(
     EncodeStart, converter, is_reupload=override(rename="isReupload")
 )
-struct_hook = make_dict_structure_fn(
-    EncodeStart, converter, is_reupload=override(rename="isReupload")
-)
+struct_hook = make_structure_hook(EncodeStart, is_reupload=override(rename="isReupload"))
 
 converter.register_unstructure_hook(EncodeStart, unstruct_hook)
 converter.register_structure_hook(EncodeStart, struct_hook)
@@ -5,4 +5,9 @@ __all__ = ("BaseEvent",)
 
 @define()
 class BaseEvent:
-    ...
+    @property
+    def title_id(self) -> int | None:
+        """
+        Возвращает ID тайтла, к которому относится событие
+        """
+        return None
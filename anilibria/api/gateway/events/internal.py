@@ -4,6 +4,8 @@ from .base import BaseEvent
 
 __all__ = (
     "Connect",
+    "Disconnect",
+    "Reconnect",
     "TitleEpisode",
 )
 
@@ -24,6 +26,42 @@ class Connect(BaseEvent):
     "Версия АПИ анилибрии"
 
 
+@define()
+class Disconnect(BaseEvent):
+    """
+    Модель для события ``on_disconnect``. Вызывается при потере соединения с вебсокетом.
+
+    .. code-block:: python
+
+      @client.on(Disconnect)
+      async def disconnected(event: Disconnect):
+          ...
+    """
+
+    code: int | None
+    "Код закрытия вебсокета"
+    reason: str
+    "Причина потери соединения"
+
+
+@define()
+class Reconnect(BaseEvent):
+    """
+    Модель для события ``on_reconnect``. Вызывается при восстановлении соединения с вебсокетом.
+
+    .. code-block:: python
+
+      @client.on(Reconnect)
+      async def reconnected(event: Reconnect):
+          ...
+    """
+
+    attempts: int
+    "Количество попыток подключения"
+    downtime: float
+    "Сколько секунд не было соединения"
+
+
 @define()
 class TitleEpisode(BaseEvent):
     """
@@ -40,3 +78,7 @@ class TitleEpisode(BaseEvent):
     "Объект тайтла"
     episode: Episode
     "Объект загруженного эпизода"
+
+    @property
+    def title_id(self) -> int | None:
+        return self.title.id
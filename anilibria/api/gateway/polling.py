@@ -0,0 +1,231 @@
+import asyncio
+from collections import OrderedDict
+from logging import getLogger
+from time import time
+from typing import Any, NamedTuple
+
+from orjson import OPT_SORT_KEYS, dumps
+
+from ..error import HTTPException
+from ..http import HTTPClient
+from .client import RECONNECT_ERRORS, GatewayClient
+
+log = getLogger("anilibria.polling")
+__all__ = ("PollingPolicy", "PollingClient")
+
+
+class PollingPolicy:
+    """
+    Настройки получения событий через HTTP запросы вместо вебсокета.
+
+    Если обновлений нет, интервал между запросами увеличивается в ``backoff_factor`` раз до ``max_interval``.
+    После обновления интервал снова становится равным ``min_interval``.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(proxy="http://...", polling=PollingPolicy(min_interval=10))
+
+    :param float min_interval: Минимальный интервал между запросами в секундах.
+    :param float max_interval: Максимальный интервал между запросами в секундах.
+    :param float backoff_factor: Во сколько раз увеличивать интервал, если обновлений не было.
+    :param int items_per_page: Количество тайтлов на одной странице.
+    :param int max_titles: Для скольких тайтлов хранить отпечатки для сравнения с предыдущим состоянием.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = 5.0,
+        max_interval: float = 60.0,
+        backoff_factor: float = 1.5,
+        items_per_page: int = 50,
+        max_titles: int = 5000,
+    ) -> None:
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.backoff_factor: float = backoff_factor
+        self.items_per_page: int = items_per_page
+        self.max_titles: int = max_titles
+
+
+def _get_episodes(title: dict) -> dict[str, dict]:
+    if not isinstance(player := title.get("player"), dict):
+        return {}
+    if isinstance(episodes := player.get("list"), list):
+        return {str(episode.get("episode")): episode for episode in episodes}
+    return episodes or {}
+
+
+def _digest(value: Any) -> int:
+    return hash(dumps(value, option=OPT_SORT_KEYS))
+
+
+class _Episode(NamedTuple):
+    digest: int
+    missing: tuple[str, ...] | None
+    "Качества без ссылки. ``None`` - у эпизода нет hls"
+    uploaded: bool
+
+
+class _Snapshot(NamedTuple):
+    digest: int
+    updated: int | None
+    last_change: int | None
+    episodes: dict[str, _Episode]
+
+
+def _get_episode(episode: dict) -> _Episode:
+    if not isinstance(hls := episode.get("hls"), dict):
+        return _Episode(_digest(episode), None, False)
+    missing = tuple(quality for quality, link in hls.items() if not link)
+    return _Episode(_digest(episode), missing, bool(hls) and not missing)
+
+
+class PollingClient(GatewayClient):
+    """
+    Источник событий, который периодически запрашивает :meth:`AniLibriaClient.get_changes`
+    и сравнивает тайтлы с их предыдущим состоянием.
+
+    Вызывает события ``on_title_update`` и ``on_playlist_update`` в том же виде, что и вебсокет,
+    поэтому обработчики работают с обоими источниками без изменений.
+    Обновления плейлиста определяются только для тайтлов, которые уже были получены ранее.
+
+    Для сравнения хранятся только отпечатки тайтлов и эпизодов, а не сами тайтлы. Поэтому ``diff``
+    у ``on_title_update`` содержит только прежние ``updated`` и ``last_change``,
+    а у ``on_playlist_update`` - качества hls, которых у эпизода раньше не было.
+    """
+
+    def __init__(self, http: HTTPClient, *, polling: PollingPolicy | None = None, **kwargs):
+        super().__init__(http, **kwargs)
+        self.polling: PollingPolicy = polling or PollingPolicy()
+        self.interval: float = self.polling.min_interval
+        "Текущий интервал между запросами"
+        self.since: int | None = None
+        "Время самого нового полученного изменения"
+        self.polls: int = 0
+        "Количество выполненных опросов"
+
+        self._snapshot: OrderedDict[int, _Snapshot] = OrderedDict()
+        self._wakeup: asyncio.Event = asyncio.Event()
+
+    async def start(self, *, reconnect: bool = True):
+        self._stopped = False
+        attempt = 0
+
+        if self.since is None:
+            self.since = int(time())
+
+        if not self._started_up:
+            self.dispatch.call("on_startup")
+            self._started_up = True
+
+        while not self._stopped:
+            try:
+                changed = await self.poll()
+            except (*RECONNECT_ERRORS, HTTPException) as error:
+                if not reconnect or not self.reconnect_policy.can_retry(attempt):
+                    raise
+                self.stats.failed_attempts += 1
+                delay = self.reconnect_policy.get_delay(attempt)
+                attempt += 1
+                log.warning(f"Polling failed: {error!r}. Retrying in {delay:.2f} seconds")
+            else:
+                attempt = 0
+                if changed:
+                    self.interval = self.polling.min_interval
+                else:
+                    self.interval = min(
+                        self.interval * self.polling.backoff_factor, self.polling.max_interval
+                    )
+                delay = self.interval
+
+            await self._sleep(delay)
+
+    async def _sleep(self, delay: float):
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def close(self):
+        self._stopped = True
+        self._wakeup.set()
+        await super().close()
+
+    async def poll(self) -> bool:
+        """
+        Запрашивает изменения тайтлов и вызывает события. Возвращает ``True``, если изменения были.
+        """
+        self.polls += 1
+        page, pages = 1, 1
+        titles: list[dict] = []
+
+        # `since` делает запрос условным: без изменений API возвращает пустой список
+        while page <= pages:
+            data = await self._http.get_changes(
+                since=self.since, page=page, items_per_page=self.polling.items_per_page
+            )
+            titles.extend(data["list"])
+            pages = data["pagination"]["pages"]
+            page += 1
+
+        # Старые изменения вызываются первыми
+        titles.sort(key=lambda title: title.get("last_change") or 0)
+        for title in titles:
+            self._track_title(title)
+            await self.dispatch.wait_for_capacity()
+
+        return bool(titles)
+
+    def _track_title(self, title: dict):
+        if (last_change := title.get("last_change")) is not None:
+            self.since = max(self.since or 0, last_change)
+
+        title_id = title.get("id")
+        episodes = _get_episodes(title)
+        snapshot = _Snapshot(
+            digest=_digest(title),
+            updated=title.get("updated"),
+            last_change=last_change,
+            episodes={number: _get_episode(episode) for number, episode in episodes.items()},
+        )
+        previous = self._snapshot.pop(title_id, None)
+        self._snapshot[title_id] = snapshot
+        if len(self._snapshot) > self.polling.max_titles:
+            self._snapshot.popitem(last=False)
+
+        diff = {}
+        if previous is not None:
+            if previous.digest == snapshot.digest:
+                return
+            diff = {"updated": previous.updated, "last_change": previous.last_change}
+
+        self._track_data({"type": "title_update", "data": {"title": title, "diff": diff}})
+
+        if previous is None:
+            return
+
+        for number, episode in episodes.items():
+            current = snapshot.episodes[number]
+            if (old := previous.episodes.get(number)) is not None and old.digest == current.digest:
+                continue
+
+            diff = {}
+            if old is not None:
+                hls = None if old.missing is None else dict.fromkeys(old.missing)
+                diff = {"list": {number: {"hls": hls}}}
+
+            data = {
+                "id": title_id,
+                "player": title["player"],
+                "updated_episode": episode,
+                "episode": number,
+                "diff": diff,
+                "reupload": old is not None and old.uploaded,
+            }
+            self._track_data({"type": "playlist_update", "data": data})
+
+    async def subscribe(self, data: dict):
+        self._subscriptions.append(data)
+        log.warning("Subscriptions are not supported while polling. All updates will be received")
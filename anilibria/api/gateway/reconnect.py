@@ -0,0 +1,67 @@
+from ...utils.backoff import exponential_backoff
+from ..models.attrs_utils import define
+
+__all__ = ("ReconnectPolicy", "ReconnectStats")
+
+
+class ReconnectPolicy:
+    """
+    Настройки переподключения к вебсокету.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(
+           reconnect_policy=ReconnectPolicy(max_delay=30, heartbeat=15, receive_timeout=120)
+       )
+
+    :param int | None attempts: Сколько раз подряд можно безуспешно пытаться подключиться. None - без ограничений.
+    :param float base_delay: Задержка перед первой попыткой в секундах. Каждая следующая попытка ждёт в два раза дольше.
+    :param float max_delay: Максимальная задержка между попытками.
+    :param float | None heartbeat: Как часто отправлять ping. Если pong не пришёл, соединение считается потерянным.
+        None - не отправлять.
+    :param float | None receive_timeout: Через сколько секунд без сообщений соединение считается зависшим.
+        None - ждать сколько угодно.
+    """
+
+    def __init__(
+        self,
+        *,
+        attempts: int | None = None,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        heartbeat: float | None = 30.0,
+        receive_timeout: float | None = None,
+    ) -> None:
+        self.attempts: int | None = attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.heartbeat: float | None = heartbeat
+        self.receive_timeout: float | None = receive_timeout
+
+    def can_retry(self, attempt: int) -> bool:
+        return self.attempts is None or attempt < self.attempts
+
+    def get_delay(self, attempt: int) -> float:
+        return exponential_backoff(attempt, base=self.base_delay, maximum=self.max_delay)
+
+
+@define()
+class ReconnectStats:
+    """
+    Статистика подключений к вебсокету
+    """
+
+    connects: int = 0
+    "Количество успешных подключений"
+    reconnects: int = 0
+    "Количество переподключений после потери соединения"
+    disconnects: int = 0
+    "Количество потерь соединения"
+    failed_attempts: int = 0
+    "Количество неудачных попыток подключения"
+    stalls: int = 0
+    "Сколько раз соединение было закрыто из-за отсутствия сообщений"
+    downtime: float = 0.0
+    "Суммарное время без соединения в секундах"
+    last_disconnect_reason: str | None = None
+    "Причина последней потери соединения"
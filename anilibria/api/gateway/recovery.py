@@ -0,0 +1,152 @@
+from collections import OrderedDict
+from enum import Enum
+from logging import getLogger
+from time import time
+
+log = getLogger("anilibria.recovery")
+__all__ = ("GapRecovery", "RecoverySource")
+
+
+class RecoverySource(Enum):
+    """
+    Откуда запрашивать пропущенные обновления
+    """
+
+    CHANGES = "last_change"
+    "Через :meth:`AniLibriaClient.get_changes` по времени последнего изменения тайтла"
+    UPDATES = "updated"
+    "Через :meth:`AniLibriaClient.get_updates` по времени последнего обновления тайтла"
+
+
+class GapRecovery:
+    """
+    Запоминает время последнего полученного обновления тайтла и после переподключения к вебсокету
+    запрашивает тайтлы, обновлённые за время без соединения.
+
+    Для каждого пропущенного тайтла вызывается событие ``on_title_update`` с ``recovered=True``.
+    События, которые пришли и через вебсокет, и через API, вызываются только один раз.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(gap_recovery=GapRecovery())
+
+       @client.on(TitleUpdate)
+       async def title_update(event: TitleUpdate):
+           if event.recovered:
+               ...
+
+    :param RecoverySource source: Откуда запрашивать пропущенные обновления.
+    :param int window: Максимальное количество одновременно запрашиваемых страниц.
+    :param int items_per_page: Количество тайтлов на одной странице.
+    :param int max_seen: Сколько последних обновлений запоминать для удаления повторов.
+    """
+
+    def __init__(
+        self,
+        *,
+        source: RecoverySource = RecoverySource.CHANGES,
+        window: int = 4,
+        items_per_page: int = 50,
+        max_seen: int = 10000,
+    ) -> None:
+        self.source: RecoverySource = source
+        self.window: int = window
+        self.items_per_page: int = items_per_page
+        self.max_seen: int = max_seen
+
+        self.since: int | None = None
+        "Время самого нового полученного обновления"
+        self.started_at: int | None = None
+        "Время первого подключения. Используется, если обновлений ещё не было"
+        self.gap_since: int | None = None
+        "Время самого нового обновления на момент потери соединения"
+
+        self._seen: OrderedDict[tuple[int, int], bool] = OrderedDict()
+        # Объект, с которым общие повторы и счётчики. У созданного через `fork` - исходный
+        self._root: GapRecovery = self
+
+        self.recovered: int = 0
+        "Количество восстановленных обновлений"
+        self.duplicates: int = 0
+        "Количество отброшенных повторов"
+
+    def fork(self) -> "GapRecovery":
+        """
+        Возвращает объект с теми же настройками и своим временем обновлений и потери соединения.
+        Повторы и счётчики у них общие. Используется, когда несколько соединений передают события
+        одним обработчикам: пропуск одного соединения не должен сбрасываться подключением другого.
+        """
+        fork = GapRecovery(
+            source=self.source,
+            window=self.window,
+            items_per_page=self.items_per_page,
+            max_seen=self.max_seen,
+        )
+        fork._root = self._root
+        return fork
+
+    def start(self):
+        """
+        Вызывается при подключении.
+        """
+        if self.started_at is None:
+            self.started_at = int(time())
+
+    def begin_gap(self):
+        """
+        Вызывается при потере соединения.
+        """
+        if self.gap_since is None:
+            self.gap_since = self.since if self.since is not None else self.started_at
+
+    def end_gap(self) -> int | None:
+        """
+        Возвращает время, с которого нужно запросить обновления, и сбрасывает его.
+        """
+        since, self.gap_since = self.gap_since, None
+        return since
+
+    def track(
+        self, title_id: int | None, timestamp: int | None, *, recovered: bool = False
+    ) -> bool:
+        """
+        Запоминает обновление тайтла. Возвращает ``False``, если его не нужно передавать обработчикам.
+
+        :param int | None title_id: ID тайтла.
+        :param int | None timestamp: Время обновления тайтла.
+        :param bool recovered: Получено ли обновление через API после переподключения.
+        """
+        if title_id is None or timestamp is None:
+            return True
+
+        root = self._root
+        for recovery in {self, root}:
+            if recovery.since is None or timestamp > recovery.since:
+                recovery.since = timestamp
+
+        key = (title_id, timestamp)
+        seen = root._seen
+        if (was_recovered := seen.get(key)) is not None:
+            # Обновление из вебсокета отбрасывается, только если его уже восстановили
+            if recovered or was_recovered:
+                root.duplicates += 1
+                log.debug(f"Skipping duplicate update of title {title_id}")
+                return False
+
+        seen[key] = recovered
+        seen.move_to_end(key)
+        if len(seen) > self.max_seen:
+            seen.popitem(last=False)
+
+        if recovered:
+            root.recovered += 1
+
+        return True
+
+    def track_raw(self, data: dict) -> bool:
+        """
+        Запоминает обновление из словаря события ``title_update``.
+        """
+        if not isinstance(title := data.get("title"), dict):
+            return True
+        return self.track(title.get("id"), title.get(self.source.value))
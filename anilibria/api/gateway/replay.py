@@ -0,0 +1,291 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from logging import getLogger
+from os import PathLike
+from struct import Struct
+from time import monotonic, time
+from typing import AsyncIterator, BinaryIO, Iterator
+
+from ..http import HTTPClient
+from .client import GatewayClient
+
+log = getLogger("anilibria.replay")
+__all__ = ("FrameRecorder", "ReplayPolicy", "ReplayTransport", "read_frames")
+
+MAGIC = b"ALFRAME1"
+# Время получения (секунды с эпохи) и длина сообщения в байтах
+_HEADER = Struct("<dI")
+
+
+def read_frames(path: str | PathLike) -> Iterator[tuple[float, str]]:
+    """
+    Читает сообщения, записанные :class:`FrameRecorder`.
+    Возвращает пары из времени получения сообщения и его текста.
+    Недописанное последнее сообщение пропускается.
+
+    :param str | PathLike path: Путь к файлу записи.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a websocket frame recording")
+
+        while header := file.read(_HEADER.size):
+            if len(header) < _HEADER.size:
+                log.warning(f"Recording {path} ends with a truncated frame")
+                return
+
+            timestamp, length = _HEADER.unpack(header)
+            if len(data := file.read(length)) < length:
+                log.warning(f"Recording {path} ends with a truncated frame")
+                return
+
+            yield timestamp, data.decode()
+
+
+async def _read_frames_async(
+    path: str | PathLike, chunk_size: int = 1024 * 1024
+) -> AsyncIterator[tuple[float, str]]:
+    # То же, что и read_frames, но файл читается частями в другом потоке
+    file = await asyncio.to_thread(open, path, "rb")
+    try:
+        buffer = await asyncio.to_thread(file.read, max(chunk_size, len(MAGIC)))
+        if buffer[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a websocket frame recording")
+
+        position = len(MAGIC)
+        while True:
+            while len(buffer) - position >= _HEADER.size:
+                timestamp, length = _HEADER.unpack_from(buffer, position)
+                if (end := position + _HEADER.size + length) > len(buffer):
+                    break
+                yield timestamp, buffer[position + _HEADER.size : end].decode()
+                position = end
+
+            if not (chunk := await asyncio.to_thread(file.read, chunk_size)):
+                break
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        if position < len(buffer):
+            log.warning(f"Recording {path} ends with a truncated frame")
+    finally:
+        await asyncio.to_thread(file.close)
+
+
+class FrameRecorder:
+    """
+    Записывает сообщения вебсокета вместе со временем их получения в файл.
+    Записи дописываются в конец файла, поэтому один файл можно использовать для нескольких запусков.
+
+    Каждое сообщение хранится как 8 байт времени получения, 4 байта длины и текст сообщения в UTF-8.
+    Сообщения собираются в буфер, а заполненный буфер записывается в файл в отдельном потоке,
+    чтобы не задерживать чтение вебсокета. Записанный поток можно воспроизвести через :class:`ReplayPolicy`.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(recorder=FrameRecorder("traffic.bin"))
+
+    :param str | PathLike path: Путь к файлу записи.
+    :param int buffer_size: Размер буфера записи в байтах.
+    """
+
+    def __init__(self, path: str | PathLike, *, buffer_size: int = 64 * 1024) -> None:
+        self.path: str | PathLike = path
+        self.buffer_size: int = buffer_size
+
+        self.frames: int = 0
+        "Количество записанных сообщений"
+        self.size: int = 0
+        "Количество записанных байт"
+
+        self._buffer: bytearray = bytearray()
+        self._file: BinaryIO | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: set[asyncio.Future] = set()
+
+    def _open(self) -> BinaryIO:
+        file = open(self.path, "ab")
+        if file.tell() == 0:
+            file.write(MAGIC)
+        return file
+
+    def write(self, text: str, timestamp: float | None = None):
+        """
+        Записывает сообщение.
+
+        :param str text: Текст сообщения.
+        :param float | None timestamp: Время получения сообщения. По умолчанию - текущее время.
+        """
+        data = text.encode()
+        self._buffer += _HEADER.pack(time() if timestamp is None else timestamp, len(data))
+        self._buffer += data
+        self.frames += 1
+        self.size += _HEADER.size + len(data)
+
+        if len(self._buffer) >= self.buffer_size:
+            self._write_buffer()
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+        chunk, self._buffer = bytes(self._buffer), bytearray()
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Вне цикла событий некому ждать записи, поэтому пишем сразу
+            return self._write_chunk(chunk)
+
+        # Один поток записи сохраняет порядок сообщений
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="anilibria-recorder")
+        future = loop.run_in_executor(self._executor, self._write_chunk, chunk)
+        self._pending.add(future)
+        future.add_done_callback(self._on_written)
+
+    def _write_chunk(self, chunk: bytes):
+        if self._file is None:
+            self._file = self._open()
+        self._file.write(chunk)
+
+    def _on_written(self, future: asyncio.Future):
+        self._pending.discard(future)
+        if not future.cancelled() and (error := future.exception()) is not None:
+            log.error("Failed to write websocket frames", exc_info=error)
+
+    def _flush_file(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def flush(self):
+        """
+        Записывает буфер и ждёт, пока все сообщения не будут сброшены на диск.
+        """
+        self._write_buffer()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await asyncio.to_thread(self._flush_file)
+
+    async def close(self):
+        """
+        Записывает буфер и закрывает файл записи. Следующая запись снова откроет его.
+        """
+        await self.flush()
+        await asyncio.to_thread(self._close_file)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class ReplayPolicy:
+    """
+    Настройки воспроизведения записи :class:`FrameRecorder` вместо подключения к вебсокету.
+
+    .. code-block:: python
+
+       # Воспроизводит запись в 10 раз быстрее, чем она была получена
+       client = AniLibriaClient(replay=ReplayPolicy("traffic.bin", speed=10))
+
+    :param str | PathLike path: Путь к файлу записи.
+    :param float | None speed: Во сколько раз быстрее воспроизводить запись. ``None`` - без пауз между сообщениями.
+    :param int repeat: Сколько раз воспроизвести запись.
+    :param float | None max_pause: Максимальная пауза между сообщениями в секундах.
+        Сокращает перерывы между запусками, записанными в один файл.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike,
+        *,
+        speed: float | None = 1.0,
+        repeat: int = 1,
+        max_pause: float | None = 60.0,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("Replay speed must be positive")
+
+        self.path: str | PathLike = path
+        self.speed: float | None = speed
+        self.repeat: int = repeat
+        self.max_pause: float | None = max_pause
+
+
+class ReplayTransport(GatewayClient):
+    """
+    Источник событий, который воспроизводит записанные сообщения вебсокета.
+
+    Сообщения проходят тот же путь, что и полученные из вебсокета: разбор, преобразование в объекты
+    и передачу обработчикам. Поэтому воспроизведение подходит для проверки обработчиков под нагрузкой.
+    :meth:`.start` завершается после воспроизведения записи.
+    """
+
+    def __init__(self, http: HTTPClient, *, replay: ReplayPolicy, **kwargs):
+        super().__init__(http, **kwargs)
+        self.replay: ReplayPolicy = replay
+
+        self.replayed: int = 0
+        "Количество воспроизведённых сообщений"
+        self.elapsed: float = 0
+        "Время воспроизведения в секундах"
+
+    async def start(self, *, reconnect: bool = True):
+        self._stopped = False
+
+        if not self._started_up:
+            self.dispatch.call("on_startup")
+            self._started_up = True
+
+        started_at = monotonic()
+        for _ in range(self.replay.repeat):
+            if self._stopped:
+                break
+            await self._replay()
+
+        if self.decoder is not None:
+            await self.decoder.join()
+        self.elapsed += monotonic() - started_at
+
+    async def _replay(self):
+        speed, max_pause = self.replay.speed, self.replay.max_pause
+        previous: float | None = None
+        # Момент воспроизведения первого сообщения, сдвинутый на сокращённые паузы
+        started_at = monotonic()
+
+        # Файл закрывается, даже если воспроизведение остановили
+        async with aclosing(_read_frames_async(self.replay.path)) as frames:
+            async for timestamp, text in frames:
+                if self._stopped:
+                    return
+
+                if previous is None:
+                    started_at -= timestamp / (speed or 1)
+                elif speed is not None and max_pause is not None:
+                    if (pause := (timestamp - previous) / speed) > max_pause:
+                        started_at -= pause - max_pause
+                previous = timestamp
+
+                if speed is not None:
+                    # Паузы считаются от начала воспроизведения, чтобы задержки не накапливались
+                    if (delay := started_at + timestamp / speed - monotonic()) > 0:
+                        await asyncio.sleep(delay)
+                elif not self.replayed % 100:
+                    # Даём обработчикам выполниться
+                    await asyncio.sleep(0)
+
+                await self._feed(text)
+                self.replayed += 1
+
+    async def _feed(self, text: str):
+        await self._handle_text(text)
+        await self.dispatch.wait_for_capacity()
+
+    async def subscribe(self, data: dict):
+        self._subscriptions.append(data)
+        log.warning("Subscriptions are not supported while replaying. All events will be received")
@@ -0,0 +1,179 @@
+import asyncio
+from collections import OrderedDict
+from hashlib import blake2b
+from logging import getLogger
+from time import monotonic
+
+from ..http import HTTPClient
+from .client import GatewayClient
+
+log = getLogger("anilibria.sharding")
+__all__ = ("ShardedGateway",)
+
+# Подписка и фильтр соединения требуют разного, и событий для них нет
+_EMPTY = object()
+
+
+def _intersect(first, second):
+    if isinstance(first, dict) and isinstance(second, dict):
+        merged = first | second
+        for key in first.keys() & second.keys():
+            if (value := _intersect(first[key], second[key])) is _EMPTY:
+                return _EMPTY
+            merged[key] = value
+        return merged
+
+    return first if first == second else _EMPTY
+
+
+class _Shard(GatewayClient):
+    def __init__(self, manager: "ShardedGateway", shard_id: int, subscription: dict | None):
+        super().__init__(
+            manager._http,
+            dispatch=manager.dispatch,
+            coalescer=manager.coalescer,
+            reconnect_policy=manager.reconnect_policy,
+            # Каждое соединение отслеживает свой пропуск, иначе подключение одного соединения
+            # сбрасывает пропуск другого, которое ещё не подключилось
+            gap_recovery=manager.gap_recovery.fork() if manager.gap_recovery is not None else None,
+            decoder=manager.decoder,
+            url=manager.url,
+            recorder=manager.recorder,
+            fetch_gap=manager.fetch_gap,
+        )
+        self.shard_id: int = shard_id
+        self.subscription: dict | None = subscription
+        self.stats = manager.stats
+        # on_startup вызывает менеджер
+        self._started_up = True
+        self._manager: ShardedGateway = manager
+
+        if subscription is not None:
+            self._subscriptions.append({"subscribe": subscription})
+
+    def route(self, data: dict) -> dict | None:
+        """
+        Возвращает подписку, ограниченную подпиской соединения, или ``None``,
+        если соединение не получает ни одного из её событий.
+        """
+        if self.subscription is None:
+            return data
+
+        subscribe = {}
+        for event, value in data["subscribe"].items():
+            if event not in self.subscription:
+                continue
+            if (value := _intersect(self.subscription[event], value)) is not _EMPTY:
+                subscribe[event] = value
+
+        return data | {"subscribe": subscribe} if subscribe else None
+
+    def _accept(self, data: dict, text: str) -> bool:
+        # Сообщение о подключении одинаковое для всех соединений, но должно обрабатываться каждым
+        if not isinstance(data, dict) or not data.get("type"):
+            return True
+        return not self._manager._is_duplicate(self.shard_id, text)
+
+
+class ShardedGateway(GatewayClient):
+    """
+    Открывает несколько соединений с вебсокетом, у каждого из которых своя подписка,
+    и передаёт события из всех соединений одному диспетчеру.
+
+    Событие, полученное несколькими соединениями в течение ``dedup_window`` секунд,
+    передаётся обработчикам один раз.
+    Одинаковые сообщения, полученные одним соединением, не считаются повторами.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(
+           shards=[
+               {"title_update": {"title": {"season": {"year": 2023}}}},
+               {"title_update": {"title": {"season": {"year": 2024}}}},
+               {"encode_progress": {}},
+           ]
+       )
+
+    :param HTTPClient http: HTTP клиент.
+    :param list[dict | None] shards: Подписки соединений. ``None`` - соединение получает все события.
+    :param int max_seen: Сколько последних сообщений запоминать для удаления повторов.
+    :param float dedup_window: Сколько секунд сообщение, полученное одним соединением,
+        считается повтором в других соединениях.
+    """
+
+    def __init__(
+        self,
+        http: HTTPClient,
+        shards: list[dict | None],
+        *,
+        max_seen: int = 10000,
+        dedup_window: float = 5.0,
+        **kwargs,
+    ):
+        super().__init__(http, **kwargs)
+        self.max_seen: int = max_seen
+        self.dedup_window: float = dedup_window
+        self.duplicates: int = 0
+        "Количество сообщений, полученных повторно другим соединением"
+
+        # Хеш сообщения -> соединение, которое получило его первым, и время получения
+        self._seen: OrderedDict[bytes, tuple[int, float]] = OrderedDict()
+        self.shards: list[_Shard] = [
+            _Shard(self, shard_id, subscription) for shard_id, subscription in enumerate(shards)
+        ]
+
+    def _is_duplicate(self, shard_id: int, text: str) -> bool:
+        now = monotonic()
+        seen = self._seen
+        # Записи добавляются по порядку, поэтому устаревшие находятся в начале
+        while seen and next(iter(seen.values()))[1] <= now - self.dedup_window:
+            seen.popitem(last=False)
+
+        key = blake2b(text.encode(), digest_size=16).digest()
+        if (first := seen.get(key)) is not None and first[0] != shard_id:
+            self.duplicates += 1
+            return True
+
+        seen[key] = (shard_id, now)
+        seen.move_to_end(key)
+        if len(seen) > self.max_seen:
+            seen.popitem(last=False)
+        return False
+
+    async def start(self, *, reconnect: bool = True):
+        self._stopped = False
+
+        if not self._started_up:
+            self.dispatch.call("on_startup")
+            self._started_up = True
+
+        tasks = [asyncio.create_task(shard.start(reconnect=reconnect)) for shard in self.shards]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self):
+        self._stopped = True
+        for shard in self.shards:
+            shard._stopped = True
+            if shard._connection is not None:
+                await shard._connection.close()
+
+        await super().close()
+
+    async def subscribe(self, data: dict):
+        """
+        Отправляет подписку в соединения, которые получают её события.
+        Для соединений с подпиской она объединяется с подпиской соединения,
+        чтобы не расширять и не заменять её.
+        """
+        routed = [(shard, shard.route(data)) for shard in self.shards]
+        if all(shard_data is None for _, shard_data in routed):
+            log.warning("Subscription does not match any shard and was not sent")
+
+        for shard, shard_data in routed:
+            if shard_data is not None:
+                await shard.subscribe(shard_data)
@@ -0,0 +1,204 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from inspect import iscoroutinefunction
+from logging import getLogger
+from typing import Any, Callable, Type
+
+from orjson import loads
+
+from ..models.cattrs_utils import converter
+from .events import BaseEvent, EventType
+
+log = getLogger("anilibria.workers")
+__all__ = ("ProcessDecoder",)
+
+
+def decode_frame(
+    text: str, handlers: dict[str, tuple[Callable, ...]], structured: frozenset[str]
+) -> tuple[Any, BaseEvent | None]:
+    """
+    Разбирает сообщение вебсокета, преобразует событие в объект и вызывает обработчики процесса.
+    Возвращает разобранное сообщение и объект события, если его тип есть в ``structured``.
+    """
+    data = loads(text)
+    if not isinstance(data, dict) or not isinstance(type := data.get("type"), str):
+        return data, None
+
+    type_handlers = handlers.get(type, ())
+    if not type_handlers and type not in structured:
+        return data, None
+    if (event_type := EventType.__members__.get(type.upper())) is None or event_type.value is None:
+        return data, None
+
+    event = converter.structure(data["data"], event_type.value)
+    for handler in type_handlers:
+        try:
+            handler(event)
+        except Exception:  # noqa
+            log.exception("")
+
+    return data, event if type in structured else None
+
+
+class ProcessDecoder:
+    """
+    Разбирает сообщения вебсокета и преобразует их в объекты событий в отдельных процессах,
+    чтобы не занимать цикл событий, который читает вебсокет.
+
+    Основной процесс получает уже разобранное сообщение и объект события, если у события есть обработчики,
+    принимающие объекты. Обработчики клиента по-прежнему выполняются в основном цикле событий
+    в порядке получения сообщений.
+
+    Обработчики, зарегистрированные через :meth:`.on`, выполняются в процессах-обработчиках
+    с тем же объектом события. Это обычные, не асинхронные функции.
+
+    Небольшие сообщения разбираются в основном процессе: передача в другой процесс обходится дороже.
+
+    .. code-block:: python
+
+       decoder = ProcessDecoder(max_workers=8)
+       client = AniLibriaClient(decoder=decoder)
+
+       @decoder.on(TitleUpdate)
+       def index_title(event: TitleUpdate):  # Функция должна быть определена на уровне модуля
+           ...
+
+    :param int | None max_workers: Количество процессов. По умолчанию - количество ядер процессора.
+    :param int max_pending: Сколько сообщений может обрабатываться одновременно.
+        При превышении чтение вебсокета приостанавливается.
+    :param int min_size: Минимальный размер сообщения в символах, которое передаётся в другой процесс.
+    :param Executor | None executor: Свой пул процессов вместо :class:`ProcessPoolExecutor`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        max_pending: int = 64,
+        min_size: int = 4096,
+        executor: Executor | None = None,
+    ) -> None:
+        self.max_workers: int | None = max_workers
+        self.max_pending: int = max_pending
+        self.min_size: int = min_size
+
+        self._executor: Executor | None = executor
+        # Тип события -> обработчики процессов
+        self._handlers: dict[str, tuple[Callable, ...]] = {}
+        # Сообщения в порядке получения вместе с функциями, которым нужно передать результат
+        self._queue: deque[tuple[asyncio.Future, Callable[[Any, BaseEvent | None], None]]] = deque()
+        self._changed: asyncio.Event = asyncio.Event()
+        self._delivery: asyncio.Task | None = None
+
+        self.offloaded: int = 0
+        "Количество сообщений, разобранных в других процессах"
+        self.failed: int = 0
+        "Количество сообщений, которые не удалось разобрать"
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        return self._executor
+
+    def on(self, event: Type[BaseEvent]):
+        """
+        Декоратор для обработчиков, которые выполняются в процессах-обработчиках.
+        Функция должна быть определена на уровне модуля, чтобы её можно было передать в другой процесс.
+        Для небольших сообщений обработчик вызывается в основном процессе.
+
+        :param event: Класс ивента
+        """
+
+        def wrapper(func: Callable) -> Callable:
+            if iscoroutinefunction(func):
+                raise TypeError("Process handlers must be regular functions")
+            type = EventType(event).name.lower()
+            self._handlers[type] = (*self._handlers.get(type, ()), func)
+            return func
+
+        return wrapper
+
+    async def submit(
+        self,
+        text: str,
+        structured: frozenset[str],
+        callback: Callable[[Any, BaseEvent | None], None],
+    ):
+        """
+        Разбирает сообщение и передаёт результат в ``callback`` в порядке получения сообщений.
+        Ждёт, если обрабатывается слишком много сообщений.
+
+        :param str text: Текст сообщения.
+        :param frozenset[str] structured: Типы событий, которые нужно вернуть в виде объектов.
+        :param callback: Функция, принимающая разобранное сообщение и объект события или ``None``.
+        """
+        loop = asyncio.get_running_loop()
+
+        if len(text) < self.min_size:
+            result = decode_frame(text, self._handlers, structured)
+            # Результат не может обогнать сообщения, которые ещё разбираются
+            if not self._queue:
+                return callback(*result)
+            future = loop.create_future()
+            future.set_result(result)
+        else:
+            while len(self._queue) >= self.max_pending:
+                self._changed.clear()
+                await self._changed.wait()
+
+            future = loop.run_in_executor(
+                self.executor, decode_frame, text, self._handlers, structured
+            )
+            self.offloaded += 1
+
+        self._queue.append((future, callback))
+        if self._delivery is None:
+            self._delivery = asyncio.create_task(self._deliver())
+
+    async def _deliver(self):
+        try:
+            while self._queue:
+                future, callback = self._queue[0]
+                try:
+                    result = await future
+                except Exception as error:  # noqa
+                    result = None
+                    self.failed += 1
+                    log.error("Failed to decode a websocket message", exc_info=error)
+
+                self._queue.popleft()
+                self._changed.set()
+
+                if result is None:
+                    continue
+                try:
+                    callback(*result)
+                except Exception:  # noqa
+                    log.exception("Failed to handle a websocket message")
+        finally:
+            self._delivery = None
+
+    async def join(self):
+        """
+        Ждёт, пока все полученные сообщения не будут переданы обработчикам.
+        """
+        while (delivery := self._delivery) is not None:
+            await asyncio.shield(delivery)
+
+    async def close(self):
+        """
+        Отменяет ожидающие сообщения и завершает процессы.
+        """
+        if (delivery := self._delivery) is not None:
+            delivery.cancel()
+            await asyncio.gather(delivery, return_exceptions=True)
+
+        for future, _ in self._queue:
+            future.cancel()
+        self._queue.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,3 +1,8 @@
+from .cache import *  # noqa: F401 F403
 from .client import *  # noqa: F401 F403
+from .connector import *  # noqa: F401 F403
+from .loader import *  # noqa: F401 F403
 from .public import *  # noqa: F401 F403
+from .ratelimit import *  # noqa: F401 F403
 from .request import *  # noqa: F401 F403
+from .stream import *  # noqa: F401 F403
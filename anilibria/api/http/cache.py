@@ -0,0 +1,188 @@
+from collections import OrderedDict, defaultdict
+from enum import Enum
+from logging import getLogger
+from time import monotonic
+from typing import Any, Hashable, Iterator
+
+from .route import Route
+
+log = getLogger("anilibria.cache")
+__all__ = ("ResponseCache", "CacheInvalidation")
+
+DEFAULT_ROUTES_TTL: dict[str, float] = {
+    "/title/random": 0,
+    "/user": 0,
+    "/user/favourites": 0,
+}
+
+
+class CacheInvalidation(Enum):
+    """
+    Представляет режим сброса кеша по событиям вебсокета
+    """
+
+    NONE = "none"
+    "События не влияют на кеш"
+    EVICT = "evict"
+    "Записи с изменённым тайтлом удаляются из кеша"
+    PATCH = "patch"
+    "Записи с тайтлом, запрошенным только по ``id`` или ``code``, заменяются новыми данными. Остальные удаляются"
+
+
+def _iter_title_ids(data: Any) -> Iterator[int]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_title_ids(item)
+    elif isinstance(data, dict):
+        if "id" in data and "code" in data:
+            yield data["id"]
+        elif "list" in data:
+            yield from _iter_title_ids(data["list"])
+        elif "title" in data:  # Элемент ленты
+            yield from _iter_title_ids(data["title"])
+
+
+def make_key(route: Route, params: dict | None, base_url: str | None = None) -> Hashable:
+    """
+    Создаёт ключ запроса из маршрута и уже подготовленных параметров.
+    Адрес API входит в ключ, чтобы ответы разных серверов не смешивались в одном кеше.
+    """
+    return (
+        route.method,
+        route.get_url(base_url),
+        tuple(sorted((key, str(value)) for key, value in params.items())) if params else (),
+    )
+
+
+class ResponseCache:
+    """
+    Кеш ответов API в памяти. Кешируются только GET запросы.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(
+           cache=ResponseCache(ttl=60, max_size=2048, routes_ttl={"/years": 3600})
+       )
+
+    :param float ttl: Время жизни записи в секундах для маршрутов, которых нет в ``routes_ttl``.
+    :param int max_size: Максимальное количество записей. При переполнении удаляются самые старые по использованию.
+    :param dict[str, float] | None routes_ttl: Время жизни записей для отдельных маршрутов.
+        0 - не кешировать маршрут. По умолчанию не кешируются ``/title/random`` и запросы пользователя.
+    :param CacheInvalidation invalidation: Как события ``title_update``, ``playlist_update`` и ``torrent_update``
+        влияют на закешированные тайтлы. Позволяет использовать большой ``ttl`` без устаревших данных.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 60,
+        max_size: int = 1024,
+        routes_ttl: dict[str, float] | None = None,
+        invalidation: CacheInvalidation = CacheInvalidation.NONE,
+    ) -> None:
+        self.ttl: float = ttl
+        self.max_size: int = max_size
+        self.routes_ttl: dict[str, float] = DEFAULT_ROUTES_TTL | (routes_ttl or {})
+        self.invalidation: CacheInvalidation = invalidation
+
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._titles: defaultdict[int, set[Hashable]] = defaultdict(set)
+
+        self.hits: int = 0
+        "Количество запросов, ответ на которые был взят из кеша"
+        self.misses: int = 0
+        "Количество запросов, ответа на которые не было в кеше"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_ttl(self, route: Route) -> float:
+        if route.method != "GET":
+            return 0
+
+        return self.routes_ttl.get(route.endpoint, self.ttl)
+
+    def get(self, route: Route, key: Hashable) -> Any | None:
+        if not self.get_ttl(route):
+            return
+
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return
+
+        expires_at, data = entry
+        if expires_at <= monotonic():
+            self._remove(key)
+            self.misses += 1
+            return
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        log.debug(f"Got cached response for {route.endpoint}")
+
+        return data
+
+    def set(self, route: Route, key: Hashable, data: Any):
+        if not (ttl := self.get_ttl(route)) or not isinstance(data, (dict, list)):
+            return
+
+        self._remove(key)
+        self._entries[key] = (monotonic() + ttl, data)
+
+        for title_id in _iter_title_ids(data):
+            self._titles[title_id].add(key)
+
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable):
+        if (entry := self._entries.pop(key, None)) is None:
+            return
+
+        for title_id in _iter_title_ids(entry[1]):
+            if (keys := self._titles.get(title_id)) is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._titles[title_id]
+
+    def invalidate(self, endpoint: str | None = None):
+        """
+        Удаляет записи из кеша.
+
+        :param str | None endpoint: Маршрут, записи которого нужно удалить. Если не указан, кеш очищается полностью.
+        """
+        if endpoint is None:
+            self._titles.clear()
+            return self._entries.clear()
+
+        for key in [key for key in self._entries if key[1].endswith(endpoint)]:
+            self._remove(key)
+
+    def invalidate_title(self, title_id: int):
+        """
+        Удаляет из кеша все записи, в которых есть тайтл.
+
+        :param int title_id: ID тайтла.
+        """
+        for key in list(self._titles.get(title_id, ())):
+            self._remove(key)
+
+        log.debug(f"Invalidated cached entries with title {title_id}")
+
+    def update_title(self, data: dict):
+        """
+        Заменяет тайтл в записях, запрошенных только по ``id`` или ``code``. Остальные записи с тайтлом удаляются.
+
+        :param dict data: Новые данные тайтла.
+        """
+        title_id = data["id"]
+        lookups = {("id", str(title_id)), ("code", str(data.get("code")))}
+
+        for key in list(self._titles.get(title_id, ())):
+            expires_at, _ = self._entries[key]
+            method, url, params = key
+
+            if url.endswith("/title") and params and set(params) <= lookups:
+                self._entries[key] = (expires_at, data)
+            else:
+                self._remove(key)
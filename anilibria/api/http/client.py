@@ -1,8 +1,23 @@
+from .cache import ResponseCache
+from .connector import ConnectorConfig
+from .loader import TitleLoader
 from .public import PublicRequest
+from .ratelimit import RateLimiter, RetryPolicy
 
 __all__ = ("HTTPClient",)
 
 
 class HTTPClient(PublicRequest):
-    def __init__(self, proxy: str | None = None) -> None:
-        super().__init__(proxy)
+    def __init__(
+        self,
+        proxy: str | None = None,
+        connector_config: ConnectorConfig | None = None,
+        cache: ResponseCache | None = None,
+        title_loader: TitleLoader | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        base_url: str | None = None,
+    ) -> None:
+        super().__init__(
+            proxy, connector_config, cache, title_loader, rate_limiter, retry_policy, base_url
+        )
@@ -0,0 +1,92 @@
+from aiohttp import BaseConnector, TCPConnector
+
+from ..models.attrs_utils import define
+
+__all__ = ("ConnectorConfig", "PoolStats")
+
+
+@define()
+class ConnectorConfig:
+    """
+    Настройки пула соединений HTTP клиента.
+
+    ``TCP_NODELAY`` aiohttp включает для каждого соединения самостоятельно, поэтому отдельной настройки для него нет.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(
+           connector_config=ConnectorConfig(limit_per_host=50, keepalive_timeout=60)
+       )
+    """
+
+    limit: int = 100
+    "Максимальное количество одновременно открытых соединений. 0 - без ограничений"
+    limit_per_host: int = 0
+    "Максимальное количество одновременно открытых соединений к одному хосту. 0 - без ограничений"
+    ttl_dns_cache: int | None = 10
+    "Время жизни кеша DNS в секундах. None - кешировать навсегда"
+    use_dns_cache: bool = True
+    "Использовать ли кеш DNS"
+    keepalive_timeout: float | None = 15
+    "Сколько секунд держать неиспользуемое соединение открытым"
+    force_close: bool = False
+    "Закрывать ли соединение после каждого запроса"
+    enable_cleanup_closed: bool = False
+    "Принудительно закрывать транспорты, которые не закрылись после SSL shutdown"
+
+    def create_connector(self) -> TCPConnector:
+        """
+        Создаёт коннектор aiohttp с заданными настройками
+        """
+        kwargs = dict(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=self.use_dns_cache,
+            force_close=self.force_close,
+            enable_cleanup_closed=self.enable_cleanup_closed,
+        )
+        # aiohttp не позволяет указывать keepalive_timeout вместе с force_close
+        if not self.force_close:
+            kwargs["keepalive_timeout"] = self.keepalive_timeout
+
+        return TCPConnector(**kwargs)
+
+
+@define()
+class PoolStats:
+    """
+    Статистика пула соединений
+    """
+
+    open: int = 0
+    "Количество открытых соединений (используемых и простаивающих)"
+    acquired: int = 0
+    "Количество соединений, занятых запросами"
+    idle: int = 0
+    "Количество простаивающих соединений, готовых к переиспользованию"
+    waiting: int = 0
+    "Количество запросов, ожидающих свободное соединение"
+    limit: int = 0
+    "Ограничение на количество соединений"
+    limit_per_host: int = 0
+    "Ограничение на количество соединений к одному хосту"
+
+    @classmethod
+    def from_connector(cls, connector: BaseConnector | None) -> "PoolStats":
+        if connector is None or connector.closed:
+            return cls()
+
+        # aiohttp не предоставляет публичного API для этих значений
+        idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+        acquired = len(getattr(connector, "_acquired", ()))
+        waiting = sum(len(waiters) for waiters in getattr(connector, "_waiters", {}).values())
+
+        return cls(
+            open=idle + acquired,
+            acquired=acquired,
+            idle=idle,
+            waiting=waiting,
+            limit=connector.limit,
+            limit_per_host=connector.limit_per_host,
+        )
@@ -0,0 +1,161 @@
+import asyncio
+from enum import Enum
+from logging import getLogger
+from typing import TYPE_CHECKING, Hashable
+
+from ...utils.serializer import prepare_payload
+from .cache import make_key
+from .route import Route
+
+if TYPE_CHECKING:
+    from .public import PublicRequest
+
+log = getLogger("anilibria.loader")
+__all__ = ("TitleLoader",)
+
+
+def _freeze(value):
+    if isinstance(value, list):
+        return tuple(_freeze(_) for _ in value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class _Batch:
+    def __init__(self, params: dict) -> None:
+        self.params: dict = params
+        self.ids: dict[int, list[asyncio.Future]] = {}
+        self.codes: dict[str, list[asyncio.Future]] = {}
+        self.handle: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids) + len(self.codes)
+
+
+class TitleLoader:
+    """
+    Объединяет одновременные запросы тайтла по ``id`` или ``code`` в запросы ``/title/list``.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(title_loader=TitleLoader(delay=0.01))
+       titles = await asyncio.gather(*(client.get_title(id=id) for id in ids))  # 1-2 запроса вместо len(ids)
+
+    :param float delay: Сколько секунд собирать запросы перед отправкой.
+    :param int max_batch_size: Максимальное количество тайтлов в одном запросе.
+    """
+
+    def __init__(self, *, delay: float = 0.005, max_batch_size: int = 50) -> None:
+        self.delay: float = delay
+        self.max_batch_size: int = max_batch_size
+
+        self._batches: dict[Hashable, _Batch] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def can_load(payload: dict) -> bool:
+        """
+        Можно ли объединить запрос с другими. Запросы по ``torrent_id`` и запросы,
+        из ответа которых могут быть удалены ``id`` или ``code``, отправляются отдельно.
+        """
+        if payload.keys() & {"torrent_id", "filter", "remove"}:
+            return False
+
+        return ("id" in payload) != ("code" in payload)
+
+    async def load(self, http: "PublicRequest", route: Route, payload: dict) -> dict:
+        prepared = payload.copy()
+        prepare_payload(prepared)
+        key = make_key(route, prepared, http.base_url)
+
+        if http.cache is not None and (data := http.cache.get(route, key)) is not None:
+            return data
+
+        params = {k: v for k, v in payload.items() if k not in {"id", "code"}}
+        batch_key = tuple(sorted((k, _freeze(v)) for k, v in params.items()))
+
+        if (batch := self._batches.get(batch_key)) is None:
+            batch = self._batches[batch_key] = _Batch(params)
+            batch.handle = asyncio.get_running_loop().call_later(
+                self.delay, self._flush, http, batch_key
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        if "id" in payload:
+            batch.ids.setdefault(int(payload["id"]), []).append(future)
+        else:
+            batch.codes.setdefault(payload["code"], []).append(future)
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(http, batch_key)
+
+        data = await future
+
+        if http.cache is not None:
+            http.cache.set(route, key, data)
+
+        return data
+
+    def _flush(self, http: "PublicRequest", batch_key: Hashable):
+        if (batch := self._batches.pop(batch_key, None)) is None:
+            return
+
+        batch.handle.cancel()
+        task = asyncio.create_task(self._send(http, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, http: "PublicRequest", batch: _Batch):
+        log.debug(f"Loading {len(batch)} titles in one request")
+
+        try:
+            data = await http.get_titles(
+                id_list=list(batch.ids) or None,
+                code_list=list(batch.codes) or None,
+                items_per_page=len(batch),
+                **batch.params,
+            )
+        except Exception as error:
+            for futures in (*batch.ids.values(), *batch.codes.values()):
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+
+        titles = data["list"] if isinstance(data, dict) else data
+        by_id = {title.get("id"): title for title in titles}
+        by_code = {title.get("code"): title for title in titles}
+
+        missing = []
+
+        for lookup, found, futures_map in (
+            ("id", by_id, batch.ids),
+            ("code", by_code, batch.codes),
+        ):
+            for value, futures in futures_map.items():
+                if (title := found.get(value)) is None:
+                    # Отправляем отдельный запрос, чтобы вызывающий получил ошибку от API
+                    missing.append(
+                        self._load_single(http, {lookup: value, **batch.params}, futures)
+                    )
+                    continue
+
+                for future in futures:
+                    if not future.done():
+                        future.set_result(title)
+
+        await asyncio.gather(*missing)
+
+    @staticmethod
+    async def _load_single(http: "PublicRequest", payload: dict, futures: list[asyncio.Future]):
+        try:
+            data = await http.request(Route("GET", "/title"), payload)
+        except Exception as error:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for future in futures:
+                if not future.done():
+                    future.set_result(data)
@@ -1,4 +1,10 @@
+from typing import AsyncIterator
+
 from ...utils import dict_filter_none
+from .cache import ResponseCache
+from .connector import ConnectorConfig
+from .loader import TitleLoader
+from .ratelimit import RateLimiter, RetryPolicy
 from .request import Request
 from .route import Route
 
@@ -9,8 +15,15 @@ class PublicRequest(Request):
     def __init__(
         self,
         proxy: str | None = None,
+        connector_config: ConnectorConfig | None = None,
+        cache: ResponseCache | None = None,
+        title_loader: TitleLoader | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        base_url: str | None = None,
     ) -> None:
-        super().__init__(proxy)
+        super().__init__(proxy, connector_config, cache, rate_limiter, retry_policy, base_url)
+        self.title_loader: TitleLoader | None = title_loader
 
     # v1
     """
@@ -48,7 +61,12 @@ class PublicRequest(Request):
             description_type=description_type,
             playlist_type=playlist_type,
         )
-        return await self.request(Route("GET", "/title"), payload)
+        route = Route("GET", "/title")
+
+        if self.title_loader is not None and self.title_loader.can_load(payload):
+            return await self.title_loader.load(self, route, payload)
+
+        return await self.request(route, payload)
 
     async def get_titles(
         self,
@@ -256,16 +274,17 @@ class PublicRequest(Request):
 
     async def get_rss(
         self,
-        rss_type: str,
-        session: str,
+        rss_type: str | None = None,
+        session: str | None = None,
         since: int | None = None,
         after: int | None = None,
         limit: int | None = None,
-    ) -> str:
+        raw: bool = False,
+    ) -> str | dict | bytes:
         payload: dict = dict_filter_none(
             rss_type=rss_type, session=session, since=since, after=after, limit=limit
         )
-        return await self.request(Route("GET", "/torrent/rss"), payload)
+        return await self.request(Route("GET", "/torrent/rss"), payload, raw=raw)
 
     async def search_titles(
         self,
@@ -333,6 +352,37 @@ class PublicRequest(Request):
         )
         return await self.request(Route("GET", "/title/search/advanced"), payload)
 
+    # Потоковые запросы. Принимают те же параметры, что и обычные
+
+    def stream_titles(self, *, chunk_size: int = 64 * 1024, **params) -> AsyncIterator[dict]:
+        return self.stream(
+            Route("GET", "/title/list"), dict_filter_none(**params), chunk_size=chunk_size
+        )
+
+    def stream_updates(self, *, chunk_size: int = 64 * 1024, **params) -> AsyncIterator[dict]:
+        return self.stream(
+            Route("GET", "/title/updates"), dict_filter_none(**params), chunk_size=chunk_size
+        )
+
+    def stream_changes(self, *, chunk_size: int = 64 * 1024, **params) -> AsyncIterator[dict]:
+        return self.stream(
+            Route("GET", "/title/changes"), dict_filter_none(**params), chunk_size=chunk_size
+        )
+
+    def stream_search_titles(self, *, chunk_size: int = 64 * 1024, **params) -> AsyncIterator[dict]:
+        return self.stream(
+            Route("GET", "/title/search"), dict_filter_none(**params), chunk_size=chunk_size
+        )
+
+    def stream_advanced_search(
+        self, *, chunk_size: int = 64 * 1024, **params
+    ) -> AsyncIterator[dict]:
+        return self.stream(
+            Route("GET", "/title/search/advanced"),
+            dict_filter_none(**params),
+            chunk_size=chunk_size,
+        )
+
     async def get_user(
         self,
         session: str,
@@ -0,0 +1,164 @@
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from logging import getLogger
+from time import monotonic
+
+from ...utils.backoff import exponential_backoff
+from .route import Route
+
+log = getLogger("anilibria.ratelimit")
+__all__ = ("TokenBucket", "RateLimiter", "RetryPolicy")
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов по алгоритму token bucket.
+    Ожидающие получают токены в порядке очереди.
+
+    :param float rate: Сколько запросов в секунду можно отправлять.
+    :param float | None capacity: Сколько запросов можно отправить разом. По умолчанию равно ``rate``.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity or max(rate, 1)
+        self._tokens: float = self.capacity
+        self._updated_at: float = monotonic()
+        # Ожидающие в порядке вызова. Токен ждёт только первый, остальные ждут, пока он его получит
+        self._waiters: deque[asyncio.Future] = deque()
+
+    def _refill(self):
+        now = monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> bool:
+        """
+        Ждёт свободный токен. Возвращает ``True``, если пришлось ждать.
+        """
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            if self._waiters[0] is not future:
+                await future
+
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+        finally:
+            is_first = self._waiters[0] is future
+            self._waiters.remove(future)
+            # Будим следующего, даже если ожидание было отменено
+            if is_first and self._waiters and not self._waiters[0].done():
+                self._waiters[0].set_result(None)
+
+
+class RateLimiter:
+    """
+    Ограничивает частоту запросов к API: общий лимит и лимиты для отдельных маршрутов.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(
+           rate_limiter=RateLimiter(rate=10, routes={"/title/search": (2, 5)})
+       )
+
+    :param float | None rate: Общее количество запросов в секунду. None - без общего ограничения.
+    :param float | None burst: Сколько запросов можно отправить разом. По умолчанию равно ``rate``.
+    :param dict[str, tuple[float, float | None]] | None routes: Лимиты ``(rate, burst)`` для маршрутов.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float | None = None,
+        burst: float | None = None,
+        routes: dict[str, tuple[float, float | None]] | None = None,
+    ) -> None:
+        self._global: TokenBucket | None = TokenBucket(rate, burst) if rate else None
+        self._routes: dict[str, TokenBucket] = {
+            endpoint: TokenBucket(*limits) for endpoint, limits in (routes or {}).items()
+        }
+
+        self.throttled: int = 0
+        "Количество запросов, которым пришлось ждать из-за ограничения"
+
+    async def acquire(self, route: Route):
+        throttled = False
+
+        if (bucket := self._routes.get(route.endpoint)) is not None:
+            throttled |= await bucket.acquire()
+        if self._global is not None:
+            throttled |= await self._global.acquire()
+
+        if throttled:
+            self.throttled += 1
+            log.debug(f"Request to {route.endpoint} endpoint was throttled")
+
+
+class RetryPolicy:
+    """
+    Настройки повтора запросов при ошибках сервера и соединения.
+    Повторяются только идемпотентные запросы.
+
+    :param int attempts: Максимальное количество повторов.
+    :param float base_delay: Задержка перед первым повтором в секундах. Каждый следующий повтор ждёт в два раза дольше.
+    :param float max_delay: Максимальная задержка. Также ограничивает значение заголовка ``Retry-After``.
+    :param tuple[int, ...] statuses: HTTP коды ответов, при которых запрос повторяется.
+    :param tuple[str, ...] methods: HTTP методы, запросы которых можно повторять.
+    """
+
+    def __init__(
+        self,
+        *,
+        attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30,
+        statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+        methods: tuple[str, ...] = ("GET",),
+    ) -> None:
+        self.attempts: int = attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.statuses: tuple[int, ...] = statuses
+        self.methods: tuple[str, ...] = methods
+
+        self.retried: int = 0
+        "Количество повторённых запросов"
+
+    def can_retry(self, route: Route, attempt: int) -> bool:
+        return route.method in self.methods and attempt < self.attempts
+
+    def get_delay(self, attempt: int, retry_after: str | None = None) -> float:
+        if retry_after is not None:
+            if (delay := self._parse_retry_after(retry_after)) is not None:
+                return min(delay, self.max_delay)
+
+        return exponential_backoff(attempt, base=self.base_delay, maximum=self.max_delay)
+
+    @staticmethod
+    def _parse_retry_after(value: str) -> float | None:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+
+        return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
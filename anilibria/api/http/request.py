@@ -1,59 +1,254 @@
+import asyncio
 from logging import getLogger
+from typing import Any, AsyncIterator, Hashable
 
-from aiohttp import ClientResponse, ClientSession
-from orjson import JSONDecodeError, loads
+from aiohttp import ClientConnectionError, ClientResponse, ClientSession
+from orjson import loads
 
 from ...utils.serializer import prepare_payload
 from ..error import HTTPException
+from .cache import ResponseCache, make_key
+from .connector import ConnectorConfig, PoolStats
+from .ratelimit import RateLimiter, RetryPolicy
 from .route import Route
+from .stream import ListReader
 
 log = getLogger("anilibria.request")
 __all__ = ("Request",)
 
 
+def _is_json(content_type: str) -> bool:
+    return content_type == "application/json" or content_type.endswith("+json")
+
+
 class Request:
-    def __init__(self, proxy: str | None = None) -> None:
+    def __init__(
+        self,
+        proxy: str | None = None,
+        connector_config: ConnectorConfig | None = None,
+        cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        base_url: str | None = None,
+    ) -> None:
         self.proxy: str | None = proxy
+        self.base_url: str | None = base_url
+        self.connector_config: ConnectorConfig = connector_config or ConnectorConfig()
+        self.cache: ResponseCache | None = cache
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.retry_policy: RetryPolicy | None = retry_policy
         self.session: ClientSession = None  # noqa
 
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
     async def create_session(self) -> ClientSession:
         if self.session is None or self.session.closed:
-            self.session = ClientSession()
+            self.session = ClientSession(connector=self.connector_config.create_connector())
 
         return self.session
 
-    async def request(self, route: Route, params: dict = None, **kwargs):
+    @property
+    def pool_stats(self) -> PoolStats:
+        if self.session is None or self.session.closed:
+            return PoolStats()
+
+        return PoolStats.from_connector(self.session.connector)
+
+    async def request(self, route: Route, params: dict = None, *, raw: bool = False, **kwargs):
+        """
+        Отправляет запрос и возвращает ответ, разобранный по его ``Content-Type``.
+
+        :param Route route: Маршрут.
+        :param dict params: Параметры запроса.
+        :param bool raw: Вернуть тело ответа в байтах без разбора.
+        """
         await self.create_session()
 
         if params is not None:
             prepare_payload(params)
 
+        key = make_key(route, params, self.base_url)
+        if not raw and self.cache is not None and (data := self.cache.get(route, key)) is not None:
+            return data
+
+        if route.method != "GET" or kwargs:
+            return await self._send(route, params, key, raw=raw, **kwargs)
+
+        # Одинаковые GET запросы, отправленные одновременно, ждут ответа одного запроса
+        inflight_key = (key, raw)
+        if (future := self._inflight.get(inflight_key)) is None:
+            future = asyncio.ensure_future(self._send(route, params, key, raw=raw))
+            self._inflight[inflight_key] = future
+            future.add_done_callback(lambda _: self._release_inflight(inflight_key, future))
+        else:
+            log.debug("Waiting for an identical request to %s endpoint", route.endpoint)
+
+        return await asyncio.shield(future)
+
+    def _release_inflight(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Помечаем ошибку как полученную, даже если все ожидающие были отменены
+        if not future.cancelled():
+            future.exception()
+
+    async def _send(
+        self, route: Route, params: dict | None, key: Hashable, *, raw: bool = False, **kwargs
+    ) -> Any:
         if self.proxy is not None:
             kwargs["proxy"] = self.proxy
 
-        log.debug(
-            f"Send {route.method} request to {route.endpoint} endpoint with params: {params} and kwargs: {kwargs}"
-        )
+        attempt = 0
 
-        async with self.session.request(
-            route.method, route.url, params=params, **kwargs
-        ) as response:
-            data = await self._get_data(response)
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(route)
 
-            log.debug(f"Got response from request {data}")
+            log.debug(
+                "Send %s request to %s endpoint with params: %s and kwargs: %s",
+                route.method,
+                route.endpoint,
+                params,
+                kwargs,
+            )
 
-            self._catch_error(data)
+            try:
+                async with self.session.request(
+                    route.method, route.get_url(self.base_url), params=params, **kwargs
+                ) as response:
+                    if self._should_retry(route, attempt, response.status):
+                        delay = self.retry_policy.get_delay(
+                            attempt, response.headers.get("Retry-After")
+                        )
+                    else:
+                        data = await self._get_data(response, raw=raw)
+                        # Ответ форматируется в строку, только если отладочные логи включены
+                        log.debug("Got response from request %s", data)
 
-            return data
+                        if isinstance(data, bytes):
+                            return data
+                        # Тело ошибки не вернётся вместо байтов, даже если это не ошибка API
+                        if raw:
+                            self._raise_for_status(response.status, data)
+
+                        self._catch_error(data)
+
+                        if self.cache is not None:
+                            self.cache.set(route, key, data)
+
+                        return data
+            except (ClientConnectionError, asyncio.TimeoutError) as error:
+                if self.retry_policy is None or not self.retry_policy.can_retry(route, attempt):
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+                log.debug("Request to %s endpoint failed with %r", route.endpoint, error)
+
+            self.retry_policy.retried += 1
+            attempt += 1
+            log.debug("Retrying request to %s endpoint in %.2fs", route.endpoint, delay)
+            await asyncio.sleep(delay)
+
+    async def stream(
+        self, route: Route, params: dict | None = None, *, chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[Any]:
+        """
+        Отправляет запрос и возвращает элементы списка ``list`` из ответа по мере их получения.
+        Ответ не кешируется и не объединяется с одинаковыми запросами.
+        Запрос повторяется по :class:`RetryPolicy`, только пока не был получен первый элемент.
+        """
+        await self.create_session()
+
+        if params is not None:
+            prepare_payload(params)
+
+        kwargs = {"proxy": self.proxy} if self.proxy is not None else {}
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(route)
+
+            log.debug(
+                "Stream %s request to %s endpoint with params: %s",
+                route.method,
+                route.endpoint,
+                params,
+            )
+
+            reader: ListReader | None = None
+            try:
+                async with self.session.request(
+                    route.method, route.get_url(self.base_url), params=params, **kwargs
+                ) as response:
+                    if self._should_retry(route, attempt, response.status):
+                        delay = self.retry_policy.get_delay(
+                            attempt, response.headers.get("Retry-After")
+                        )
+                    elif response.status >= 400 or not self._can_stream(response):
+                        self._raise_for_status(response.status, await self._get_data(response))
+                        # Страница без ошибки, но в другом формате
+                        raise HTTPException(
+                            response.status, f"Unexpected {response.content_type} response"
+                        )
+                    else:
+                        reader = ListReader(response.content, chunk_size)
+                        async for item in reader:
+                            yield item
+
+                        self._catch_error(reader.rest)
+                        return
+            except (ClientConnectionError, asyncio.TimeoutError) as error:
+                if reader is not None and reader.items:
+                    raise
+                if self.retry_policy is None or not self.retry_policy.can_retry(route, attempt):
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+                log.debug("Request to %s endpoint failed with %r", route.endpoint, error)
+
+            self.retry_policy.retried += 1
+            attempt += 1
+            log.debug("Retrying request to %s endpoint in %.2fs", route.endpoint, delay)
+            await asyncio.sleep(delay)
+
+    def _should_retry(self, route: Route, attempt: int, status: int) -> bool:
+        if self.retry_policy is None or status not in self.retry_policy.statuses:
+            return False
+
+        return self.retry_policy.can_retry(route, attempt)
+
+    @staticmethod
+    async def _get_data(response: ClientResponse, *, raw: bool = False) -> Any:
+        body = await response.read()
+        # Ошибки разбираются всегда, чтобы их можно было выбросить
+        if raw and response.status < 400:
+            return body
+
+        content_type = response.content_type
+        if _is_json(content_type):
+            return loads(body) if body.strip() else None
+        # RSS, Atom и другие текстовые ответы
+        if content_type.startswith("text/") or content_type.endswith("xml"):
+            return body.decode(response.charset or "utf-8", errors="replace")
+
+        # Тип не указан: JSON узнаём по первому символу, чтобы не ловить ошибку разбора
+        if body.lstrip()[:1] in {b"{", b"["}:
+            return loads(body)
+        return body.decode(response.charset or "utf-8", errors="replace")
 
     @staticmethod
-    async def _get_data(response: ClientResponse) -> dict | str:
-        try:
-            data = await response.json(loads=loads)
-        except JSONDecodeError:  # Could be RSS
-            data = await response.text()
+    def _can_stream(response: ClientResponse) -> bool:
+        # Без Content-Type aiohttp возвращает application/octet-stream, тогда формат проверит ListReader
+        content_type = response.content_type
+        return _is_json(content_type) or content_type == "application/octet-stream"
 
-        return data
+    @classmethod
+    def _raise_for_status(cls, status: int, data: Any):
+        """
+        Выбрасывает ошибку из ответа или :class:`HTTPException` с телом ответа, если код ответа - ошибка.
+        """
+        cls._catch_error(data)
+        if status >= 400:
+            raise HTTPException(status, data if isinstance(data, str) else repr(data))
 
     @staticmethod
     def _catch_error(data: dict):
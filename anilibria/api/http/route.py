@@ -14,5 +14,16 @@ class Route:
 
     @property
     def url(self) -> str:
-        url = V1_URL if self._is_v1 else V3_URL
+        return self.get_url()
+
+    def get_url(self, base_url: str | None = None) -> str:
+        """
+        Возвращает ссылку на маршрут.
+
+        :param str | None base_url: Адрес API v3 вместо стандартного. Не влияет на маршруты v1.
+        """
+        if self._is_v1:
+            url = V1_URL
+        else:
+            url = base_url or V3_URL
         return f"{url}{self.endpoint}"
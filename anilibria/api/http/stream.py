@@ -0,0 +1,225 @@
+import re
+from typing import Any, AsyncIterator
+
+from aiohttp import StreamReader
+from orjson import JSONDecodeError, loads
+
+__all__ = ("ListReader",)
+
+_WHITESPACE = b" \t\n\r"
+# Скобки и начало строки внутри объекта или массива
+_STRUCTURAL = re.compile(rb'["{}\[\]]')
+# Продолжение строки после открывающей кавычки до закрывающей
+_STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Конец числа, true, false или null
+_SCALAR_END = re.compile(rb"[,:\]}\s]")
+# Начало объекта до конца первого ключа
+_FIRST_KEY = re.compile(rb'\{\s*"[^"\\]*"\s*:')
+
+
+class ListReader:
+    """
+    Разбирает ответ со списком объектов по частям, не загружая весь ответ в память.
+
+    Возвращает элементы массива ``list`` из объекта ответа (или элементы самого ответа, если это массив)
+    по мере их получения. Остальные поля ответа, например ``pagination`` или ``error``,
+    доступны в :attr:`.rest` после того, как все элементы были получены.
+
+    Граница элемента ищется по байтам, а сам элемент разбирает ``orjson``. Чтение по частям
+    экономит память, а не время: разобрать весь ответ разом не медленнее, но для этого нужен весь ответ.
+
+    :param StreamReader content: Поток тела ответа.
+    :param int chunk_size: Размер читаемой части ответа в байтах.
+    """
+
+    def __init__(self, content: StreamReader, chunk_size: int = 64 * 1024) -> None:
+        self.content: StreamReader = content
+        self.chunk_size: int = chunk_size
+
+        self.rest: dict = {}
+        "Поля ответа, кроме ``list``"
+        self.items: int = 0
+        "Количество полученных элементов"
+
+        self._buffer: bytearray = bytearray()
+        self._position: int = 0
+        self._eof: bool = False
+        # Начало элемента списка -> возможные концы предыдущего элемента
+        self._boundaries: dict[bytes, re.Pattern] = {}
+
+    async def _fill(self) -> bool:
+        if self._eof:
+            return False
+
+        # Разобранная часть удаляется, только когда она больше половины буфера,
+        # чтобы не копировать буфер после каждого элемента
+        if self._position > len(self._buffer) // 2:
+            del self._buffer[: self._position]
+            self._position = 0
+
+        chunk = await self.content.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._buffer += chunk
+        return True
+
+    async def _peek(self) -> int:
+        """
+        Пропускает пробелы и возвращает следующий байт, не сдвигая позицию.
+        """
+        while True:
+            buffer = self._buffer
+            while self._position < len(buffer) and buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(buffer):
+                return buffer[self._position]
+            if not await self._fill():
+                raise ValueError("Unexpected end of the response")
+
+    async def _expect(self, chars: bytes) -> int:
+        if (char := await self._peek()) not in chars:
+            raise ValueError(
+                f"Expected one of {chars.decode()!r} at position {self._position}, got {chr(char)!r}"
+            )
+        self._position += 1
+        return char
+
+    async def _more(self):
+        if not await self._fill():
+            raise ValueError("Unexpected end of the response")
+
+    async def _find_end(self, first: int) -> int:
+        # Отступ от начала значения: `_fill` может сдвинуть буфер, но не удаляет само значение
+        offset = 1
+
+        if first == ord('"'):
+            while (match := _STRING_END.match(self._buffer, self._position + 1)) is None:
+                await self._more()
+            return match.end()
+
+        if first not in b"{[":
+            while (match := _SCALAR_END.search(self._buffer, self._position + 1)) is None:
+                if not await self._fill():
+                    return len(self._buffer)
+            return match.start()
+
+        depth = 1
+        while True:
+            match = _STRUCTURAL.search(self._buffer, self._position + offset)
+            if match is None:
+                offset = len(self._buffer) - self._position
+                await self._more()
+                continue
+
+            char = self._buffer[match.start()]
+            if char == ord('"'):
+                string = _STRING_END.match(self._buffer, match.end())
+                if string is None:
+                    # Строка будет разобрана заново от кавычки, когда придут новые данные
+                    offset = match.start() - self._position
+                    await self._more()
+                    continue
+                offset = string.end() - self._position
+                continue
+
+            offset = match.end() - self._position
+            depth += 1 if char in b"{[" else -1
+            if not depth:
+                return match.end()
+
+    async def _get_boundary(self) -> re.Pattern | None:
+        # Элементы списка обычно начинаются с одного и того же ключа, поэтому концом объекта
+        # может быть только "}" перед запятой и таким же началом следующего элемента или перед "]"
+        while (match := _FIRST_KEY.match(self._buffer, self._position)) is None:
+            if self._buffer[self._position] != ord("{") or len(self._buffer) - self._position > 256:
+                return None
+            if not await self._fill():
+                return None
+
+        start = match.group()
+        if (boundary := self._boundaries.get(start)) is None:
+            boundary = re.compile(rb"\}\s*(?:,\s*" + re.escape(start) + rb"|\])")
+            self._boundaries[start] = boundary
+        return boundary
+
+    async def _item(self) -> Any:
+        """
+        Разбирает элемент списка. Вложенный объект может закончиться так же, как элемент,
+        поэтому возможные концы проверяет ``loads``: ошибка означает, что объект ещё не закончился.
+        """
+        if await self._peek() != ord("{") or (boundary := await self._get_boundary()) is None:
+            return await self._value()
+
+        # Отступы от начала элемента: `_fill` может сдвинуть буфер, но не удаляет сам элемент
+        offset = counted = 1
+        # Разница открывающих и закрывающих фигурных скобок до `counted`. Скобки внутри строк
+        # не отличить без разбора, поэтому это лишь быстрая проверка, отсеивающая вложенные объекты
+        balance = 1
+
+        while True:
+            buffer, start = self._buffer, self._position
+            for match in boundary.finditer(buffer, start + offset):
+                end = match.start() + 1
+                offset = end - start
+                balance += buffer.count(b"{", start + counted, end)
+                balance -= buffer.count(b"}", start + counted, end)
+                counted = offset
+                if balance:
+                    continue
+
+                try:
+                    value = loads(buffer[start:end])
+                except JSONDecodeError:
+                    continue
+                self._position = end
+                return value
+
+            # Конец, за которым ещё не пришло начало следующего элемента, найдётся после чтения
+            offset = max(offset, buffer.rfind(b"}", start + offset) - start)
+            if not await self._fill():
+                # Проверка скобок не пропустила конец: в строках элемента есть непарные скобки
+                return await self._value()
+
+    async def _value(self) -> Any:
+        end = await self._find_end(await self._peek())
+        value = loads(self._buffer[self._position : end])
+        self._position = end
+        return value
+
+    async def _items(self) -> AsyncIterator[Any]:
+        if await self._peek() == ord("]"):
+            self._position += 1
+            return
+
+        while True:
+            item = await self._item()
+            self.items += 1
+            yield item
+            if await self._expect(b",]") == ord("]"):
+                return
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        if await self._expect(b"{[") == ord("["):
+            async for item in self._items():
+                yield item
+            return
+
+        if await self._peek() == ord("}"):
+            return
+
+        while True:
+            key = await self._value()
+            await self._expect(b":")
+
+            if key == "list" and await self._peek() == ord("["):
+                self._position += 1
+                self.rest["list"] = []
+                async for item in self._items():
+                    yield item
+            else:
+                self.rest[key] = await self._value()
+
+            if await self._expect(b",}") == ord("}"):
+                return
@@ -1,5 +1,6 @@
 from .attrs_utils import *  # noqa: F401 F403
 from .cattrs_utils import *  # noqa: F401 F403
 from .enums import *  # noqa: F401 F403
+from .lazy import *  # noqa: F401 F403
 from .misc import *  # noqa: F401 F403
 from .title import *  # noqa: F401 F403
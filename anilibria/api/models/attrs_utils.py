@@ -7,7 +7,7 @@ __all__ = ("define",)
 log = getLogger("anilibria.attrs")
 
 
-define_defaults = dict(kw_only=True)
+define_defaults = dict(kw_only=True, slots=True, weakref_slot=False)
 
 
 @wraps(attrs.define)
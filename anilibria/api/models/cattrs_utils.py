@@ -1,30 +1,137 @@
-from typing import List, Type
+from enum import Enum
+from types import NoneType, UnionType
+from typing import Any, Callable, List, Type, Union, get_args, get_origin
 
-from cattrs import Converter
+import attrs
+from cattrs.gen import make_dict_structure_fn
+from cattrs.preconf.orjson import make_converter
 
+from . import misc, title
 from .title import Episode, RutubeEpisode
 
 __all__ = ("converter",)
 
-converter = Converter()
+converter = make_converter(detailed_validation=False)
 
+StructureHook = Callable[[Any, Any], Any]
+_PRIMITIVES = (int, str, float, bool)
 
-def _playlist_hook(data: dict | list, type_: Type[Episode | RutubeEpisode]):
-    if isinstance(data, list):
-        return [converter.structure(_, type_) for _ in data]
-    if isinstance(data, dict):
-        return {k: converter.structure(v, type_) for k, v in data.items()}
 
+# Функции преобразования, созданные этим модулем. Внутренний реестр cattrs меняется между версиями
+_hooks: dict[Any, StructureHook] = {}
 
-def _series_hook(data: dict | list, type_: type):
-    return _playlist_hook(data, Episode)
 
+def _structure_enum(value: Any, type_: Type[Enum]) -> Enum:
+    return type_(value)
 
-def _rutube_series_hook(data: dict | list, type_: type):
-    return _playlist_hook(data, RutubeEpisode)
 
+def _register_structure_hook(type_: Any, hook: StructureHook):
+    _hooks[type_] = hook
+    converter.register_structure_hook(type_, hook)
 
-converter.register_structure_hook(dict[str, Episode] | List[Episode], _series_hook)
-converter.register_structure_hook(
-    dict[str, RutubeEpisode] | List[RutubeEpisode], _rutube_series_hook
+
+def _get_structure_hook(type_: Any) -> StructureHook:
+    if type_ in _PRIMITIVES:
+        return lambda value, _: type_(value)
+    if (hook := _hooks.get(type_)) is not None:
+        return hook
+
+    if _is_list(type_):
+        hook = _list_hook_factory(type_)
+    elif _is_optional(type_):
+        hook = _optional_hook_factory(type_)
+    elif isinstance(type_, type) and issubclass(type_, Enum):
+        hook = _structure_enum
+    else:
+        hook = None
+
+    if hook is not None:
+        _hooks[type_] = hook
+        return hook
+
+    # Модель может быть зарегистрирована позже, поэтому функция ищется при первом вызове
+    resolved: StructureHook | None = None
+
+    def lazy_hook(value, type_):
+        nonlocal resolved
+        if resolved is None:
+            resolved = _hooks.get(type_, converter.structure)
+        return resolved(value, type_)
+
+    return lazy_hook
+
+
+def make_structure_hook(type_: type, **overrides) -> StructureHook:
+    """
+    Генерирует функцию преобразования для модели с настройками конвертера
+    """
+    return make_dict_structure_fn(
+        type_,
+        converter,
+        _cattrs_detailed_validation=converter.detailed_validation,
+        **overrides,
+    )
+
+
+def _is_optional(type_: Any) -> bool:
+    if get_origin(type_) not in (Union, UnionType):
+        return False
+
+    args = get_args(type_)
+    return len(args) == 2 and NoneType in args
+
+
+def _optional_hook_factory(type_: Any) -> StructureHook:
+    # cattrs ищет функцию для вложенного типа при каждом вызове, поэтому находим её заранее
+    inner = next(arg for arg in get_args(type_) if arg is not NoneType)
+
+    if inner in _PRIMITIVES:
+        return lambda value, _: None if value is None else inner(value)
+
+    structure = _get_structure_hook(inner)
+
+    def hook(value, _):
+        return None if value is None else structure(value, inner)
+
+    return hook
+
+
+def _is_list(type_: Any) -> bool:
+    return get_origin(type_) is list and len(get_args(type_)) == 1
+
+
+def _list_hook_factory(type_: Any) -> StructureHook:
+    inner = get_args(type_)[0]
+    structure = _get_structure_hook(inner)
+
+    def hook(value, _):
+        return [structure(item, inner) for item in value]
+
+    return hook
+
+
+def _make_playlist_hook(type_: Type[Episode | RutubeEpisode]) -> StructureHook:
+    structure = make_structure_hook(type_)
+    _register_structure_hook(type_, structure)
+
+    def hook(data: dict | list, _: type):
+        if isinstance(data, list):
+            return [structure(item, type_) for item in data]
+        if isinstance(data, dict):
+            return {key: structure(value, type_) for key, value in data.items()}
+
+    return hook
+
+
+converter.register_structure_hook_factory(_is_list, _list_hook_factory)
+converter.register_structure_hook_factory(_is_optional, _optional_hook_factory)
+_register_structure_hook(dict[str, Episode] | List[Episode], _make_playlist_hook(Episode))
+_register_structure_hook(
+    dict[str, RutubeEpisode] | List[RutubeEpisode], _make_playlist_hook(RutubeEpisode)
 )
+
+for _module in (title, misc):
+    for _name in _module.__all__:
+        _model = getattr(_module, _name)
+        if attrs.has(_model) and not hasattr(_model, "__parameters__"):
+            _register_structure_hook(_model, make_structure_hook(_model))
@@ -0,0 +1,82 @@
+from typing import Any
+
+import attrs
+from attrs import field
+from cattrs.gen import make_dict_unstructure_fn, override
+
+from .attrs_utils import define
+from .cattrs_utils import converter, make_structure_hook
+from .title import Player, Title, TitleFranchise, Torrents
+
+__all__ = ("LazyTitle",)
+
+_LAZY_FIELDS: dict[str, Any] = {
+    "player": Player | None,
+    "torrents": Torrents | None,
+    "franchises": list[TitleFranchise] | None,
+}
+
+
+@define()
+class LazyTitle(Title):
+    """
+    Объект тайтла, у которого ``player``, ``torrents`` и ``franchises`` хранятся в виде словарей
+    и преобразуются в объекты только при первом обращении к ним.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(lazy_titles=True)
+       title = await client.get_title(id=9000)
+       print(title.names.ru)  # Плейлист и торренты не были преобразованы
+
+    Равен :class:`Title` с теми же данными, при сравнении ленивые поля преобразуются.
+    """
+
+    _raw: dict = field(factory=dict, repr=False, eq=False)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Title):
+            return NotImplemented
+        return all(
+            getattr(self, attribute.name) == getattr(other, attribute.name)
+            for attribute in attrs.fields(Title)
+        )
+
+
+def _lazy_field(name: str, type_: Any) -> property:
+    slot = getattr(Title, name)
+
+    def getter(self: LazyTitle):
+        if name in self._raw:
+            slot.__set__(self, converter.structure(self._raw.pop(name), type_))
+        return slot.__get__(self, LazyTitle)
+
+    def setter(self: LazyTitle, value):
+        # __init__ присваивает поля тайтла раньше, чем _raw
+        try:
+            self._raw.pop(name, None)
+        except AttributeError:
+            pass
+        slot.__set__(self, value)
+
+    return property(getter, setter)
+
+
+for _name, _type in _LAZY_FIELDS.items():
+    setattr(LazyTitle, _name, _lazy_field(_name, _type))
+
+_structure_title = make_structure_hook(LazyTitle)
+
+
+def _lazy_title_hook(data: dict, type_: type) -> LazyTitle:
+    raw = {name: data[name] for name in _LAZY_FIELDS if data.get(name) is not None}
+    title = _structure_title({k: v for k, v in data.items() if k not in raw}, type_)
+    title._raw = raw
+    return title
+
+
+converter.register_structure_hook(LazyTitle, _lazy_title_hook)
+# Непреобразованные поля читаются через свойства, поэтому словарь с ними не нужен
+converter.register_unstructure_hook(
+    LazyTitle, make_dict_unstructure_fn(LazyTitle, converter, _raw=override(omit=True))
+)
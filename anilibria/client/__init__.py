@@ -1 +1,4 @@
 from .client import *  # noqa: F401 F403
+from .index import *  # noqa: F401 F403
+from .pagination import *  # noqa: F401 F403
+from .store import *  # noqa: F401 F403
@@ -1,17 +1,37 @@
 import asyncio
+from contextlib import aclosing
 from logging import DEBUG, basicConfig, getLogger
-from typing import Callable, Coroutine, Type
-
-from aiohttp import WSServerHandshakeError
+from typing import AsyncIterator, Awaitable, Callable, Coroutine, Type
 
+from ..api.dispatch import Dispatch
 from ..api.error import NoArgumentsError
 from ..api.gateway.client import GatewayClient
-from ..api.gateway.events import BaseEvent, EventType, PlaylistUpdate, TitleEpisode
+from ..api.gateway.coalesce import EventCoalescer, get_batch_name
+from ..api.gateway.events import (
+    BaseEvent,
+    EventType,
+    PlaylistUpdate,
+    Reconnect,
+    TitleEpisode,
+    TitleUpdate,
+)
+from ..api.gateway.polling import PollingClient, PollingPolicy
+from ..api.gateway.reconnect import ReconnectPolicy, ReconnectStats
+from ..api.gateway.recovery import GapRecovery, RecoverySource
+from ..api.gateway.replay import FrameRecorder, ReplayPolicy, ReplayTransport
+from ..api.gateway.sharding import ShardedGateway
+from ..api.gateway.workers import ProcessDecoder
+from ..api.http.cache import CacheInvalidation, ResponseCache
 from ..api.http.client import HTTPClient
+from ..api.http.connector import ConnectorConfig, PoolStats
+from ..api.http.loader import TitleLoader
+from ..api.http.ratelimit import RateLimiter, RetryPolicy
 from ..api.models import (
     DescriptionType,
     Include,
+    LazyTitle,
     ListPagination,
+    Pagination,
     PlaylistType,
     RSSType,
     Schedule,
@@ -25,6 +45,9 @@ from ..api.models import (
 from ..api.models.cattrs_utils import converter
 from ..utils.serializer import dict_filter_missing
 from ..utils.typings import MISSING, Absent
+from .index import TitleIndex
+from .pagination import paginate
+from .store import TitleStore
 
 log = getLogger("anilibria.client")
 __all__ = ("AniLibriaClient",)
@@ -33,11 +56,101 @@ __all__ = ("AniLibriaClient",)
 class AniLibriaClient:
     """
     Основной клиент для взаимодействия с API anilibria.tv.
+
+    :param str | None proxy: Прокси, через который будут отправляться запросы.
+    :param bool | int | None logging: Включить логирование. Можно передать уровень логирования.
+    :param ConnectorConfig | None connector_config: Настройки пула HTTP соединений.
+    :param ResponseCache | None cache: Кеш ответов API. По умолчанию ответы не кешируются.
+    :param TitleLoader | None title_loader: Объединяет одновременные вызовы :meth:`.get_title` в один запрос.
+    :param RateLimiter | None rate_limiter: Ограничение частоты запросов к API.
+    :param RetryPolicy | None retry_policy: Настройки повтора запросов при ошибках сервера и соединения.
+    :param bool lazy_titles: Возвращать ли тайтлы в виде :class:`LazyTitle`, у которых плеер, торренты и франшизы
+        преобразуются в объекты только при обращении к ним. Тайтлы в событиях вебсокета всегда преобразуются полностью.
+    :param Dispatch | None dispatch: Диспетчер событий. Позволяет ограничить количество одновременно
+        выполняющихся обработчиков.
+    :param EventCoalescer | None coalescer: Объединяет частые события за окно времени.
+    :param ReconnectPolicy | None reconnect_policy: Настройки переподключения к вебсокету.
+    :param GapRecovery | None gap_recovery: Запрашивать ли обновления тайтлов, пропущенные во время
+        переподключения.
+    :param PollingPolicy | None polling: Получать ли события через периодические HTTP запросы вместо вебсокета.
+        Полезно, если вебсокет недоступен.
+    :param list[dict | None] | None shards: Подписки для нескольких одновременных соединений с вебсокетом.
+        Смотрите :class:`ShardedGateway`.
+    :param ProcessDecoder | None decoder: Разбирать ли события вебсокета в отдельных процессах.
+    :param str | None base_url: Адрес API вместо ``https://api.anilibria.tv/v3.0``.
+        Например, адрес :class:`anilibria.testing.MockServer`.
+    :param str | None gateway_url: Адрес вебсокета вместо ``wss://api.anilibria.tv/v3.0/ws/``.
+    :param FrameRecorder | None recorder: Записывать ли сообщения вебсокета в файл.
+    :param ReplayPolicy | None replay: Воспроизводить ли записанные сообщения вместо подключения к вебсокету.
+    :param TitleStore | None store: Хранилище тайтлов на диске. Смотрите :meth:`.sync_store`.
+    :param TitleIndex | None index: Индекс тайтлов в памяти для поиска без запросов к API.
+        Смотрите :meth:`.sync_index`.
     """
 
-    def __init__(self, *, proxy: str | None = None, logging: bool | int | None = None) -> None:
-        self._http: HTTPClient = HTTPClient(proxy=proxy)
-        self._websocket: GatewayClient = GatewayClient(http=self._http)
+    def __init__(
+        self,
+        *,
+        proxy: str | None = None,
+        logging: bool | int | None = None,
+        connector_config: ConnectorConfig | None = None,
+        cache: ResponseCache | None = None,
+        title_loader: TitleLoader | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        lazy_titles: bool = False,
+        dispatch: Dispatch | None = None,
+        coalescer: EventCoalescer | None = None,
+        reconnect_policy: ReconnectPolicy | None = None,
+        gap_recovery: GapRecovery | None = None,
+        polling: PollingPolicy | None = None,
+        shards: list[dict | None] | None = None,
+        decoder: ProcessDecoder | None = None,
+        base_url: str | None = None,
+        gateway_url: str | None = None,
+        recorder: FrameRecorder | None = None,
+        replay: ReplayPolicy | None = None,
+        store: TitleStore | None = None,
+        index: TitleIndex | None = None,
+    ) -> None:
+        self._http: HTTPClient = HTTPClient(
+            proxy=proxy,
+            connector_config=connector_config,
+            cache=cache,
+            title_loader=title_loader,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            base_url=base_url,
+        )
+        gateway_kwargs = dict(
+            dispatch=dispatch,
+            coalescer=coalescer,
+            reconnect_policy=reconnect_policy,
+            gap_recovery=gap_recovery,
+            decoder=decoder,
+            url=gateway_url,
+            recorder=recorder,
+            fetch_gap=self._fetch_gap,
+        )
+        if sum(source is not None for source in (polling, shards, replay)) > 1:
+            raise ValueError("Only one of polling, shards and replay can be used")
+
+        if replay is not None:
+            self._websocket: GatewayClient = ReplayTransport(
+                http=self._http, replay=replay, **gateway_kwargs
+            )
+        elif polling is not None:
+            self._websocket: GatewayClient = PollingClient(
+                http=self._http, polling=polling, **gateway_kwargs
+            )
+        elif shards is not None:
+            self._websocket: GatewayClient = ShardedGateway(
+                http=self._http, shards=shards, **gateway_kwargs
+            )
+        else:
+            self._websocket: GatewayClient = GatewayClient(http=self._http, **gateway_kwargs)
+        self._title_model: Type[Title] = LazyTitle if lazy_titles else Title
+        self._store: TitleStore | None = store
+        self._index: TitleIndex | None = index
 
         if logging is not None:
             if logging is True:
@@ -45,10 +158,109 @@ class AniLibriaClient:
             else:
                 basicConfig(level=logging)
 
-        self.event(self._on_playlist_update, name="on_playlist_update")
+        # Обработчики библиотеки не должны теряться при переполнении очереди диспетчера
+        dispatch = self._websocket.dispatch
+        if cache is not None and cache.invalidation is not CacheInvalidation.NONE:
+            for event_type in (
+                EventType.TITLE_UPDATE,
+                EventType.PLAYLIST_UPDATE,
+                EventType.TORRENT_UPDATE,
+            ):
+                dispatch.register(
+                    f"on_{event_type.name.lower()}", self._invalidate_cache, raw=True, internal=True
+                )
+
+        if store is not None:
+            for event_type in (
+                EventType.TITLE_UPDATE,
+                EventType.PLAYLIST_UPDATE,
+                EventType.TORRENT_UPDATE,
+            ):
+                dispatch.register(
+                    f"on_{event_type.name.lower()}", self._update_store, raw=True, internal=True
+                )
+            dispatch.register("on_reconnect", self._sync_store_after_reconnect, internal=True)
+
+        if index is not None:
+            dispatch.register("on_title_update", self._update_index, internal=True)
 
         self._loop = asyncio.get_event_loop()
 
+    @property
+    def cache(self) -> ResponseCache | None:
+        """
+        Возвращает кеш ответов API, если он был передан.
+        """
+        return self._http.cache
+
+    @property
+    def store(self) -> TitleStore | None:
+        """
+        Возвращает хранилище тайтлов, если оно было передано.
+        """
+        return self._store
+
+    @property
+    def index(self) -> TitleIndex | None:
+        """
+        Возвращает индекс тайтлов, если он был передан.
+        """
+        return self._index
+
+    @property
+    def reconnect_stats(self) -> ReconnectStats:
+        """
+        Возвращает статистику подключений к вебсокету.
+        """
+        return self._websocket.stats
+
+    @property
+    def pool_stats(self) -> PoolStats:
+        """
+        Возвращает статистику пула HTTP соединений.
+        """
+        return self._http.pool_stats
+
+    async def _invalidate_cache(self, data: dict):
+        # Событие не преобразуется в объект: для сброса нужен только ID тайтла,
+        # а для замены - тайтл в формате ответа API, который и хранится в кеше
+        if isinstance(title := data.get("title"), dict):  # title_update
+            if title.get("id") is None:
+                return
+            if self.cache.invalidation is CacheInvalidation.PATCH:
+                return self.cache.update_title(title)
+            return self.cache.invalidate_title(title["id"])
+
+        if (title_id := data.get("id")) is not None:
+            self.cache.invalidate_title(int(title_id))
+
+    async def _update_store(self, data: dict):
+        if isinstance(title := data.get("title"), dict):  # title_update
+            return await self._store.put(title)
+
+        if (title_id := data.get("id")) is None:
+            return
+        # Изменения, пришедшие до первой синхронизации, будут получены через неё
+        fields = {key: data[key] for key in ("player", "torrents") if data.get(key) is not None}
+        if fields:
+            await self._store.update(int(title_id), fields)
+
+    async def _update_index(self, event: TitleUpdate):
+        if event.title is not None:
+            self._index.add(event.title)
+
+    async def _sync_store_after_reconnect(self, _: Reconnect):
+        await self.sync_store()
+
+    def _fetch_gap(self, since: int) -> AsyncIterator[Title]:
+        recovery = self._websocket.gap_recovery
+        if recovery.source is RecoverySource.UPDATES:
+            iterate = self.iter_updates
+        else:
+            iterate = self.iter_changes
+
+        return iterate(since=since, items_per_page=recovery.items_per_page, window=recovery.window)
+
     async def _on_playlist_update(self, event: PlaylistUpdate):
         # Убеждаемся, что ивент затрагивает обновление эпизода, а не другие данные
         if not event.updated_episode or not event.updated_episode.hls:
@@ -100,7 +312,7 @@ class AniLibriaClient:
 
         return wrapper
 
-    def on(self, event: Type[BaseEvent]):
+    def on(self, event: Type[BaseEvent], *, raw: bool = False, batch: bool = False):
         """
         Декоратор для прослушивания событий. Принимает класс события.
 
@@ -110,18 +322,35 @@ class AniLibriaClient:
            async def name_you_want(event: PlaylistUpdate):
                ...
 
+           @client.on(EncodeProgress, raw=True)
+           async def progress(data: dict):  # Событие не преобразуется в объект
+               ...
+
+           @client.on(EncodeProgress, batch=True)
+           async def progress_batch(events: list[EncodeProgress]):
+               ...
+
         :param event: Класс ивента
+        :param bool raw: Передавать ли обработчику словарь из вебсокета вместо объекта события.
+        :param bool batch: Передавать ли обработчику список событий за окно :class:`EventCoalescer`.
         """
 
         def wrapper(coro: Callable[..., Coroutine]) -> Callable[..., Coroutine]:
             event_name: str = "on_" + EventType(event).name.lower()
-            self._websocket.dispatch.register(event_name, coro)
+            self._register(event_name, coro, raw=raw, batch=batch)
 
             return coro
 
         return wrapper
 
-    def listen(self, coro: Callable[..., Coroutine] = MISSING, *, name: str = MISSING):
+    def listen(
+        self,
+        coro: Callable[..., Coroutine] = MISSING,
+        *,
+        name: str = MISSING,
+        raw: bool = False,
+        batch: bool = False,
+    ):
         """
         Декоратор для прослушивания событий. Принимает названия события.
 
@@ -143,10 +372,12 @@ class AniLibriaClient:
 
         :param Callable[..., Coroutine] coro: Функция, которая будет вызываться.
         :param str name: Название ивента. Например: on_title_update.
+        :param bool raw: Передавать ли обработчику словарь из вебсокета вместо объекта события.
+        :param bool batch: Передавать ли обработчику список событий за окно :class:`EventCoalescer`.
         """
 
         def decorator(coro: Callable[..., Coroutine]):
-            self._websocket.dispatch.register(name or coro.__name__, coro)
+            self._register(name or coro.__name__, coro, raw=raw, batch=batch)
             return coro
 
         if coro is not MISSING:
@@ -154,7 +385,14 @@ class AniLibriaClient:
 
         return decorator
 
-    def event(self, coro: Callable[..., Coroutine] = MISSING, *, name: str = MISSING):
+    def event(
+        self,
+        coro: Callable[..., Coroutine] = MISSING,
+        *,
+        name: str = MISSING,
+        raw: bool = False,
+        batch: bool = False,
+    ):
         """
         Декоратор для прослушивания событий. Принимает названия события.
         Алиас для :meth:`.listen`:
@@ -177,14 +415,33 @@ class AniLibriaClient:
 
         :param Callable[..., Coroutine] coro: Функция, которая будет вызываться.
         :param str name: Название ивента. Например: on_title_update.
+        :param bool raw: Передавать ли обработчику словарь из вебсокета вместо объекта события.
+        :param bool batch: Передавать ли обработчику список событий за окно :class:`EventCoalescer`.
         """
 
-        return self.listen(coro, name=name)
+        return self.listen(coro, name=name, raw=raw, batch=batch)
+
+    def _register(self, name: str, coro: Callable[..., Coroutine], *, raw: bool, batch: bool):
+        if batch:
+            if raw:
+                raise ValueError("Batch listeners can't receive raw events")
+            if self._websocket.coalescer is None:
+                # Только собираем события в списки, не объединяя их
+                self._websocket.coalescer = EventCoalescer(keys={})
+            name = get_batch_name(name)
+
+        dispatch = self._websocket.dispatch
+        # on_playlist_update преобразуется в объект и запрашивает тайтл только для обработчиков on_title_episode
+        if name == "on_title_episode" and not raw and not dispatch.has_listeners(name, raw=False):
+            dispatch.register("on_playlist_update", self._on_playlist_update)
+
+        dispatch.register(name, coro, raw=raw)
 
     async def subscribe(self, subscribe: dict, filter: str = MISSING, remove: str = MISSING):
         """
         По умолчанию клиент получает все возможные уведомления от API.
-        Но можно подписаться на определённые ивенты, или ивенты с каким-то фильтром
+        Но можно подписаться на определённые ивенты, или ивенты с каким-то фильтром.
+        Подписки отправляются заново после переподключения.
 
         .. code-block:: python
 
@@ -263,8 +520,17 @@ class AniLibriaClient:
             playlist_type=playlist_type,
         )
 
+        # Хранилище содержит полные тайтлы, поэтому из него можно брать только запросы без фильтров
+        use_store = self._store is not None and payload.keys() <= {"id", "code"}
+        if use_store and (
+            data := await self._store.get(id=payload.get("id"), code=payload.get("code"))
+        ):
+            return converter.structure(data, self._title_model)
+
         data = await self._http.get_title(**payload)
-        return converter.structure(data, Title)
+        if use_store:
+            await self._store.put(data)
+        return converter.structure(data, self._title_model)
 
     async def get_titles(
         self,
@@ -308,7 +574,7 @@ class AniLibriaClient:
 
         data = await self._http.get_titles(**payload)
 
-        return converter.structure(data, ListPagination[Title])
+        return converter.structure(data, ListPagination[self._title_model])
 
     async def get_updates(
         self,
@@ -350,7 +616,7 @@ class AniLibriaClient:
             items_per_page=items_per_page,
         )
         data = await self._http.get_updates(**payload)
-        return converter.structure(data, ListPagination[Title])
+        return converter.structure(data, ListPagination[self._title_model])
 
     async def get_changes(
         self,
@@ -389,7 +655,7 @@ class AniLibriaClient:
             items_per_page=items_per_page,
         )
         data = await self._http.get_changes(**payload)
-        return converter.structure(data, ListPagination[Title])
+        return converter.structure(data, ListPagination[self._title_model])
 
     async def get_schedule(
         self,
@@ -419,7 +685,10 @@ class AniLibriaClient:
             playlist_type=playlist_type,
         )
         data = await self._http.get_schedule(**payload)
-        return converter.structure(data, list[Schedule])
+        return [
+            Schedule(day=day["day"], list=converter.structure(day["list"], list[self._title_model]))
+            for day in data
+        ]
 
     async def get_random_title(
         self,
@@ -446,7 +715,7 @@ class AniLibriaClient:
             playlist_type=playlist_type,
         )
         data = await self._http.get_random_title(**payload)
-        return converter.structure(data, Title)
+        return converter.structure(data, self._title_model)
 
     async def get_youtube(
         self,
@@ -525,16 +794,18 @@ class AniLibriaClient:
         )
         data = await self._http.get_feed(**payload)
 
-        data["list"]: list
-        video: dict
+        items: list = []
+        item: dict
 
-        for index, video in enumerate(data["list"]):
-            if title := video.get("title"):
-                data["list"][index] = converter.structure(title, Title)
+        for item in data["list"]:
+            if title := item.get("title"):
+                items.append(converter.structure(title, self._title_model))
             else:
-                data["list"][index] = converter.structure(data["youtube"], YouTubeVideo)
+                items.append(converter.structure(item["youtube"], YouTubeVideo))
 
-        return converter.structure(data, ListPagination[Title | YouTubeVideo])
+        return ListPagination(
+            pagination=converter.structure(data["pagination"], Pagination), list=items
+        )
 
     async def get_years(self) -> list[int]:
         """
@@ -609,21 +880,28 @@ class AniLibriaClient:
         since: Absent[int] = MISSING,
         after: Absent[int] = MISSING,
         limit: Absent[int] = MISSING,
-    ) -> str:
+        raw: bool = False,
+    ) -> str | dict | bytes:
         """
         Возвращает список обновлений на сайте в одном из форматов RSS ленты.
+        Для :attr:`RSSType.JSON` возвращается словарь, для остальных форматов - текст ленты.
+
+        .. code-block:: python
+
+           feed = await client.get_rss(rss_type=RSSType.ATOM, raw=True)  # Байты без декодирования
 
         :param Absent[RSSType] rss_type: Предпочитаемый формат вывода
         :param Absent[str] session_id: Уникальный идентификатор сессии пользователя
         :param Absent[int] since: Список тайтлов у которых время обновления больше указанного timestamp
         :param Absent[int] after: Удаляет первые n записей из выдачи
         :param Absent[int] limit: Количество объектов в ответе
+        :param bool raw: Вернуть тело ответа в байтах без декодирования.
         """
         payload: dict = dict_filter_missing(
-            rss_type=rss_type, session_id=session_id, since=since, after=after, limit=limit
+            rss_type=rss_type, session=session_id, since=since, after=after, limit=limit
         )
 
-        return await self._http.get_rss(**payload)
+        return await self._http.get_rss(**payload, raw=raw)
 
     async def search_titles(
         self,
@@ -677,7 +955,7 @@ class AniLibriaClient:
             items_per_page=items_per_page,
         )
         data = await self._http.search_titles(**payload)
-        return converter.structure(data, ListPagination[Title])
+        return converter.structure(data, ListPagination[self._title_model])
 
     async def advanced_search(
         self,
@@ -725,7 +1003,7 @@ class AniLibriaClient:
             items_per_page=items_per_page,
         )
         data = await self._http.advanced_search(**payload)
-        return converter.structure(data, ListPagination[Title])
+        return converter.structure(data, ListPagination[self._title_model])
 
     async def get_user(
         self,
@@ -778,7 +1056,7 @@ class AniLibriaClient:
             items_per_page=items_per_page,
         )
         data = await self._http.get_user_favorites(**payload)
-        return converter.structure(data, ListPagination[Title])
+        return converter.structure(data, ListPagination[self._title_model])
 
     async def add_user_favorite_title(self, session_id: str, title_id: int):
         """
@@ -849,22 +1127,297 @@ class AniLibriaClient:
         data = await self._http.get_franchises(**payload)
         return converter.structure(data, ListPagination[TitleFranchise])
 
-    async def astart(self, *, auto_reconnect: bool = True):
+    def _iter_pages(
+        self,
+        method: Callable[..., Awaitable[ListPagination]],
+        window: int,
+        ordered: bool,
+        kwargs: dict,
+    ) -> AsyncIterator:
+        start_page = kwargs.pop("page", 1)
+
+        async def fetch(page: int) -> ListPagination:
+            return await method(page=page, **kwargs)
+
+        return paginate(fetch, start_page=start_page, window=window, ordered=ordered)
+
+    def iter_updates(
+        self, *, window: int = 4, ordered: bool = True, **kwargs
+    ) -> AsyncIterator[Title]:
+        """
+        Проходит по всем страницам последних обновлений тайтлов.
+        Принимает те же аргументы, что и :meth:`.get_updates`. Страницы запрашиваются одновременно.
+
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        :param bool ordered: Возвращать ли объекты в порядке страниц. Иначе - по мере получения страниц.
+        """
+        return self._iter_pages(self.get_updates, window, ordered, kwargs)
+
+    def iter_changes(
+        self, *, window: int = 4, ordered: bool = True, **kwargs
+    ) -> AsyncIterator[Title]:
+        """
+        Проходит по всем страницам последних изменений тайтлов.
+        Принимает те же аргументы, что и :meth:`.get_changes`. Страницы запрашиваются одновременно.
+
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        :param bool ordered: Возвращать ли объекты в порядке страниц. Иначе - по мере получения страниц.
+        """
+        return self._iter_pages(self.get_changes, window, ordered, kwargs)
+
+    def iter_search_titles(
+        self, *, window: int = 4, ordered: bool = True, **kwargs
+    ) -> AsyncIterator[Title]:
         """
-        Запускает клиент асинхронно
+        Проходит по всем страницам тайтлов, найденных по фильтрам.
+        Принимает те же аргументы, что и :meth:`.search_titles`. Страницы запрашиваются одновременно.
+
+        .. code-block:: python
+
+           async for title in client.iter_search_titles(genres=["Комедия"], items_per_page=50):
+               print(title.names.ru)
+
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        :param bool ordered: Возвращать ли объекты в порядке страниц. Иначе - по мере получения страниц.
+        """
+        return self._iter_pages(self.search_titles, window, ordered, kwargs)
+
+    def iter_advanced_search(
+        self, *, window: int = 4, ordered: bool = True, **kwargs
+    ) -> AsyncIterator[Title]:
+        """
+        Проходит по всем страницам тайтлов, найденных по запросу.
+        Принимает те же аргументы, что и :meth:`.advanced_search`. Страницы запрашиваются одновременно.
+
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        :param bool ordered: Возвращать ли объекты в порядке страниц. Иначе - по мере получения страниц.
         """
+        return self._iter_pages(self.advanced_search, window, ordered, kwargs)
 
-        while True:
-            try:
-                await self._websocket.start()
-            except WSServerHandshakeError as error:
-                if auto_reconnect:
-                    log.debug("Websocket disconnected. Reconnecting...")
-                    continue
-                raise error from error
-            except (KeyboardInterrupt, asyncio.CancelledError):
-                await self.close()
-                break
+    def iter_youtube(
+        self, *, window: int = 4, ordered: bool = True, **kwargs
+    ) -> AsyncIterator[YouTubeVideo]:
+        """
+        Проходит по всем страницам youtube видео.
+        Принимает те же аргументы, что и :meth:`.get_youtube`. Страницы запрашиваются одновременно.
+
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        :param bool ordered: Возвращать ли объекты в порядке страниц. Иначе - по мере получения страниц.
+        """
+        return self._iter_pages(self.get_youtube, window, ordered, kwargs)
+
+    def iter_feed(
+        self, *, window: int = 4, ordered: bool = True, **kwargs
+    ) -> AsyncIterator[Title | YouTubeVideo]:
+        """
+        Проходит по всем страницам ленты тайтлов и youtube видео.
+        Принимает те же аргументы, что и :meth:`.get_feed`. Страницы запрашиваются одновременно.
+
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        :param bool ordered: Возвращать ли объекты в порядке страниц. Иначе - по мере получения страниц.
+        """
+        return self._iter_pages(self.get_feed, window, ordered, kwargs)
+
+    def iter_seed_stats(
+        self, *, window: int = 4, ordered: bool = True, **kwargs
+    ) -> AsyncIterator[SeedStats]:
+        """
+        Проходит по всем страницам статистики пользователей торрент трекера.
+        Принимает те же аргументы, что и :meth:`.get_seed_stats`. Страницы запрашиваются одновременно.
+
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        :param bool ordered: Возвращать ли объекты в порядке страниц. Иначе - по мере получения страниц.
+        """
+        return self._iter_pages(self.get_seed_stats, window, ordered, kwargs)
+
+    def iter_franchises(
+        self, *, window: int = 4, ordered: bool = True, **kwargs
+    ) -> AsyncIterator[TitleFranchise]:
+        """
+        Проходит по всем страницам франшиз.
+        Принимает те же аргументы, что и :meth:`.get_franchises`. Страницы запрашиваются одновременно.
+
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        :param bool ordered: Возвращать ли объекты в порядке страниц. Иначе - по мере получения страниц.
+        """
+        return self._iter_pages(self.get_franchises, window, ordered, kwargs)
+
+    async def _stream_titles(
+        self, method: Callable[..., AsyncIterator[dict]], chunk_size: int, kwargs: dict
+    ) -> AsyncIterator[Title]:
+        # Закрываем запрос сразу, если цикл прервали
+        async with aclosing(method(chunk_size=chunk_size, **dict_filter_missing(kwargs))) as items:
+            async for data in items:
+                yield converter.structure(data, self._title_model)
+
+    def stream_titles(self, *, chunk_size: int = 64 * 1024, **kwargs) -> AsyncIterator[Title]:
+        """
+        Возвращает тайтлы с заданными параметрами по одному по мере получения ответа.
+        Принимает те же аргументы, что и :meth:`.get_titles`.
+
+        Ответ разбирается по частям, поэтому в памяти одновременно находится только один тайтл, а не вся страница.
+        Ответ не кешируется. Если цикл может прерваться раньше, используйте ``contextlib.aclosing``,
+        чтобы соединение сразу вернулось в пул.
+
+        .. code-block:: python
+
+           async for title in client.stream_titles(id_list=ids, items_per_page=100):
+               print(title.names.ru)
+
+        :param int chunk_size: Размер читаемой части ответа в байтах.
+        """
+        return self._stream_titles(self._http.stream_titles, chunk_size, kwargs)
+
+    def stream_updates(self, *, chunk_size: int = 64 * 1024, **kwargs) -> AsyncIterator[Title]:
+        """
+        Возвращает последние обновления тайтлов по одному по мере получения ответа.
+        Принимает те же аргументы, что и :meth:`.get_updates`.
+
+        Ответ разбирается так же, как в :meth:`.stream_titles`.
+
+        :param int chunk_size: Размер читаемой части ответа в байтах.
+        """
+        return self._stream_titles(self._http.stream_updates, chunk_size, kwargs)
+
+    def stream_changes(self, *, chunk_size: int = 64 * 1024, **kwargs) -> AsyncIterator[Title]:
+        """
+        Возвращает последние изменения тайтлов по одному по мере получения ответа.
+        Принимает те же аргументы, что и :meth:`.get_changes`.
+
+        Ответ разбирается так же, как в :meth:`.stream_titles`.
+
+        :param int chunk_size: Размер читаемой части ответа в байтах.
+        """
+        return self._stream_titles(self._http.stream_changes, chunk_size, kwargs)
+
+    def stream_search_titles(
+        self, *, chunk_size: int = 64 * 1024, **kwargs
+    ) -> AsyncIterator[Title]:
+        """
+        Возвращает тайтлы, найденные по фильтрам, по одному по мере получения ответа.
+        Принимает те же аргументы, что и :meth:`.search_titles`.
+
+        Ответ разбирается так же, как в :meth:`.stream_titles`.
+
+        :param int chunk_size: Размер читаемой части ответа в байтах.
+        """
+        return self._stream_titles(self._http.stream_search_titles, chunk_size, kwargs)
+
+    def stream_advanced_search(
+        self, *, chunk_size: int = 64 * 1024, **kwargs
+    ) -> AsyncIterator[Title]:
+        """
+        Возвращает тайтлы, найденные по запросу, по одному по мере получения ответа.
+        Принимает те же аргументы, что и :meth:`.advanced_search`.
+
+        Ответ разбирается так же, как в :meth:`.stream_titles`.
+
+        :param int chunk_size: Размер читаемой части ответа в байтах.
+        """
+        return self._stream_titles(self._http.stream_advanced_search, chunk_size, kwargs)
+
+    async def sync_store(self, *, items_per_page: int = 50, window: int = 4) -> int:
+        """
+        Запрашивает тайтлы, изменённые после последней синхронизации, и сохраняет их в хранилище.
+        При первой синхронизации загружается весь каталог. Возвращает количество сохранённых тайтлов.
+
+        Вызывается автоматически после переподключения к вебсокету.
+
+        :param int items_per_page: Количество тайтлов на одной странице.
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        """
+        if self._store is None:
+            raise ValueError("Client has no title store")
+
+        since = await self._store.get_since()
+        newest = since
+        synced = 0
+
+        async def fetch(page: int) -> ListPagination[dict]:
+            data = await self._http.get_changes(
+                since=since, page=page, items_per_page=items_per_page
+            )
+            return ListPagination(
+                pagination=converter.structure(data["pagination"], Pagination), list=data["list"]
+            )
+
+        titles: list[dict] = []
+        async for title in paginate(fetch, window=window):
+            titles.append(title)
+            if (last_change := title.get("last_change")) is not None:
+                newest = max(newest or 0, last_change)
+            if len(titles) >= items_per_page:
+                await self._save_synced(titles)
+                synced += len(titles)
+                titles.clear()
+
+        await self._save_synced(titles)
+        synced += len(titles)
+        # Время сохраняется только после полной синхронизации, чтобы прерванная не пропускала тайтлы
+        await self._store.set_since(newest)
+
+        log.debug(f"Synced {synced} titles to the store")
+        return synced
+
+    async def _save_synced(self, titles: list[dict]):
+        await self._store.put_many(titles)
+        if self._index is not None:
+            self._index.add_many(converter.structure(title, self._title_model) for title in titles)
+
+    async def sync_index(self, *, items_per_page: int = 50, window: int = 4) -> int:
+        """
+        Добавляет в индекс тайтлы, изменённые после последней синхронизации.
+        Возвращает количество добавленных тайтлов.
+
+        Если у клиента есть :class:`TitleStore`, индекс сначала заполняется из него, а затем хранилище синхронизируется
+        через :meth:`.sync_store`. Иначе при первой синхронизации загружается весь каталог.
+
+        :param int items_per_page: Количество тайтлов на одной странице.
+        :param int window: Максимальное количество одновременно запрашиваемых страниц.
+        """
+        if self._index is None:
+            raise ValueError("Client has no title index")
+
+        index = self._index
+        added = 0
+
+        if self._store is not None:
+            # Тайтлы из событий вебсокета могли попасть в индекс раньше, поэтому проверяется время синхронизации
+            if index.synced is None:
+                async for title in self._store:
+                    index.add(converter.structure(title, self._title_model))
+                    added += 1
+            added += await self.sync_store(items_per_page=items_per_page, window=window)
+            index.synced = await self._store.get_since() or 0
+            return added
+
+        synced = index.synced
+        async for title in self.iter_changes(
+            since=synced if synced is not None else MISSING,
+            items_per_page=items_per_page,
+            window=window,
+        ):
+            index.add(title)
+            added += 1
+            if title.last_change is not None:
+                synced = max(synced or 0, title.last_change)
+
+        # Время сохраняется только после полной синхронизации, чтобы прерванная не пропускала тайтлы
+        index.synced = synced if synced is not None else 0
+        log.debug(f"Added {added} titles to the index")
+        return added
+
+    async def astart(self, *, auto_reconnect: bool = True):
+        """
+        Запускает клиент асинхронно.
+
+        :param bool auto_reconnect: Переподключаться ли при потере соединения. Задержка между попытками
+            и проверка соединения настраиваются через :class:`ReconnectPolicy`.
+        """
+        try:
+            await self._websocket.start(reconnect=auto_reconnect)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            await self.close()
 
     def start(self, *, auto_reconnect: bool = True):
         """
@@ -893,6 +1446,8 @@ class AniLibriaClient:
         """
         Закрывает клиент.
         """
+        await self._websocket.close()
+        if self._store is not None:
+            await self._store.close()
         if self._http.session and not self._http.session.closed:
             await self._http.session.close()
-            await self._websocket.close()
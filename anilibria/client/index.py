@@ -0,0 +1,345 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from enum import Enum
+from heapq import nlargest
+from itertools import islice
+from typing import Any, Iterable, KeysView
+
+from ..api.models import ListPagination, Pagination, Title
+
+__all__ = ("TitleIndex",)
+
+_FIELDS = ("genres", "year", "season_code", "type_code", "status_code", "team")
+
+
+def _normalize(text: str) -> str:
+    return text.casefold().replace("ё", "е")
+
+
+def _key(value: Any) -> str:
+    if isinstance(value, Enum):
+        value = value.value
+    return _normalize(str(value))
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _get_names(title: Title) -> str:
+    # Названия разделены переносом строки, которого нет в запросах, поэтому проверка подстроки не выходит за одно название
+    if title.names is None:
+        return ""
+    names = (title.names.ru, title.names.en, title.names.alternative)
+    return "\n".join(_normalize(name) for name in names if name)
+
+
+def _get_keys(title: Title) -> dict[str, set[str]]:
+    keys: dict[str, set[str]] = {field: set() for field in _FIELDS}
+
+    keys["genres"].update(_key(genre) for genre in title.genres or ())
+    if (season := title.season) is not None:
+        if season.year is not None:
+            keys["year"].add(_key(season.year))
+        if season.code is not None:
+            keys["season_code"].add(_key(season.code))
+    if title.type is not None and title.type.code is not None:
+        keys["type_code"].add(_key(title.type.code))
+    if title.status is not None and title.status.code is not None:
+        keys["status_code"].add(_key(title.status.code))
+    if (team := title.team) is not None:
+        for members in (team.voice, team.translator, team.editing, team.decor, team.timing):
+            keys["team"].update(_key(member) for member in members or ())
+
+    return keys
+
+
+class TitleIndex:
+    """
+    Индекс тайтлов в памяти для поиска без запросов к API.
+
+    Хранит обратные индексы по жанрам, году и коду сезона, коду типа, коду статуса и участникам команды,
+    а также индекс триграмм и префиксов слов названий. Заполняется через :meth:`AniLibriaClient.sync_index`
+    и обновляется событиями ``title_update``.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(store=TitleStore("titles.db"), index=TitleIndex())
+       await client.sync_index()
+
+       titles = client.index.search(genres=["Комедия"], year=[2023], items_per_page=20)
+       suggestions = client.index.complete("вол", limit=10)
+    """
+
+    def __init__(self, titles: Iterable[Title] = ()) -> None:
+        self._titles: dict[int, Title] = {}
+        self._keys: dict[int, dict[str, set[str]]] = {}
+        self._names: dict[int, str] = {}
+        self._updated: dict[int, int] = {}
+        # Пары из времени обновления со знаком минус и ID тайтла: сначала недавно обновлённые
+        self._order: list[tuple[int, int]] = []
+
+        self._fields: dict[str, defaultdict[str, set[int]]] = {
+            field: defaultdict(set) for field in _FIELDS
+        }
+        self._trigrams: defaultdict[str, set[int]] = defaultdict(set)
+        # Слово названия -> ID тайтлов и отсортированный список слов для поиска по префиксу.
+        # Оба обновляются при каждом изменении, чтобы поиск после события не пересобирал список
+        self._word_ids: dict[str, set[int]] = {}
+        self._words: list[str] = []
+
+        self.since: int | None = None
+        "Время самого нового изменения среди добавленных тайтлов"
+        self.synced: int | None = None
+        """
+        Время последнего изменения тайтла на момент последней синхронизации через :meth:`AniLibriaClient.sync_index`.
+        ``None`` - индекс ещё не синхронизировался. События вебсокета его не меняют.
+        """
+
+        self.add_many(titles)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def __contains__(self, title_id: int) -> bool:
+        return title_id in self._titles
+
+    def get(self, title_id: int) -> Title | None:
+        return self._titles.get(title_id)
+
+    def add(self, title: Title):
+        """
+        Добавляет тайтл или заменяет его новой версией.
+
+        :param Title title: Тайтл.
+        """
+        if title.id is None:
+            return
+        if title.id in self._titles:
+            self.remove(title.id)
+
+        title_id = title.id
+        self._titles[title_id] = title
+        self._updated[title_id] = updated = title.updated or 0
+        insort(self._order, (-updated, title_id))
+
+        self._keys[title_id] = keys = _get_keys(title)
+        for field, values in keys.items():
+            for value in values:
+                self._fields[field][value].add(title_id)
+
+        self._names[title_id] = names = _get_names(title)
+        for trigram in _trigrams(names):
+            self._trigrams[trigram].add(title_id)
+        for word in set(names.split()):
+            if (ids := self._word_ids.get(word)) is None:
+                ids = self._word_ids[word] = set()
+                insort(self._words, word)
+            ids.add(title_id)
+
+        if title.last_change is not None:
+            self.since = max(self.since or 0, title.last_change)
+
+    def add_many(self, titles: Iterable[Title]):
+        """
+        Добавляет несколько тайтлов.
+
+        :param Iterable[Title] titles: Тайтлы.
+        """
+        for title in titles:
+            self.add(title)
+
+    def remove(self, title_id: int):
+        """
+        Удаляет тайтл из индекса.
+
+        :param int title_id: ID тайтла.
+        """
+        if self._titles.pop(title_id, None) is None:
+            return
+        updated = self._updated.pop(title_id)
+        del self._order[bisect_left(self._order, (-updated, title_id))]
+
+        for field, values in self._keys.pop(title_id).items():
+            index = self._fields[field]
+            for value in values:
+                index[value].discard(title_id)
+                if not index[value]:
+                    del index[value]
+
+        names = self._names.pop(title_id)
+        for trigram in _trigrams(names):
+            self._trigrams[trigram].discard(title_id)
+            if not self._trigrams[trigram]:
+                del self._trigrams[trigram]
+        for word in set(names.split()):
+            ids = self._word_ids[word]
+            ids.discard(title_id)
+            if not ids:
+                del self._word_ids[word]
+                del self._words[bisect_left(self._words, word)]
+
+    def _match_prefix(self, prefix: str) -> set[int]:
+        start = bisect_left(self._words, prefix)
+        end = bisect_left(self._words, prefix + "\U0010ffff", start)
+        word_ids = self._word_ids
+        return set().union(*(word_ids[word] for word in self._words[start:end]))
+
+    def _match_name(self, query: str) -> set[int]:
+        query = _normalize(query).strip()
+        if not query:
+            return set(self._titles)
+
+        # Короткие запросы ищутся по началу слов, длинные - по триграммам с проверкой подстроки
+        if len(query) < 3:
+            return self._match_prefix(query)
+
+        # Подстроку всё равно нужно проверить, поэтому достаточно самого короткого списка триграммы
+        candidates = min(
+            (self._trigrams.get(trigram, set()) for trigram in _trigrams(query)), key=len
+        )
+        names = self._names
+        return {title_id for title_id in candidates if query in names[title_id]}
+
+    def _match_field(self, field: str, values: list) -> set[int]:
+        index = self._fields[field]
+        found = set()
+        for value in values:
+            found |= index.get(_key(value), set())
+        return found
+
+    def filter(
+        self,
+        search: list[str] | None = None,
+        year: list[str | int] | None = None,
+        season_code: list[str | int] | None = None,
+        genres: list[str] | None = None,
+        team: list[str] | None = None,
+        type_code: list[str | int] | None = None,
+        status_code: list[str | int] | None = None,
+    ) -> list[Title]:
+        """
+        Возвращает все тайтлы, подходящие под фильтры, отсортированные по времени обновления.
+        Принимает те же фильтры, что и :meth:`.search`.
+        """
+        ids = self._find(search, year, season_code, genres, team, type_code, status_code)
+        return [self._titles[title_id] for title_id in self._sort(ids)]
+
+    def _find(
+        self,
+        search: list[str] | None,
+        year: list[str | int] | None,
+        season_code: list[str | int] | None,
+        genres: list[str] | None,
+        team: list[str] | None,
+        type_code: list[str | int] | None,
+        status_code: list[str | int] | None,
+    ) -> set[int] | KeysView[int]:
+        sets: list[set[int]] = []
+
+        if search:
+            sets.append(set().union(*(self._match_name(query) for query in search)))
+        for field, values in (
+            ("year", year),
+            ("season_code", season_code),
+            ("team", team),
+            ("type_code", type_code),
+            ("status_code", status_code),
+        ):
+            if values:
+                sets.append(self._match_field(field, values))
+        # Тайтл должен иметь все указанные жанры
+        for genre in genres or ():
+            sets.append(self._match_field("genres", [genre]))
+
+        if not sets:
+            return self._titles.keys()
+        sets.sort(key=len)
+        return set.intersection(*sets)
+
+    def _sort(self, ids: set[int] | KeysView[int], limit: int | None = None) -> list[int]:
+        # Сначала недавно обновлённые тайтлы. Большую выборку быстрее отобрать
+        # проходом по всем тайтлам в порядке обновления, чем сортировать её
+        if len(ids) * 8 >= len(self._titles):
+            found = (title_id for _, title_id in self._order if title_id in ids)
+            return list(found if limit is None else islice(found, limit))
+
+        if limit is not None:
+            return nlargest(limit, ids, key=self._updated.__getitem__)
+        return sorted(ids, key=self._updated.__getitem__, reverse=True)
+
+    def search(
+        self,
+        search: list[str] | None = None,
+        year: list[str | int] | None = None,
+        season_code: list[str | int] | None = None,
+        genres: list[str] | None = None,
+        team: list[str] | None = None,
+        type_code: list[str | int] | None = None,
+        status_code: list[str | int] | None = None,
+        after: int | None = None,
+        limit: int | None = None,
+        page: int | None = None,
+        items_per_page: int | None = None,
+    ) -> ListPagination[Title]:
+        """
+        Ищет тайтлы в индексе. Повторяет параметры :meth:`AniLibriaClient.search_titles`.
+
+        Регистр и буква «ё» в названиях и фильтрах не учитываются.
+        Внутри одного фильтра подходит любое из значений, кроме ``genres``: у тайтла должны быть все жанры.
+
+        :param list[str] | None search: Части названий на русском, английском или альтернативном языке.
+        :param list[str | int] | None year: Список годов выхода.
+        :param list[str | int] | None season_code: Список кодов сезонов.
+        :param list[str] | None genres: Список жанров.
+        :param list[str] | None team: Ники участников, работавшие над тайтлом.
+        :param list[str | int] | None type_code: Список кодов типов тайтла.
+        :param list[str | int] | None status_code: Список кодов статусов тайтла.
+        :param int | None after: Удаляет первые n записей из выдачи.
+        :param int | None limit: Количество объектов в ответе.
+        :param int | None page: Номер страницы. По умолчанию 1
+        :param int | None items_per_page: Количество элементов на одной странице. По умолчанию 5
+        """
+        ids = self._find(search, year, season_code, genres, team, type_code, status_code)
+
+        after = after or 0
+        total = max(0, len(ids) - after)
+        if limit is not None:
+            total = min(total, limit)
+
+        items_per_page = items_per_page or limit or 5
+        page = page or 1
+        pages = max(1, -(-total // items_per_page))
+
+        # Сортируются и преобразуются в список только тайтлы до конца запрошенной страницы
+        start = after + (page - 1) * items_per_page
+        end = after + min(page * items_per_page, total)
+        top = self._sort(ids, end) if end > start else []
+
+        return ListPagination(
+            pagination=Pagination(
+                current_page=page,
+                pages=pages,
+                items_per_page=items_per_page,
+                total_items=total,
+            ),
+            list=[self._titles[title_id] for title_id in top[start:]],
+        )
+
+    def complete(self, prefix: str, *, limit: int = 10) -> list[Title]:
+        """
+        Возвращает тайтлы, в названиях которых есть слово, начинающееся с ``prefix``.
+        Если в ``prefix`` несколько слов, в названии должна быть такая подстрока.
+
+        :param str prefix: Начало названия.
+        :param int limit: Максимальное количество тайтлов.
+        """
+        if not (words := _normalize(prefix).split()):
+            return []
+
+        ids = self._match_prefix(words[-1])
+        if len(words) > 1:
+            query = " ".join(words)
+            ids = {title_id for title_id in ids if query in self._names[title_id]}
+
+        return [self._titles[title_id] for title_id in self._sort(ids, limit)]
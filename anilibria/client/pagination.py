@@ -0,0 +1,64 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable
+
+from ..api.models import ListPagination
+from ..utils.typings import T
+
+__all__ = ("paginate",)
+
+
+async def paginate(
+    fetch: Callable[[int], Awaitable[ListPagination[T]]],
+    *,
+    start_page: int = 1,
+    window: int = 4,
+    ordered: bool = True,
+) -> AsyncIterator[T]:
+    """
+    Проходит по всем страницам ответа, начиная с ``start_page``.
+    Количество страниц берётся из первого ответа, остальные страницы запрашиваются одновременно,
+    но не более ``window`` запросов за раз.
+
+    :param fetch: Функция, возвращающая страницу по её номеру.
+    :param int start_page: Номер первой страницы.
+    :param int window: Максимальное количество одновременно запрашиваемых страниц.
+    :param bool ordered: Возвращать ли объекты в порядке страниц. Иначе - по мере получения страниц.
+    """
+    if window < 1:
+        raise ValueError("window should be greater than 0")
+
+    first = await fetch(start_page)
+    pages = iter(range(start_page + 1, first.pagination.pages + 1))
+    pending: deque[asyncio.Task] = deque()
+
+    def schedule() -> bool:
+        if (page := next(pages, None)) is None:
+            return False
+        pending.append(asyncio.ensure_future(fetch(page)))
+        return True
+
+    try:
+        # Следующие страницы запрашиваются, пока обрабатывается первая
+        while len(pending) < window and schedule():
+            pass
+
+        for item in first.list:
+            yield item
+
+        while pending:
+            if ordered:
+                result = await pending.popleft()
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                task = done.pop()
+                pending.remove(task)
+                result = task.result()
+
+            schedule()
+
+            for item in result.list:
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,233 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from logging import getLogger
+from os import PathLike
+from typing import Any, AsyncIterator, Callable
+
+from orjson import dumps, loads
+
+log = getLogger("anilibria.store")
+__all__ = ("TitleStore",)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS titles (
+    id INTEGER PRIMARY KEY,
+    code TEXT,
+    last_change INTEGER,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS titles_code ON titles (code);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER
+);
+"""
+
+# Ответ страницы, запрошенной до события вебсокета, не должен перезаписать более новый тайтл
+_UPSERT = """
+INSERT INTO titles (id, code, last_change, data) VALUES (?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET code = excluded.code, last_change = excluded.last_change, data = excluded.data
+WHERE excluded.last_change IS NULL
+    OR titles.last_change IS NULL
+    OR excluded.last_change >= titles.last_change
+"""
+
+
+class TitleStore:
+    """
+    Хранилище тайтлов в SQLite. Тайтлы хранятся в формате ответа API и доступны по ``id`` и ``code``.
+
+    Хранилище обновляется через :meth:`AniLibriaClient.sync_store`, который запрашивает только тайтлы,
+    изменённые после последней синхронизации, и через события вебсокета
+    ``title_update``, ``playlist_update`` и ``torrent_update``.
+    :meth:`AniLibriaClient.get_title` сначала ищет тайтл в хранилище.
+
+    Запросы к базе данных выполняются по очереди в отдельном потоке, чтобы не останавливать цикл событий.
+
+    .. code-block:: python
+
+       client = AniLibriaClient(store=TitleStore("titles.db"))
+       await client.sync_store()  # При первом запуске загружает весь каталог, затем - только изменения
+
+    :param str | PathLike path: Путь к файлу базы данных. ``":memory:"`` - хранить в памяти.
+    """
+
+    def __init__(self, path: str | PathLike = ":memory:") -> None:
+        self.path: str | PathLike = path
+
+        self.hits: int = 0
+        "Количество тайтлов, найденных в хранилище"
+        self.misses: int = 0
+        "Количество тайтлов, которых не было в хранилище"
+
+        self._db: sqlite3.Connection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def _run(self, func: Callable, *args) -> Any:
+        # Соединение создаётся и используется только в потоке хранилища
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="anilibria-store")
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args)
+        )
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = self._connect()
+        return self._db
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode = WAL")
+        db.execute("PRAGMA synchronous = NORMAL")
+
+        if (version := db.execute("PRAGMA user_version").fetchone()[0]) not in {0, SCHEMA_VERSION}:
+            log.warning(f"Title store has schema version {version}. Recreating it")
+            db.executescript("DROP TABLE IF EXISTS titles; DROP TABLE IF EXISTS meta;")
+
+        db.executescript(_SCHEMA)
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        db.commit()
+        return db
+
+    def _fetchone(self, query: str, params: tuple = ()) -> tuple | None:
+        return self._connection.execute(query, params).fetchone()
+
+    def _write(self, query: str, params: tuple = ()):
+        with self._connection as db:
+            db.execute(query, params)
+
+    async def count(self) -> int:
+        """
+        Возвращает количество тайтлов в хранилище.
+        """
+        return (await self._run(self._fetchone, "SELECT COUNT(*) FROM titles"))[0]
+
+    async def __aiter__(self) -> AsyncIterator[dict]:
+        cursor = await self._run(
+            lambda: self._connection.execute("SELECT data FROM titles ORDER BY id")
+        )
+        while rows := await self._run(cursor.fetchmany, 500):
+            for (data,) in rows:
+                yield loads(data)
+
+    async def get_since(self) -> int | None:
+        """
+        Возвращает время последнего изменения тайтла на момент последней синхронизации.
+        """
+        row = await self._run(self._fetchone, "SELECT value FROM meta WHERE key = 'since'")
+        return row[0] if row is not None else None
+
+    async def set_since(self, value: int | None):
+        """
+        Сохраняет время последнего изменения тайтла на момент синхронизации.
+
+        :param int | None value: Время последнего изменения.
+        """
+        await self._run(
+            self._write, "INSERT OR REPLACE INTO meta (key, value) VALUES ('since', ?)", (value,)
+        )
+
+    async def get(self, id: int | None = None, code: str | None = None) -> dict | None:
+        """
+        Возвращает тайтл в формате ответа API или ``None``, если его нет в хранилище.
+
+        :param int | None id: ID тайтла.
+        :param str | None code: Код тайтла.
+        """
+        row = None
+        if id is not None:
+            row = await self._run(self._fetchone, "SELECT data FROM titles WHERE id = ?", (id,))
+        elif code is not None:
+            row = await self._run(self._fetchone, "SELECT data FROM titles WHERE code = ?", (code,))
+
+        if row is None:
+            self.misses += 1
+            return
+
+        self.hits += 1
+        return loads(row[0])
+
+    async def put(self, data: dict):
+        """
+        Добавляет или заменяет тайтл.
+
+        :param dict data: Тайтл в формате ответа API.
+        """
+        await self.put_many([data])
+
+    def _put_many(self, titles: list[dict]):
+        with self._connection as db:
+            db.executemany(
+                _UPSERT,
+                [
+                    (title["id"], title.get("code"), title.get("last_change"), dumps(title))
+                    for title in titles
+                ],
+            )
+
+    async def put_many(self, titles: list[dict]):
+        """
+        Добавляет или заменяет несколько тайтлов в одной транзакции.
+        Тайтл не заменяется, если в хранилище более новое изменение.
+
+        :param list[dict] titles: Тайтлы в формате ответа API.
+        """
+        await self._run(self._put_many, titles)
+
+    def _update(self, title_id: int, fields: dict) -> bool:
+        row = self._fetchone("SELECT data FROM titles WHERE id = ?", (title_id,))
+        if row is None:
+            return False
+
+        self._put_many([loads(row[0]) | fields])
+        return True
+
+    async def update(self, title_id: int, fields: dict) -> bool:
+        """
+        Заменяет поля тайтла, если он есть в хранилище. Возвращает ``True``, если тайтл был изменён.
+
+        :param int title_id: ID тайтла.
+        :param dict fields: Новые значения полей в формате ответа API.
+        """
+        return await self._run(self._update, title_id, fields)
+
+    async def delete(self, title_id: int):
+        """
+        Удаляет тайтл.
+
+        :param int title_id: ID тайтла.
+        """
+        await self._run(self._write, "DELETE FROM titles WHERE id = ?", (title_id,))
+
+    def _clear(self):
+        with self._connection as db:
+            db.execute("DELETE FROM titles")
+            db.execute("DELETE FROM meta")
+
+    async def clear(self):
+        """
+        Удаляет все тайтлы и время последней синхронизации.
+        """
+        await self._run(self._clear)
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    async def close(self):
+        """
+        Закрывает базу данных и останавливает поток хранилища. Следующий запрос снова откроет её.
+        """
+        if self._executor is None:
+            return
+
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+        self._executor = None
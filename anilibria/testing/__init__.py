@@ -0,0 +1,2 @@
+from .fixtures import *  # noqa: F401 F403
+from .server import *  # noqa: F401 F403
@@ -0,0 +1,186 @@
+"""
+Данные в формате ответов api.anilibria.tv v3
+"""
+
+__all__ = (
+    "make_episode",
+    "make_torrent",
+    "make_title",
+    "make_title_list",
+    "make_event",
+    "EVENT_PAYLOADS",
+    "make_event_stream",
+)
+
+
+def make_episode(number: int) -> dict:
+    return {
+        "episode": number,
+        "name": None,
+        "uuid": f"b3c7a1f2-0000-4000-8000-{number:012d}",
+        "created_timestamp": 1672000000 + number,
+        "preview": f"/storage/releases/episodes/previews/9000/{number}/preview.jpg",
+        "skips": {"opening": [90, 180], "ending": []},
+        "hls": {
+            "fhd": f"/videos/media/ts/9000/{number}/1080/playlist.m3u8",
+            "hd": f"/videos/media/ts/9000/{number}/720/playlist.m3u8",
+            "sd": f"/videos/media/ts/9000/{number}/480/playlist.m3u8",
+        },
+    }
+
+
+def make_torrent(torrent_id: int, files: int = 12) -> dict:
+    return {
+        "torrent_id": torrent_id,
+        "episodes": {"first": 1, "last": files, "string": f"1-{files}"},
+        "quality": {
+            "string": "WEBRip 1080p",
+            "type": "WEBRip",
+            "resolution": "1080p",
+            "encoder": "h264",
+            "lq_audio": None,
+        },
+        "leechers": 0,
+        "seeders": 42,
+        "downloads": 10000,
+        "total_size": 16000000000,
+        "size_string": "14.9 GB",
+        "url": f"/public/torrent/download.php?id={torrent_id}",
+        "magnet": "magnet:?xt=urn:btih:0000000000000000000000000000000000000000",
+        "uploaded_timestamp": 1672000000,
+        "hash": "0000000000000000000000000000000000000000",
+        "metadata": {
+            "hash": "0000000000000000000000000000000000000000",
+            "name": "Title_[01-12]_[AniLibria_TV]_[WEBRip_1080p]",
+            "announce": ["http://tr.anilibria.tv/announce"],
+            "created_timestamp": 1672000000,
+            "files_list": [
+                {
+                    "file": f"Title_[{n:02d}]_[AniLibria_TV]_[WEBRip_1080p].mkv",
+                    "size": 1,
+                    "offset": n,
+                }
+                for n in range(1, files + 1)
+            ],
+        },
+        "raw_base64_file": None,
+    }
+
+
+def make_title(title_id: int = 9000, episodes: int = 12, torrents: int = 2) -> dict:
+    return {
+        "id": title_id,
+        "code": f"title-{title_id}",
+        "names": {"ru": "Тайтл", "en": "Title", "alternative": None},
+        "franchises": [],
+        "announce": None,
+        "status": {"string": "В работе", "code": 1},
+        "posters": {
+            "small": {"url": "/storage/releases/posters/9000/small.jpg", "raw_base64_file": None},
+            "medium": {"url": "/storage/releases/posters/9000/medium.jpg", "raw_base64_file": None},
+            "original": {
+                "url": "/storage/releases/posters/9000/original.jpg",
+                "raw_base64_file": None,
+            },
+        },
+        "updated": 1672000000,
+        "last_change": 1672000000,
+        "type": {
+            "full_string": f"ТВ ({episodes} эп.), 25 мин.",
+            "code": 1,
+            "string": "TV",
+            "episodes": episodes,
+            "length": 25,
+        },
+        "genres": ["Приключения", "Фэнтези", "Экшен"],
+        "team": {
+            "voice": ["Anzen", "Itashi"],
+            "translator": ["Sherrysh"],
+            "editing": [],
+            "decor": ["Helge"],
+            "timing": ["Zozo"],
+        },
+        "season": {"string": "зима", "code": 1, "year": 2023, "week_day": 5},
+        "description": "Описание тайтла",
+        "in_favorites": 1000,
+        "blocked": {"blocked": False, "bakanim": False},
+        "player": {
+            "alternative_player": None,
+            "host": "cache.libria.fun",
+            "is_rutube": False,
+            "episodes": {"first": 1, "last": episodes, "string": f"1-{episodes}"},
+            "list": {str(n): make_episode(n) for n in range(1, episodes + 1)},
+            "rutube": {},
+        },
+        "torrents": {
+            "episodes": {"first": 1, "last": episodes, "string": f"1-{episodes}"},
+            "list": [make_torrent(n) for n in range(1, torrents + 1)],
+        },
+    }
+
+
+def make_title_list(count: int = 20, episodes: int = 12, page: int = 1, pages: int = 1) -> dict:
+    return {
+        "list": [make_title(title_id=9000 + n, episodes=episodes) for n in range(count)],
+        "pagination": {
+            "pages": pages,
+            "current_page": page,
+            "items_per_page": count,
+            "total_items": count * pages,
+        },
+    }
+
+
+def _encode_event(**kwargs) -> dict:
+    return {"id": "9000", "episode": "12", "resolution": "1080", "quality": "WEBRip"} | kwargs
+
+
+EVENT_PAYLOADS: dict[str, dict] = {
+    "title_update": {"title": make_title(), "diff": {"updated": 1671999000}},
+    "playlist_update": {
+        "id": 9000,
+        "player": make_title()["player"],
+        "updated_episode": make_episode(12),
+        "episode": "12",
+        # Перезалив, чтобы клиент не запрашивал тайтл для события on_title_episode
+        "diff": {"list": {"12": {"hls": make_episode(12)["hls"]}}},
+        "reupload": True,
+    },
+    "encode_start": _encode_event(isReupload=False),
+    "encode_progress": _encode_event(encoded_percent="45"),
+    "encode_end": _encode_event(),
+    "encode_finish": {"id": "9000", "episode": "12"},
+    "torrent_update": {
+        "id": "9000",
+        "torrents": make_title()["torrents"],
+        "updated_torrent_id": 1,
+        "diff": {"seeders": 41},
+    },
+    "subscription": {"subscribe": "success", "subscription_id": 1},
+    "title_episode": {"title": make_title(), "episode": make_episode(12)},
+    "connect": {"connection": "success", "api_version": "3.0"},
+}
+
+
+def make_event(type: str) -> dict:
+    """
+    Сообщение вебсокета с событием ``type``
+    """
+    return {"type": type, "data": EVENT_PAYLOADS[type]}
+
+
+def make_event_stream(count: int = 1000) -> list[dict]:
+    """
+    Поток сообщений вебсокета, похожий на поток во время выхода серии:
+    в основном ``encode_progress`` с редкими обновлениями тайтла и плейлиста
+    """
+    pattern = [
+        "encode_start",
+        *["encode_progress"] * 20,
+        "encode_end",
+        "encode_finish",
+        "playlist_update",
+        "title_update",
+        "torrent_update",
+    ]
+    return [make_event(pattern[n % len(pattern)]) for n in range(count)]
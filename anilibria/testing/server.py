@@ -0,0 +1,386 @@
+import asyncio
+from collections import defaultdict
+from copy import deepcopy
+from logging import getLogger
+from random import Random
+from time import time
+from typing import Callable
+
+from aiohttp import WSCloseCode, web
+from orjson import dumps
+
+from .fixtures import EVENT_PAYLOADS, make_event, make_title
+
+log = getLogger("anilibria.testing")
+__all__ = ("MockServer",)
+
+_RANDOM_EVENTS = (
+    "title_update",
+    "playlist_update",
+    "encode_start",
+    "encode_progress",
+    "encode_end",
+    "encode_finish",
+    "torrent_update",
+)
+
+
+def _json(data) -> web.Response:
+    return web.Response(body=dumps(data), content_type="application/json")
+
+
+def _error(code: int, message: str) -> web.Response:
+    return web.Response(
+        body=dumps({"error": {"code": code, "message": message}}),
+        status=code,
+        content_type="application/json",
+    )
+
+
+def _split(value: str | None) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+
+class MockServer:
+    """
+    Локальный сервер, повторяющий API v3 и вебсокет api.anilibria.tv. Нужен для тестов и нагрузочного тестирования.
+
+    .. code-block:: python
+
+       async with MockServer(latency=0.05, error_rate=0.1, event_rate=50) as server:
+           client = AniLibriaClient(base_url=server.base_url, gateway_url=server.gateway_url)
+           title = await client.get_title(id=9000)
+
+    :param list[dict] | None titles: Тайтлы в формате ответа API. По умолчанию 20 тайтлов из :mod:`.fixtures`.
+    :param str host: Адрес сервера.
+    :param int port: Порт сервера. 0 - любой свободный.
+    :param float latency: Задержка ответа в секундах.
+    :param float jitter: Случайная добавка к задержке от 0 до ``jitter`` секунд.
+    :param float error_rate: Доля запросов, на которые сервер отвечает ошибкой.
+    :param int error_status: HTTP код ошибки.
+    :param list[dict] | None events: Сообщения вебсокета, которые отправляются по кругу.
+        По умолчанию события выбираются случайно.
+    :param float event_rate: Сколько событий в секунду отправлять каждому соединению. 0 - не отправлять.
+    :param int | None disconnect_after: Через сколько событий закрывать соединение.
+    :param int | None seed: Начальное значение генератора случайных чисел.
+    """
+
+    def __init__(
+        self,
+        *,
+        titles: list[dict] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        error_status: int = 503,
+        events: list[dict] | None = None,
+        event_rate: float = 0,
+        disconnect_after: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        if titles is None:
+            titles = [make_title(title_id=9000 + n) for n in range(20)]
+
+        self.titles: dict[int, dict] = {title["id"]: title for title in titles}
+        self.host: str = host
+        self.port: int = port
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.error_rate: float = error_rate
+        self.error_status: int = error_status
+        self.events: list[dict] | None = events
+        self.event_rate: float = event_rate
+        self.disconnect_after: int | None = disconnect_after
+
+        self.requests: dict[str, int] = defaultdict(int)
+        "Количество запросов к каждому маршруту"
+        self.subscriptions: list[dict] = []
+        "Полученные подписки"
+
+        self._random: Random = Random(seed)
+        self._runner: web.AppRunner | None = None
+        self._connections: set[web.WebSocketResponse] = set()
+
+    @property
+    def base_url(self) -> str:
+        """
+        Адрес API для параметра ``base_url`` клиента
+        """
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def gateway_url(self) -> str:
+        """
+        Адрес вебсокета для параметра ``gateway_url`` клиента
+        """
+        return f"ws://{self.host}:{self.port}/ws/"
+
+    async def __aenter__(self) -> "MockServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    def create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        routes: dict[str, Callable] = {
+            "/title": self._get_title,
+            "/title/list": self._get_titles,
+            "/title/updates": self._get_updates,
+            "/title/changes": self._get_changes,
+            "/title/schedule": self._get_schedule,
+            "/title/random": self._get_random_title,
+            "/title/search": self._search_titles,
+            "/title/search/advanced": self._advanced_search,
+            "/title/franchises": self._get_title_franchises,
+            "/franchise/list": self._get_paginated_empty,
+            "/youtube": self._get_paginated_empty,
+            "/feed": self._get_feed,
+            "/years": self._get_years,
+            "/genres": self._get_genres,
+            "/team": self._get_team,
+            "/torrent/seed_stats": self._get_paginated_empty,
+            "/torrent/rss": self._get_rss,
+        }
+        for path, handler in routes.items():
+            app.router.add_get(path, handler)
+        app.router.add_get("/ws/", self._websocket)
+        return app
+
+    async def start(self):
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Порт мог быть выбран системой
+        self.port = site._server.sockets[0].getsockname()[1]
+        log.debug(f"Mock server started on {self.base_url}")
+
+    async def close(self):
+        for connection in list(self._connections):
+            await connection.close(code=WSCloseCode.GOING_AWAY)
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # Управление
+
+    async def broadcast(self, frame: dict):
+        """
+        Отправляет сообщение всем подключённым клиентам.
+        """
+        data = dumps(frame).decode()
+        for connection in list(self._connections):
+            if not connection.closed:
+                await connection.send_str(data)
+
+    async def update_title(self, title_id: int, **changes):
+        """
+        Изменяет тайтл, обновляет время его изменения и отправляет событие ``title_update``.
+        """
+        title = self.titles[title_id]
+        diff = {key: deepcopy(title.get(key)) for key in changes}
+        title.update(changes)
+        title["last_change"] = title["updated"] = int(time())
+        await self.broadcast({"type": "title_update", "data": {"title": title, "diff": diff}})
+
+    async def disconnect_all(self, code: int = WSCloseCode.GOING_AWAY):
+        """
+        Закрывает все соединения с вебсокетом.
+        """
+        for connection in list(self._connections):
+            await connection.close(code=code)
+
+    # HTTP
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Callable) -> web.StreamResponse:
+        self.requests[request.path] += 1
+
+        if request.path != "/ws/":
+            if delay := self.latency + self._random.uniform(0, self.jitter):
+                await asyncio.sleep(delay)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return _error(self.error_status, "Injected error")
+
+        return await handler(request)
+
+    def _paginate(self, request: web.Request, items: list, per_page: int = 5) -> dict:
+        query = request.query
+        items = items[int(query.get("after", 0)) :]
+        if "limit" in query:
+            items = items[: int(query["limit"])]
+
+        per_page = int(query.get("items_per_page") or query.get("limit") or per_page)
+        page = int(query.get("page", 1))
+        pages = max(1, -(-len(items) // per_page))
+        return {
+            "list": items[(page - 1) * per_page : page * per_page],
+            "pagination": {
+                "pages": pages,
+                "current_page": page,
+                "items_per_page": per_page,
+                "total_items": len(items),
+            },
+        }
+
+    def _find_titles(self, request: web.Request) -> list[dict]:
+        ids = {int(id) for id in _split(request.query.get("id_list"))}
+        codes = set(_split(request.query.get("code_list")))
+        return [
+            title for title in self.titles.values() if title["id"] in ids or title["code"] in codes
+        ]
+
+    def _sorted(self, key: str, since: str | None) -> list[dict]:
+        titles = sorted(self.titles.values(), key=lambda title: title[key], reverse=True)
+        if since is not None:
+            titles = [title for title in titles if title[key] > int(since)]
+        return titles
+
+    async def _get_title(self, request: web.Request) -> web.Response:
+        query = request.query
+        for title in self.titles.values():
+            if str(title["id"]) == query.get("id") or title["code"] == query.get("code"):
+                return _json(title)
+            if query.get("torrent_id") and any(
+                str(torrent["torrent_id"]) == query["torrent_id"]
+                for torrent in title["torrents"]["list"]
+            ):
+                return _json(title)
+
+        return _error(404, "Release not found")
+
+    async def _get_titles(self, request: web.Request) -> web.Response:
+        titles = self._find_titles(request)
+        return _json(self._paginate(request, titles, per_page=len(titles) or 1))
+
+    async def _get_updates(self, request: web.Request) -> web.Response:
+        return _json(self._paginate(request, self._sorted("updated", request.query.get("since"))))
+
+    async def _get_changes(self, request: web.Request) -> web.Response:
+        titles = self._sorted("last_change", request.query.get("since"))
+        return _json(self._paginate(request, titles))
+
+    async def _get_schedule(self, _: web.Request) -> web.Response:
+        days = defaultdict(list)
+        for title in self.titles.values():
+            days[title["season"]["week_day"]].append(title)
+        return _json([{"day": day, "list": titles} for day, titles in sorted(days.items())])
+
+    async def _get_random_title(self, _: web.Request) -> web.Response:
+        return _json(self._random.choice(list(self.titles.values())))
+
+    async def _search_titles(self, request: web.Request) -> web.Response:
+        query = request.query
+        search = query.get("search", "").lower()
+        years = set(_split(query.get("year")))
+        genres = set(_split(query.get("genres")))
+
+        titles = [
+            title
+            for title in self.titles.values()
+            if (
+                not search
+                or any(search in (name or "").lower() for name in title["names"].values())
+            )
+            and (not years or str(title["season"]["year"]) in years)
+            and (not genres or genres <= set(title["genres"]))
+        ]
+        return _json(self._paginate(request, titles))
+
+    async def _advanced_search(self, request: web.Request) -> web.Response:
+        return _json(self._paginate(request, list(self.titles.values())))
+
+    async def _get_title_franchises(self, _: web.Request) -> web.Response:
+        return _json([])
+
+    async def _get_paginated_empty(self, request: web.Request) -> web.Response:
+        return _json(self._paginate(request, []))
+
+    async def _get_feed(self, request: web.Request) -> web.Response:
+        titles = self._sorted("updated", None)
+        return _json(self._paginate(request, [{"title": title} for title in titles]))
+
+    async def _get_years(self, _: web.Request) -> web.Response:
+        return _json(sorted({title["season"]["year"] for title in self.titles.values()}))
+
+    async def _get_genres(self, _: web.Request) -> web.Response:
+        return _json(sorted({genre for title in self.titles.values() for genre in title["genres"]}))
+
+    async def _get_team(self, _: web.Request) -> web.Response:
+        team = defaultdict(set)
+        for title in self.titles.values():
+            for role, names in title["team"].items():
+                team[role].update(names)
+        return _json({role: sorted(names) for role, names in team.items()})
+
+    async def _get_rss(self, request: web.Request) -> web.Response:
+        titles = list(self.titles.values())
+        rss_type = request.query.get("rss_type", "rss")
+
+        if rss_type == "json":
+            return _json(
+                {"items": [{"id": title["id"], "title": title["names"]["ru"]} for title in titles]}
+            )
+        if rss_type == "atom":
+            entries = "".join(
+                f"<entry><title>{title['names']['ru']}</title><id>{title['id']}</id></entry>"
+                for title in titles
+            )
+            body = (
+                f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+            )
+            return web.Response(text=body, content_type="application/atom+xml")
+
+        items = "".join(
+            f"<item><title>{title['names']['ru']}</title><guid>{title['id']}</guid></item>"
+            for title in titles
+        )
+        body = f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'
+        return web.Response(text=body, content_type="application/rss+xml")
+
+    # Websocket
+
+    def _next_event(self, index: int) -> dict:
+        if self.events:
+            return self.events[index % len(self.events)]
+        return make_event(self._random.choice(_RANDOM_EVENTS))
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        connection = web.WebSocketResponse()
+        await connection.prepare(request)
+        self._connections.add(connection)
+
+        await connection.send_str(dumps(EVENT_PAYLOADS["connect"]).decode())
+        emitter = asyncio.create_task(self._emit(connection)) if self.event_rate else None
+
+        try:
+            async for message in connection:
+                data = message.json()
+                if "subscribe" in data:
+                    self.subscriptions.append(data)
+                    await connection.send_str(
+                        dumps(
+                            {"subscribe": "success", "subscription_id": len(self.subscriptions)}
+                        ).decode()
+                    )
+        finally:
+            if emitter is not None:
+                emitter.cancel()
+            self._connections.discard(connection)
+
+        return connection
+
+    async def _emit(self, connection: web.WebSocketResponse):
+        index = 0
+        while not connection.closed:
+            await asyncio.sleep(1 / self.event_rate)
+            if self.disconnect_after is not None and index >= self.disconnect_after:
+                await connection.close(code=WSCloseCode.GOING_AWAY)
+                return
+
+            await connection.send_str(dumps(self._next_event(index)).decode())
+            index += 1
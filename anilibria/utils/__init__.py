@@ -1 +1,2 @@
+from .backoff import *  # noqa: F401 F403
 from .serializer import *  # noqa: F401 F403
@@ -0,0 +1,18 @@
+from random import uniform
+
+__all__ = ("exponential_backoff",)
+
+
+def exponential_backoff(
+    attempt: int, *, base: float = 0.5, maximum: float = 30, jitter: bool = True
+) -> float:
+    """
+    Возвращает задержку перед повторной попыткой с номером ``attempt`` (начиная с 0).
+
+    :param int attempt: Номер попытки.
+    :param float base: Задержка перед первой попыткой.
+    :param float maximum: Максимальная задержка.
+    :param bool jitter: Выбирать ли случайную задержку от 0 до вычисленной ("full jitter").
+    """
+    delay = min(maximum, base * 2**attempt)
+    return uniform(0, delay) if jitter else delay
@@ -0,0 +1,12 @@
+"""
+Запускает все бенчмарки: ``python -m benchmarks``
+"""
+from . import dispatch, gateway, http, index, structure
+from .timing import run
+
+if __name__ == "__main__":
+    for module in (structure, dispatch, gateway, http, index):
+        print(f"\n# {module.__name__}")
+        result = module.main()
+        if result is not None:
+            run(result)
@@ -0,0 +1,84 @@
+"""
+Время рассылки события обработчикам через ``Dispatch.call`` до завершения всех обработчиков.
+
+Запуск: ``python -m benchmarks.dispatch``
+"""
+import asyncio
+
+from anilibria import Dispatch
+
+from .timing import abench, run
+
+
+async def bench_dispatch(dispatch: Dispatch, handlers: int):
+    done = asyncio.Event()
+    calls = 0
+
+    async def handler(_):
+        nonlocal calls
+        calls += 1
+        if calls == handlers:
+            done.set()
+
+    for _ in range(handlers):
+        dispatch.register("on_event", handler)
+
+    async def call():
+        nonlocal calls
+        calls = 0
+        done.clear()
+        dispatch.call("on_event", None)
+        await done.wait()
+
+    mode = f"{dispatch.max_workers} workers" if dispatch.max_workers else "task per handler"
+    await abench(f"Dispatch.call, {handlers} handlers, {mode}", call, number=1000)
+    await dispatch.close()
+
+
+class _Event:
+    def __init__(self, title_id: int) -> None:
+        self.title_id = title_id
+
+
+async def bench_keyed(dispatch: Dispatch, events: int, titles: int):
+    done = asyncio.Event()
+    calls = 0
+
+    async def handler(_):
+        nonlocal calls
+        await asyncio.sleep(0)
+        calls += 1
+        if calls == events:
+            done.set()
+
+    dispatch.register("on_event", handler)
+    batch = [_Event(i % titles) for i in range(events)]
+
+    async def call():
+        nonlocal calls
+        calls = 0
+        done.clear()
+        for event in batch:
+            dispatch.call("on_event", event)
+        await done.wait()
+
+    mode = "keyed" if dispatch.keyed else "shared queue"
+    await abench(
+        f"Dispatch.call, {events} events of {titles} titles, {dispatch.max_workers} workers, {mode}",
+        call,
+        number=200,
+    )
+    await dispatch.close()
+
+
+async def main():
+    for workers in (None, 8):
+        for handlers in (1, 10, 100):
+            await bench_dispatch(Dispatch(max_workers=workers), handlers)
+
+    for keyed in (False, True):
+        await bench_keyed(Dispatch(max_workers=8, keyed=keyed), 100, 20)
+
+
+if __name__ == "__main__":
+    run(main())
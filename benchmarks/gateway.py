@@ -0,0 +1,91 @@
+"""
+Пропускная способность ``GatewayClient._track_data`` на записанном потоке событий.
+
+Запуск: ``python -m benchmarks.gateway``
+"""
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from orjson import dumps
+
+from anilibria import AniLibriaClient, EventCoalescer, FrameRecorder, ReplayPolicy
+from anilibria.testing.fixtures import make_event_stream
+
+from .timing import report, run
+
+
+async def replay(client: AniLibriaClient, stream: list[dict]) -> float:
+    gateway = client._websocket
+
+    start = perf_counter()
+    for data in stream:
+        gateway._track_data(data)
+    # Даём обработчикам завершиться
+    while len(asyncio.all_tasks()) > 1:
+        await asyncio.sleep(0)
+
+    return perf_counter() - start
+
+
+async def main():
+    stream = make_event_stream(5000)
+
+    client = AniLibriaClient()
+    elapsed = await replay(client, stream)
+    report("_track_data, no listeners, per event", elapsed / len(stream))
+
+    client = AniLibriaClient()
+    for name in ("title_update", "playlist_update", "encode_progress", "torrent_update"):
+
+        async def handler(_):
+            ...
+
+        client.listen(handler, name=f"on_{name}")
+
+    elapsed = await replay(client, stream)
+    report("_track_data, with listeners, per event", elapsed / len(stream))
+    print(f"{'events per second':<55} {len(stream) / elapsed:>12.0f}")
+
+    client = AniLibriaClient()
+    for name in ("title_update", "encode_progress", "torrent_update"):
+
+        async def raw_handler(_):
+            ...
+
+        client.listen(raw_handler, name=f"on_{name}", raw=True)
+
+    elapsed = await replay(client, stream)
+    report("_track_data, raw listeners, per event", elapsed / len(stream))
+
+    coalescer = EventCoalescer(window=60)
+    client = AniLibriaClient(coalescer=coalescer)
+
+    async def progress(_):
+        ...
+
+    client.listen(progress, name="on_encode_progress")
+    elapsed = await replay(client, stream)
+    coalescer.flush_all(client._websocket.dispatch)
+    report("_track_data, coalesced encode_progress, per event", elapsed / len(stream))
+    print(f"{'encode_progress handler calls':<55} {coalescer.delivered:>5} of {coalescer.received}")
+
+    with TemporaryDirectory() as directory:
+        recorder = FrameRecorder(Path(directory) / "traffic.bin")
+        for data in stream:
+            recorder.write(dumps(data).decode())
+        await recorder.close()
+
+        async def on_title_update(_):
+            ...
+
+        client = AniLibriaClient(replay=ReplayPolicy(recorder.path, speed=None))
+        client.listen(on_title_update)
+        await client.astart()
+        elapsed = client._websocket.elapsed
+        report("ReplayTransport, max speed, per frame", elapsed / len(stream))
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,81 @@
+"""
+Время ``Request.request`` к локальному aiohttp серверу, отдающему записанные ответы.
+
+Запуск: ``python -m benchmarks.http``
+"""
+import asyncio
+
+from aiohttp import web
+from orjson import dumps
+
+from anilibria.api.http import HTTPClient
+from anilibria.testing.fixtures import make_title, make_title_list
+
+from .timing import abench, run
+
+HOST = "127.0.0.1"
+PORT = 8913
+
+
+def create_app() -> web.Application:
+    title = dumps(make_title(episodes=24))
+    title_list = dumps(make_title_list(count=50))
+
+    async def get_title(_: web.Request) -> web.Response:
+        return web.Response(body=title, content_type="application/json")
+
+    async def get_title_list(_: web.Request) -> web.Response:
+        return web.Response(body=title_list, content_type="application/json")
+
+    rss = "".join(
+        f"<item><title>{title['names']['ru']}</title><guid>{title['id']}</guid></item>"
+        for title in make_title_list(count=50)["list"]
+    )
+    rss = f'<?xml version="1.0"?><rss version="2.0"><channel>{rss}</channel></rss>'.encode()
+
+    async def get_rss(_: web.Request) -> web.Response:
+        return web.Response(body=rss, content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/title", get_title)
+    app.router.add_get("/title/list", get_title_list)
+    app.router.add_get("/torrent/rss", get_rss)
+    return app
+
+
+async def main():
+    runner = web.AppRunner(create_app())
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+
+    http = HTTPClient(base_url=f"http://{HOST}:{PORT}")
+
+    try:
+        await abench("Request.request /title", lambda: http.get_title(id=9000), number=200)
+        await abench(
+            "Request.request /title/list, 50 titles",
+            lambda: http.get_titles(id_list=[9000]),
+            number=50,
+        )
+
+        async def stream_titles():
+            async for _ in http.stream_titles(id_list=[9000]):
+                pass
+
+        await abench("Request.stream /title/list, 50 titles", stream_titles, number=50)
+        await abench("Request.request /torrent/rss", lambda: http.get_rss(), number=200)
+        await abench(
+            "Request.request /torrent/rss, raw", lambda: http.get_rss(raw=True), number=200
+        )
+        await abench(
+            "Request.request /title, 50 concurrent",
+            lambda: asyncio.gather(*(http.get_title(id=9000 + n) for n in range(50))),
+            number=20,
+        )
+    finally:
+        await http.session.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    run(main())
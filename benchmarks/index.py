@@ -0,0 +1,52 @@
+"""
+Время поиска по ``TitleIndex`` на каталоге из 5000 тайтлов.
+
+Запуск: ``python -m benchmarks.index``
+"""
+from random import Random
+
+from anilibria import Title, TitleIndex
+from anilibria.api.models.cattrs_utils import converter
+from anilibria.testing.fixtures import make_title
+
+from .timing import bench
+
+WORDS = ("волчица", "пряности", "атака", "титанов", "магическая", "битва", "рыцарь", "король")
+GENRES = ("Комедия", "Драма", "Экшен", "Фэнтези", "Романтика", "Школа", "Меха")
+
+
+def make_catalog(count: int = 5000) -> list[Title]:
+    random = Random(1)
+    titles = []
+    for n in range(count):
+        data = make_title(title_id=n, episodes=1, torrents=0)
+        data["names"] = {"ru": " ".join(random.sample(WORDS, 3)), "en": f"Title {n}"}
+        data["genres"] = random.sample(GENRES, 2)
+        data["season"]["year"] = 2000 + n % 24
+        data["team"]["voice"] = [f"voice{n % 50}"]
+        data["updated"] += n
+        titles.append(converter.structure(data, Title))
+    return titles
+
+
+def main():
+    titles = make_catalog()
+    bench("TitleIndex build, 5000 titles", lambda: TitleIndex(titles), repeat=1)
+
+    index = TitleIndex(titles)
+    bench("TitleIndex.complete, 3 letters", lambda: index.complete("вол"))
+
+    def update_and_complete():
+        index.add(titles[0])
+        index.complete("вол")
+
+    bench("TitleIndex.add + complete, 3 letters", update_and_complete)
+    bench("TitleIndex.search by name", lambda: index.search(search=["пряност"]))
+    bench(
+        "TitleIndex.search by genres and year", lambda: index.search(genres=GENRES[:2], year=[2010])
+    )
+    bench("TitleIndex.search by team", lambda: index.search(team=["voice7"]))
+
+
+if __name__ == "__main__":
+    main()
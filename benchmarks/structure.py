@@ -0,0 +1,37 @@
+"""
+Время преобразования ответов API и событий вебсокета в объекты.
+
+Запуск: ``python -m benchmarks.structure``
+"""
+from anilibria import EventType, LazyTitle, ListPagination, Title
+from anilibria.api.models.cattrs_utils import converter
+from anilibria.testing.fixtures import EVENT_PAYLOADS, make_title, make_title_list
+
+from .timing import bench
+
+
+def main():
+    for episodes in (12, 100, 1000):
+        data = make_title(episodes=episodes)
+        bench(f"Title, {episodes} episodes", lambda: converter.structure(data, Title))
+        bench(f"LazyTitle, {episodes} episodes", lambda: converter.structure(data, LazyTitle))
+
+    page = make_title_list(count=50)
+    bench(
+        "ListPagination[Title], 50 titles", lambda: converter.structure(page, ListPagination[Title])
+    )
+    bench(
+        "ListPagination[LazyTitle], 50 titles",
+        lambda: converter.structure(page, ListPagination[LazyTitle]),
+    )
+
+    for event_type in EventType:
+        # Disconnect и Reconnect создаются клиентом и не приходят из вебсокета
+        if (data := EVENT_PAYLOADS.get(event_type.name.lower())) is None:
+            continue
+        model = event_type.value
+        bench(f"Event {model.__name__}", lambda: converter.structure(data, model))
+
+
+if __name__ == "__main__":
+    main()
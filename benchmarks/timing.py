@@ -0,0 +1,45 @@
+import asyncio
+from time import perf_counter
+from timeit import Timer
+from typing import Awaitable, Callable
+
+__all__ = ("bench", "abench", "report")
+
+
+def report(name: str, seconds: float, unit: str = "us"):
+    scale = {"us": 1e6, "ms": 1e3}[unit]
+    print(f"{name:<55} {seconds * scale:>12.1f} {unit}")
+
+
+def bench(name: str, func: Callable, repeat: int = 5) -> float:
+    """
+    Лучшее время одного вызова ``func`` из ``repeat`` замеров
+    """
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat, number)) / number
+    report(name, best)
+    return best
+
+
+async def abench(
+    name: str, func: Callable[[], Awaitable], number: int = 100, repeat: int = 5
+) -> float:
+    """
+    Лучшее время одного вызова корутины ``func`` из ``repeat`` замеров по ``number`` вызовов
+    """
+    await func()  # Прогрев
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            await func()
+        best = min(best, (perf_counter() - start) / number)
+
+    report(name, best)
+    return best
+
+
+def run(coro: Awaitable):
+    return asyncio.run(coro)
@@ -0,0 +1,150 @@
+import asyncio
+
+from aiohttp import web
+from orjson import dumps
+
+from anilibria import AniLibriaClient
+from anilibria.api.error import HTTPException
+from anilibria.api.http import CacheInvalidation, ResponseCache
+from anilibria.api.http.cache import make_key
+from anilibria.api.http.request import Request
+from anilibria.api.http.route import Route
+from anilibria.testing.fixtures import make_event, make_title
+
+TITLE_ROUTE = Route("GET", "/title")
+TITLE_KEY = make_key(TITLE_ROUTE, {"id": "9000"})
+
+
+async def _track(invalidation: CacheInvalidation, event: dict) -> tuple[ResponseCache, bool]:
+    cache = ResponseCache(invalidation=invalidation)
+    cache.set(TITLE_ROUTE, TITLE_KEY, make_title())
+    client = AniLibriaClient(cache=cache)
+    gateway = client._websocket
+
+    gateway._track_data(event)
+    await asyncio.sleep(0)
+    return cache, gateway._needs_object(f"on_{event['type']}")
+
+
+def test_invalidation_does_not_structure_events():
+    cache, structured = asyncio.run(_track(CacheInvalidation.EVICT, make_event("torrent_update")))
+
+    assert not structured
+    assert len(cache) == 0
+
+
+def test_patch_replaces_title_with_event_data():
+    event = make_event("title_update")
+    event["data"] = event["data"] | {"title": make_title() | {"updated": 1700000000}}
+
+    cache, structured = asyncio.run(_track(CacheInvalidation.PATCH, event))
+
+    assert not structured
+    assert cache.get(TITLE_ROUTE, TITLE_KEY)["updated"] == 1700000000
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("anilibria.api.http.cache.monotonic", lambda: now)
+    cache = ResponseCache(ttl=10, routes_ttl={"/years": 100})
+    years_route = Route("GET", "/years")
+    cache.set(TITLE_ROUTE, TITLE_KEY, make_title())
+    cache.set(years_route, "years", [2023])
+
+    now += 10
+    assert cache.get(TITLE_ROUTE, TITLE_KEY) is None
+    assert cache.get(years_route, "years") == [2023]
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_size=2)
+    keys = [make_key(TITLE_ROUTE, {"id": str(title_id)}) for title_id in (1, 2, 3)]
+    cache.set(TITLE_ROUTE, keys[0], make_title(title_id=1))
+    cache.set(TITLE_ROUTE, keys[1], make_title(title_id=2))
+    cache.get(TITLE_ROUTE, keys[0])
+
+    cache.set(TITLE_ROUTE, keys[2], make_title(title_id=3))
+
+    assert len(cache) == 2
+    assert cache.get(TITLE_ROUTE, keys[1]) is None
+    assert cache.get(TITLE_ROUTE, keys[0]) is not None
+    # Тайтл удалённой записи больше не связан с ней
+    assert 2 not in cache._titles
+
+
+async def _serve(handler) -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_get("/title", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+
+async def _count_requests(handler, *calls: dict) -> int:
+    hits = []
+
+    async def counted(request: web.Request) -> web.Response:
+        hits.append(request)
+        return await handler(request)
+
+    runner, base_url = await _serve(counted)
+    request = Request(base_url=base_url, cache=ResponseCache())
+    try:
+        for kwargs in calls:
+            try:
+                await request.request(TITLE_ROUTE, {"id": 9000}, **kwargs)
+            except HTTPException:
+                pass
+    finally:
+        await request.session.close()
+        await runner.cleanup()
+    return len(hits)
+
+
+async def _title(_: web.Request) -> web.Response:
+    return web.Response(body=dumps(make_title()), content_type="application/json")
+
+
+async def _api_error(_: web.Request) -> web.Response:
+    error = {"error": {"code": 404, "message": "Release not found"}}
+    return web.Response(body=dumps(error), status=404, content_type="application/json")
+
+
+def test_successful_responses_are_cached():
+    assert asyncio.run(_count_requests(_title, {}, {})) == 1
+
+
+def test_errors_are_not_cached():
+    assert asyncio.run(_count_requests(_api_error, {}, {})) == 2
+
+
+def test_raw_responses_are_not_cached():
+    assert asyncio.run(_count_requests(_title, {"raw": True}, {"raw": True}, {})) == 3
+
+
+def test_servers_do_not_share_entries():
+    async def main():
+        cache = ResponseCache()
+        runners, titles = [], []
+        for updated in (1, 2):
+
+            async def handler(_: web.Request, updated=updated) -> web.Response:
+                return web.Response(
+                    body=dumps(make_title() | {"updated": updated}), content_type="application/json"
+                )
+
+            runner, base_url = await _serve(handler)
+            runners.append(runner)
+            request = Request(base_url=base_url, cache=cache)
+            titles.append(await request.request(TITLE_ROUTE, {"id": 9000}))
+            await request.session.close()
+
+        for runner in runners:
+            await runner.cleanup()
+        return titles, len(cache)
+
+    titles, size = asyncio.run(main())
+    assert [title["updated"] for title in titles] == [1, 2]
+    assert size == 2
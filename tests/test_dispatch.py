@@ -0,0 +1,105 @@
+import asyncio
+
+from anilibria.api.dispatch import Dispatch, OverflowPolicy
+
+
+def test_block_waits_for_capacity():
+    async def main():
+        release = asyncio.Event()
+        handled = []
+
+        async def on_event(value: int):
+            await release.wait()
+            handled.append(value)
+
+        dispatch = Dispatch(max_workers=1, queue_size=2)
+        dispatch.register("on_event", on_event)
+        for value in range(3):
+            dispatch.call("on_event", value)
+        await asyncio.sleep(0)
+
+        waiter = asyncio.create_task(dispatch.wait_for_capacity())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        release.set()
+        await asyncio.wait_for(waiter, 1)
+        await dispatch.close()
+        return handled
+
+    assert asyncio.run(main())[:1] == [0]
+
+
+def test_queue_depth_stats_are_totals():
+    async def main():
+        release = asyncio.Event()
+
+        async def on_event(value: int):
+            await release.wait()
+
+        dispatch = Dispatch(max_workers=2, keyed=True, key=lambda args: args[0])
+        dispatch.register("on_event", on_event)
+        for value in range(6):
+            dispatch.call("on_event", value)
+
+        stats = dispatch.stats
+        release.set()
+        await dispatch.close()
+        return stats
+
+    stats = asyncio.run(main())
+    assert stats.queue_depth == 6
+    assert stats.max_queue_depth == 6
+
+
+def test_internal_listeners_bypass_overflow():
+    async def main():
+        release = asyncio.Event()
+        internal, handled = [], []
+
+        async def on_event(value: int):
+            await release.wait()
+            handled.append(value)
+
+        async def track(data: dict):
+            internal.append(data["value"])
+
+        dispatch = Dispatch(max_workers=1, queue_size=1, overflow=OverflowPolicy.DROP_NEWEST)
+        dispatch.register("on_event", on_event)
+        dispatch.register("on_event", track, raw=True, internal=True)
+        for value in range(5):
+            dispatch.call_raw("on_event", {"value": value})
+            dispatch.call("on_event", value)
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.sleep(0.01)
+        await dispatch.close()
+        return internal, handled, dispatch.stats.dropped
+
+    internal, handled, dropped = asyncio.run(main())
+    assert internal == [0, 1, 2, 3, 4]
+    assert dropped > 0
+    assert len(handled) < 5
+
+
+def test_join_waits_for_queued_and_nested_calls():
+    async def main():
+        handled = []
+
+        async def on_event(value: int):
+            await asyncio.sleep(0.01)
+            handled.append(value)
+            if value < 3:
+                dispatch.call("on_event", value + 3)
+
+        dispatch = Dispatch(max_workers=1)
+        dispatch.register("on_event", on_event)
+        for value in range(3):
+            dispatch.call("on_event", value)
+
+        await asyncio.wait_for(dispatch.join(), 1)
+        await dispatch.close()
+        return handled
+
+    assert asyncio.run(main()) == [0, 1, 2, 3, 4, 5]
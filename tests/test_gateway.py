@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from aiohttp import ClientError
+
+from anilibria.api.dispatch import Dispatch
+from anilibria.api.gateway import (
+    EventCoalescer,
+    GapRecovery,
+    GatewayClient,
+    ReconnectPolicy,
+    TitleUpdate,
+)
+from anilibria.api.http import HTTPClient
+from anilibria.api.models import Title
+from anilibria.api.models.cattrs_utils import converter
+from anilibria.testing.fixtures import make_title
+
+
+class FlakyGateway(GatewayClient):
+    """
+    Шлюз, который вместо подключения к вебсокету выполняет заданные сценарии.
+    """
+
+    def __init__(self, steps: list[str], **kwargs):
+        super().__init__(HTTPClient(), **kwargs)
+        self.steps: list[str] = steps
+        self.calls: list[str] = []
+
+    async def connect(self):
+        self._established = False
+        step = self.steps[len(self.calls)]
+        self.calls.append(step)
+
+        if step == "fail":
+            raise ClientError("Connection refused")
+
+        self._on_connected()
+        if step == "drop":
+            self._on_disconnected(None, "Connection reset")
+            raise ConnectionError("Connection reset")
+
+        self._stopped = True
+
+
+def test_reconnects_after_drop_following_failed_attempts():
+    gateway = FlakyGateway(
+        ["fail", "fail", "drop", "ok"],
+        reconnect_policy=ReconnectPolicy(attempts=2, base_delay=0, max_delay=0),
+    )
+
+    asyncio.run(gateway.start())
+
+    assert gateway.calls == ["fail", "fail", "drop", "ok"]
+    assert gateway.stats.connects == 2
+    assert gateway.stats.reconnects == 1
+    assert gateway.stats.failed_attempts == 2
+
+
+def test_gives_up_after_consecutive_failures():
+    gateway = FlakyGateway(
+        ["fail", "fail", "fail"],
+        reconnect_policy=ReconnectPolicy(attempts=2, base_delay=0, max_delay=0),
+    )
+
+    with pytest.raises(ClientError):
+        asyncio.run(gateway.start())
+
+    assert gateway.calls == ["fail", "fail", "fail"]
+
+
+def test_gap_recovery_does_not_block_dispatch_workers():
+    titles = [converter.structure(make_title(title_id=9000 + n), Title) for n in range(20)]
+
+    async def fetch_gap(since: int):
+        for title in titles:
+            yield title
+
+    async def main():
+        recovered = []
+
+        async def on_title_update(event: TitleUpdate):
+            await asyncio.sleep(0)
+            recovered.append(event.title.id)
+
+        # Очередь из одного вызова заполняется сразу, и источник событий ждёт места
+        dispatch = Dispatch(max_workers=1, queue_size=1)
+        dispatch.register("on_title_update", on_title_update)
+        gateway = FlakyGateway(
+            ["drop", "ok"],
+            dispatch=dispatch,
+            gap_recovery=GapRecovery(),
+            fetch_gap=fetch_gap,
+            reconnect_policy=ReconnectPolicy(base_delay=0, max_delay=0),
+        )
+        await gateway.start()
+
+        while len(recovered) < len(titles):
+            await asyncio.sleep(0.01)
+        await gateway.close()
+        return recovered
+
+    recovered = asyncio.run(asyncio.wait_for(main(), 5))
+    assert recovered == [title.id for title in titles]
+
+
+def test_close_delivers_coalesced_events():
+    async def main():
+        delivered = []
+
+        async def on_title_update_batch(events: list[TitleUpdate]):
+            await asyncio.sleep(0.01)
+            delivered.extend(event.title.id for event in events)
+
+        dispatch = Dispatch(max_workers=1)
+        dispatch.register("on_title_update_batch", on_title_update_batch)
+        gateway = GatewayClient(
+            HTTPClient(), dispatch=dispatch, coalescer=EventCoalescer(window=60)
+        )
+        for n in range(3):
+            title = converter.structure(make_title(title_id=n), Title)
+            gateway.coalescer.push(dispatch, "on_title_update", TitleUpdate(title=title, diff={}))
+
+        await gateway.close()
+        return delivered
+
+    assert asyncio.run(main()) == [0, 1, 2]
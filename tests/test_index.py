@@ -0,0 +1,76 @@
+import asyncio
+
+from anilibria import AniLibriaClient, TitleIndex, TitleStore
+from anilibria.api.models import Title
+from anilibria.api.models.cattrs_utils import converter
+from anilibria.testing import MockServer
+from anilibria.testing.fixtures import make_title
+
+
+def _event_title() -> Title:
+    # Тайтл из события вебсокета, изменённый позже всех тайтлов каталога
+    return converter.structure(make_title(title_id=1) | {"last_change": 2000000000}, Title)
+
+
+async def _sync(store: TitleStore | None) -> TitleIndex:
+    if store is not None:
+        await store.put_many([make_title(title_id=100 + n) for n in range(3)])
+        await store.set_since(1672000000)
+
+    async with MockServer() as server:
+        client = AniLibriaClient(base_url=server.base_url, store=store, index=TitleIndex())
+        client.index.add(_event_title())
+        await client.sync_index()
+        await client.close()
+    return client.index
+
+
+def test_sync_loads_catalog_after_event():
+    index = asyncio.run(_sync(None))
+
+    assert len(index) == 21
+    assert index.synced == 1672000000
+
+
+def test_sync_loads_store_after_event():
+    index = asyncio.run(_sync(TitleStore()))
+
+    assert {100, 101, 102, 1} <= {title.id for title in index.filter()}
+
+
+def _titles(names: list[str]) -> list[Title]:
+    return [
+        converter.structure(
+            make_title(title_id=n) | {"names": {"ru": name}, "updated": 1672000000 + n}, Title
+        )
+        for n, name in enumerate(names)
+    ]
+
+
+def test_complete_follows_updates():
+    titles = _titles(["Волчица и пряности", "Атака титанов", "Волейбол"])
+    index = TitleIndex(titles)
+    assert [title.id for title in index.complete("вол")] == [2, 0]
+
+    index.add(converter.structure(make_title(title_id=2) | {"names": {"ru": "Баскетбол"}}, Title))
+    assert [title.id for title in index.complete("вол")] == [0]
+    assert [title.id for title in index.complete("баск")] == [2]
+
+    index.remove(0)
+    assert index.complete("вол") == []
+    assert index._words == sorted(index._word_ids)
+
+
+def test_search_pages_match_filter():
+    titles = _titles([f"Тайтл {n}" for n in range(30)])
+    index = TitleIndex(titles)
+    expected = [title.id for title in index.filter(search=["тайтл"])][3:20]
+
+    found = []
+    for page in range(1, 5):
+        result = index.search(search=["тайтл"], after=3, limit=17, page=page, items_per_page=5)
+        assert result.pagination.total_items == 17
+        assert result.pagination.pages == 4
+        found += [title.id for title in result.list]
+
+    assert found == expected
@@ -0,0 +1,23 @@
+from anilibria import LazyTitle
+from anilibria.api.models import Title
+from anilibria.api.models.cattrs_utils import converter
+from anilibria.testing.fixtures import make_title
+
+
+def test_unstructure_matches_title():
+    data = make_title(title_id=1)
+    lazy = converter.structure(data, LazyTitle)
+
+    unstructured = converter.unstructure(lazy)
+
+    assert "_raw" not in unstructured
+    assert unstructured == converter.unstructure(converter.structure(data, Title))
+
+
+def test_equals_title_with_same_data():
+    lazy = converter.structure(make_title(title_id=1), LazyTitle)
+    title = converter.structure(make_title(title_id=1), Title)
+
+    assert lazy == title
+    assert title == lazy
+    assert lazy != converter.structure(make_title(title_id=2), Title)
@@ -0,0 +1,53 @@
+import asyncio
+
+from anilibria import AniLibriaClient
+from anilibria.api.error import HTTPException
+from anilibria.api.http import TitleLoader
+from anilibria.api.models import DescriptionType
+from anilibria.testing import MockServer
+
+
+async def _load(calls: list[dict], **loader_kwargs) -> tuple[list, dict[str, int]]:
+    async with MockServer() as server:
+        client = AniLibriaClient(
+            base_url=server.base_url, title_loader=TitleLoader(**loader_kwargs)
+        )
+        results = await asyncio.gather(
+            *(client.get_title(**kwargs) for kwargs in calls), return_exceptions=True
+        )
+        await client.close()
+    return results, dict(server.requests)
+
+
+def test_concurrent_loads_share_one_request():
+    calls = [{"id": 9000 + n} for n in range(5)] + [{"code": "title-9005"}, {"id": 9000}]
+
+    results, requests = asyncio.run(_load(calls))
+
+    assert [title.id for title in results] == [9000, 9001, 9002, 9003, 9004, 9005, 9000]
+    assert requests == {"/title/list": 1}
+
+
+def test_batches_are_split_by_params_and_size():
+    calls = [
+        {"id": 9000},
+        {"id": 9001},
+        {"id": 9002},
+        {"id": 9003, "description_type": DescriptionType.PLAIN},
+    ]
+
+    results, requests = asyncio.run(_load(calls, max_batch_size=2))
+
+    assert [title.id for title in results] == [9000, 9001, 9002, 9003]
+    assert requests == {"/title/list": 3}
+
+
+def test_missing_titles_fall_back_to_single_requests():
+    results, requests = asyncio.run(_load([{"id": 9000}, {"id": 1}, {"id": 1}]))
+
+    assert results[0].id == 9000
+    for error in results[1:]:
+        assert isinstance(error, HTTPException)
+        assert "404" in str(error)
+    # Повторы одного ID ждут одного запроса
+    assert requests == {"/title/list": 1, "/title": 1}
@@ -0,0 +1,47 @@
+import asyncio
+
+from anilibria.api.models import ListPagination, Pagination
+from anilibria.client import paginate
+
+
+def _page(page: int, pages: int) -> ListPagination[int]:
+    return ListPagination(
+        pagination=Pagination(
+            pages=pages, current_page=page, items_per_page=2, total_items=pages * 2
+        ),
+        list=[page * 10, page * 10 + 1],
+    )
+
+
+def test_prefetches_pages_before_first_item():
+    requested: list[int] = []
+
+    async def fetch(page: int) -> ListPagination[int]:
+        requested.append(page)
+        await asyncio.sleep(0.01 if page > 1 else 0)
+        return _page(page, 6)
+
+    async def main():
+        items = paginate(fetch, window=3)
+        first = await items.__anext__()
+        # Страницы окна уже запрошены, хотя получен только первый объект
+        await asyncio.sleep(0)
+        scheduled = list(requested)
+        rest = [item async for item in items]
+        return first, scheduled, rest
+
+    first, scheduled, rest = asyncio.run(main())
+    assert first == 10
+    assert scheduled == [1, 2, 3, 4]
+    assert rest == [11, 20, 21, 30, 31, 40, 41, 50, 51, 60, 61]
+
+
+def test_unordered_pagination_returns_all_items():
+    async def fetch(page: int) -> ListPagination[int]:
+        await asyncio.sleep(0.001 * (5 - page))
+        return _page(page, 4)
+
+    async def main():
+        return [item async for item in paginate(fetch, window=2, ordered=False)]
+
+    assert sorted(asyncio.run(main())) == [10, 11, 20, 21, 30, 31, 40, 41]
@@ -0,0 +1,53 @@
+import asyncio
+
+from anilibria.api.dispatch import Dispatch
+from anilibria.api.gateway import PlaylistUpdate, PollingClient, TitleUpdate
+from anilibria.testing.fixtures import make_title
+
+
+class ChangesHTTP:
+    """
+    HTTP клиент, который возвращает заданные списки изменений по очереди.
+    """
+
+    def __init__(self, responses: list[list[dict]]):
+        self.responses: list[list[dict]] = responses
+
+    async def get_changes(self, **_) -> dict:
+        titles = self.responses.pop(0)
+        return {"list": titles, "pagination": {"pages": 1}}
+
+
+def test_poll_emits_changes_from_fingerprints():
+    title = make_title(episodes=2) | {"last_change": 1672000000}
+    unchanged = title | {}
+    uploaded = make_title(episodes=2) | {"last_change": 1672000100, "updated": 1672000100}
+    # Вторая серия до загрузки была без 1080p
+    title["player"]["list"]["2"]["hls"]["fhd"] = None
+
+    async def main():
+        received = []
+
+        async def on_title_update(event: TitleUpdate):
+            received.append(event)
+
+        async def on_playlist_update(event: PlaylistUpdate):
+            received.append(event)
+
+        dispatch = Dispatch()
+        dispatch.register("on_title_update", on_title_update)
+        dispatch.register("on_playlist_update", on_playlist_update)
+        client = PollingClient(ChangesHTTP([[title], [unchanged], [uploaded]]), dispatch=dispatch)
+        for _ in range(3):
+            await client.poll()
+        await asyncio.sleep(0)
+        return client, received
+
+    client, received = asyncio.run(main())
+
+    assert [type(event) for event in received] == [TitleUpdate, TitleUpdate, PlaylistUpdate]
+    assert received[1].diff == {"updated": title["updated"], "last_change": 1672000000}
+    assert received[2].episode == "2"
+    assert received[2].diff == {"list": {"2": {"hls": {"fhd": None}}}}
+    assert received[2].reupload is False
+    assert not any(isinstance(value, dict) for value in client._snapshot.values())
@@ -0,0 +1,112 @@
+import asyncio
+from time import monotonic
+
+import pytest
+from aiohttp import web
+
+from anilibria.api.error import HTTPException
+from anilibria.api.http.ratelimit import RateLimiter, RetryPolicy, TokenBucket
+from anilibria.api.http.request import Request
+from anilibria.api.http.route import Route
+from anilibria.testing import MockServer
+
+ROUTE = Route("GET", "/years")
+
+
+def test_waiters_get_tokens_in_order():
+    async def main():
+        bucket = TokenBucket(rate=200, capacity=1)
+        order = []
+
+        async def acquire(n: int):
+            await bucket.acquire()
+            order.append(n)
+
+        tasks = [asyncio.create_task(acquire(n)) for n in range(6)]
+        await asyncio.sleep(0)
+        # Отменённый в середине очереди не задерживает остальных
+        tasks[3].cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return order
+
+    assert asyncio.run(asyncio.wait_for(main(), 5)) == [0, 1, 2, 4, 5]
+
+
+def test_rate_limiter_counts_throttled_requests():
+    async def main():
+        async with MockServer() as server:
+            limiter = RateLimiter(rate=100, burst=1)
+            request = Request(base_url=server.base_url, rate_limiter=limiter)
+            await asyncio.gather(*(request.request(ROUTE, {"n": n}) for n in range(3)))
+            await request.session.close()
+        return limiter.throttled
+
+    assert asyncio.run(main()) == 2
+
+
+async def _request_with_retries(responses: list[web.Response], policy: RetryPolicy):
+    hits = []
+
+    async def handler(_: web.Request) -> web.Response:
+        hits.append(monotonic())
+        return responses[min(len(hits), len(responses)) - 1]
+
+    app = web.Application()
+    app.router.add_get("/years", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+
+    request = Request(base_url=f"http://127.0.0.1:{runner.addresses[0][1]}", retry_policy=policy)
+    try:
+        return await request.request(ROUTE), hits
+    finally:
+        await request.session.close()
+        await runner.cleanup()
+
+
+def test_retries_server_errors():
+    policy = RetryPolicy(base_delay=0, max_delay=0)
+    responses = [web.Response(status=503), web.json_response([2023])]
+
+    result, hits = asyncio.run(_request_with_retries(responses, policy))
+
+    assert result == [2023]
+    assert len(hits) == 2
+    assert policy.retried == 1
+
+
+def test_retry_after_header_sets_the_delay():
+    policy = RetryPolicy(base_delay=0, max_delay=5)
+    responses = [
+        web.Response(status=429, headers={"Retry-After": "0.2"}),
+        web.json_response([2023]),
+    ]
+
+    result, hits = asyncio.run(_request_with_retries(responses, policy))
+
+    assert result == [2023]
+    assert hits[1] - hits[0] >= 0.2
+
+
+def test_retry_delay_is_capped():
+    policy = RetryPolicy(base_delay=1, max_delay=3)
+
+    assert policy.get_delay(0, "120") == 3
+    assert policy.get_delay(0, "Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert policy.get_delay(5) <= 3
+
+
+def test_gives_up_after_attempts():
+    async def main():
+        async with MockServer(error_rate=1, error_status=503) as server:
+            policy = RetryPolicy(attempts=2, base_delay=0, max_delay=0)
+            request = Request(base_url=server.base_url, retry_policy=policy)
+            try:
+                with pytest.raises(HTTPException):
+                    await request.request(ROUTE)
+            finally:
+                await request.session.close()
+        return server.requests["/years"], policy.retried
+
+    assert asyncio.run(main()) == (3, 2)
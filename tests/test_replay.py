@@ -0,0 +1,32 @@
+import asyncio
+
+from anilibria.api.gateway.replay import FrameRecorder, _read_frames_async, read_frames
+
+
+def test_recorded_frames_are_read_back(tmp_path):
+    path = tmp_path / "frames.bin"
+    frames = [(1672000000.0 + n, f'{{"n": {n}, "text": "кадр {n}"}}') for n in range(1000)]
+
+    async def main():
+        recorder = FrameRecorder(path, buffer_size=1024)
+        for timestamp, text in frames:
+            recorder.write(text, timestamp)
+        await recorder.close()
+        return [frame async for frame in _read_frames_async(path, chunk_size=100)]
+
+    assert asyncio.run(main()) == frames
+    assert list(read_frames(path)) == frames
+
+
+def test_truncated_frame_is_skipped(tmp_path):
+    path = tmp_path / "frames.bin"
+    recorder = FrameRecorder(path)
+    recorder.write('{"n": 1}', 1.0)
+    recorder.write('{"n": 2}', 2.0)
+    asyncio.run(recorder.close())
+    path.write_bytes(path.read_bytes()[:-3])
+
+    async def main():
+        return [frame async for frame in _read_frames_async(path, chunk_size=5)]
+
+    assert asyncio.run(main()) == [(1.0, '{"n": 1}')]
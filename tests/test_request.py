@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from anilibria.api.error import HTTPException
+from anilibria.api.http.request import Request
+from anilibria.api.http.route import Route
+
+
+async def _request(handler, **kwargs):
+    app = web.Application()
+    app.router.add_get("/route", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+
+    request = Request(base_url=f"http://127.0.0.1:{port}")
+    try:
+        return await request.request(Route("GET", "/route"), **kwargs)
+    finally:
+        await request.session.close()
+        await runner.cleanup()
+
+
+async def _error_page(_: web.Request) -> web.Response:
+    return web.Response(text="<html>503</html>", status=503, content_type="text/html")
+
+
+async def _rss(_: web.Request) -> web.Response:
+    return web.Response(body=b"<rss></rss>", content_type="application/rss+xml")
+
+
+async def _empty_json(_: web.Request) -> web.Response:
+    return web.Response(body=b"", content_type="application/json")
+
+
+def test_raw_request_returns_bytes():
+    assert asyncio.run(_request(_rss, raw=True)) == b"<rss></rss>"
+
+
+def test_raw_request_raises_for_error_page():
+    with pytest.raises(HTTPException, match="503"):
+        asyncio.run(_request(_error_page, raw=True))
+
+
+def test_empty_json_body_is_none():
+    assert asyncio.run(_request(_empty_json)) is None
+
+
+class SlowServer:
+    """
+    Сервер, который отвечает на запрос, только когда ему разрешат.
+    """
+
+    def __init__(self, status: int = 200):
+        self.status: int = status
+        self.requests: int = 0
+        self.release: asyncio.Event = asyncio.Event()
+        self.runner: web.AppRunner | None = None
+
+    async def handle(self, _: web.Request) -> web.Response:
+        self.requests += 1
+        await self.release.wait()
+        if self.status >= 400:
+            return web.json_response(
+                {"error": {"code": self.status, "message": "Error"}}, status=self.status
+            )
+        return web.json_response({"id": 9000})
+
+    async def __aenter__(self) -> Request:
+        app = web.Application()
+        app.router.add_get("/route", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", 0).start()
+        self.request = Request(base_url=f"http://127.0.0.1:{self.runner.addresses[0][1]}")
+        return self.request
+
+    async def __aexit__(self, *_):
+        await self.request.session.close()
+        await self.runner.cleanup()
+
+
+ROUTE = Route("GET", "/route")
+
+
+def test_identical_requests_share_one_response():
+    async def main():
+        async with (server := SlowServer()) as request:
+            first = asyncio.create_task(request.request(ROUTE))
+            second = asyncio.create_task(request.request(ROUTE))
+            await asyncio.sleep(0.05)
+            server.release.set()
+            results = await asyncio.gather(first, second)
+            return results, server.requests, request._inflight
+
+    results, requests, inflight = asyncio.run(main())
+    assert results == [{"id": 9000}, {"id": 9000}]
+    assert requests == 1
+    assert not inflight
+
+
+def test_cancelled_caller_does_not_cancel_shared_request():
+    async def main():
+        async with (server := SlowServer()) as request:
+            first = asyncio.create_task(request.request(ROUTE))
+            second = asyncio.create_task(request.request(ROUTE))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            await asyncio.sleep(0)
+            server.release.set()
+
+            result = await second
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return result, server.requests, request._inflight
+
+    result, requests, inflight = asyncio.run(main())
+    assert result == {"id": 9000}
+    assert requests == 1
+    assert not inflight
+
+
+def test_inflight_entry_is_cleared_after_error():
+    async def main():
+        async with (server := SlowServer(status=503)) as request:
+            server.release.set()
+            callers = [request.request(ROUTE) for _ in range(2)]
+            results = await asyncio.gather(*callers, return_exceptions=True)
+            return results, server.requests, request._inflight
+
+    results, requests, inflight = asyncio.run(main())
+    assert all(isinstance(result, HTTPException) for result in results)
+    assert requests == 1
+    assert not inflight
+
+
+def test_inflight_entry_is_cleared_after_cancellation():
+    async def main():
+        async with (server := SlowServer()) as request:
+            caller = asyncio.create_task(request.request(ROUTE))
+            await asyncio.sleep(0.05)
+            # Отменяется сам общий запрос, например при закрытии клиента
+            for future in list(request._inflight.values()):
+                future.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await caller
+            await asyncio.sleep(0)
+            cleared = not request._inflight
+
+            server.release.set()
+            return cleared, await request.request(ROUTE), server.requests
+
+    cleared, result, requests = asyncio.run(main())
+    assert cleared
+    assert result == {"id": 9000}
+    assert requests == 2
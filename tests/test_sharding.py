@@ -0,0 +1,105 @@
+import asyncio
+from time import sleep
+
+from orjson import dumps
+
+from anilibria.api.gateway import GapRecovery, ShardedGateway
+from anilibria.api.http import HTTPClient
+from anilibria.testing.fixtures import make_event
+
+
+def _frame(data: dict) -> tuple[dict, str]:
+    return data, dumps(data).decode()
+
+
+def test_drops_frames_seen_on_another_shard():
+    gateway = ShardedGateway(HTTPClient(), [None, None])
+    first, second = gateway.shards
+    data, text = _frame(make_event("encode_progress"))
+
+    assert first._accept(data, text)
+    assert not second._accept(data, text)
+    assert gateway.duplicates == 1
+
+
+def test_keeps_frames_repeated_on_the_same_shard():
+    gateway = ShardedGateway(HTTPClient(), [None, None])
+    shard = gateway.shards[0]
+    data, text = _frame(make_event("encode_progress"))
+
+    assert shard._accept(data, text)
+    assert shard._accept(data, text)
+    assert gateway.duplicates == 0
+
+
+def test_forgets_frames_after_window():
+    gateway = ShardedGateway(HTTPClient(), [None, None], dedup_window=0.01)
+    first, second = gateway.shards
+    data, text = _frame(make_event("encode_progress"))
+
+    assert first._accept(data, text)
+    sleep(0.02)
+    assert second._accept(data, text)
+
+
+def test_connect_frames_are_not_deduplicated():
+    gateway = ShardedGateway(HTTPClient(), [None, None])
+    first, second = gateway.shards
+    # Вложенный ключ "type" не делает сообщение событием
+    data, text = _frame({"connection": "success", "api_version": "3.0", "meta": {"type": 1}})
+
+    assert first._accept(data, text)
+    assert second._accept(data, text)
+
+
+def test_subscriptions_are_routed_to_matching_shards():
+    async def main():
+        gateway = ShardedGateway(
+            HTTPClient(),
+            [
+                {"title_update": {"title": {"season": {"year": 2023}}}},
+                {"title_update": {"title": {"season": {"year": 2024}}}},
+                {"encode_progress": {}},
+                None,
+            ],
+        )
+        await gateway.subscribe(
+            {"subscribe": {"title_update": {"title": {"season": {"code": 1}}}}, "filter": "id"}
+        )
+        return [
+            [data for data in shard._subscriptions if data != {"subscribe": shard.subscription}]
+            for shard in gateway.shards
+        ]
+
+    first, second, encode, everything = asyncio.run(main())
+    title = {"season": {"year": 2023, "code": 1}}
+    assert first == [{"subscribe": {"title_update": {"title": title}}, "filter": "id"}]
+    assert second[0]["subscribe"]["title_update"]["title"]["season"]["year"] == 2024
+    assert encode == []
+    assert everything == [
+        {"subscribe": {"title_update": {"title": {"season": {"code": 1}}}}, "filter": "id"}
+    ]
+
+
+def test_conflicting_subscription_is_not_sent():
+    gateway = ShardedGateway(HTTPClient(), [{"title_update": {"title": {"id": 1}}}])
+
+    assert gateway.shards[0].route({"subscribe": {"title_update": {"title": {"id": 2}}}}) is None
+
+
+def test_shards_track_gaps_separately():
+    gateway = ShardedGateway(HTTPClient(), [None, None], gap_recovery=GapRecovery())
+    first, second = (shard.gap_recovery for shard in gateway.shards)
+
+    first.track(1, 100)
+    second.track(2, 200)
+    first.begin_gap()
+
+    # Подключение другого соединения не сбрасывает пропуск
+    assert second.end_gap() is None
+    assert first.end_gap() == 100
+
+    # Повторы и счётчики общие
+    assert not second.track(1, 100, recovered=True)
+    assert gateway.gap_recovery.duplicates == 1
+    assert gateway.gap_recovery.since == 200
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+from anilibria import AniLibriaClient, TitleStore
+from anilibria.testing import MockServer
+from anilibria.testing.fixtures import make_title
+
+
+def test_store_keeps_newer_changes(tmp_path):
+    async def main():
+        store = TitleStore(tmp_path / "titles.db")
+        await store.put(make_title(1) | {"last_change": 20})
+        await store.put(make_title(1) | {"last_change": 10})
+        assert (await store.get(id=1))["last_change"] == 20
+
+        assert await store.update(1, {"description": "Новое описание"})
+        assert not await store.update(2, {"description": "Новое описание"})
+        assert (await store.get(code="title-1"))["description"] == "Новое описание"
+        assert await store.count() == 1
+        await store.close()
+
+        # База открывается снова после закрытия
+        assert [title["id"] async for title in store] == [1]
+        await store.close()
+
+    asyncio.run(main())
+
+
+def test_store_runs_queries_outside_event_loop_thread():
+    async def main():
+        store = TitleStore()
+        await store.count()
+        loop_thread = threading.get_ident()
+        store_thread = await store._run(threading.get_ident)
+        await store.close()
+        return loop_thread, store_thread
+
+    loop_thread, store_thread = asyncio.run(main())
+    assert loop_thread != store_thread
+
+
+def test_client_syncs_and_reads_titles_from_store():
+    async def main():
+        async with MockServer() as server:
+            client = AniLibriaClient(base_url=server.base_url, store=TitleStore())
+            assert await client.sync_store() == 20
+            assert await client.sync_store() == 0
+
+            title = await client.get_title(id=9000)
+            requests = server.requests["/title"]
+            await client.close()
+        return title, requests
+
+    title, requests = asyncio.run(main())
+    assert title.id == 9000
+    assert requests == 0
@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from anilibria.api.error import HTTPException
+from anilibria.api.http import HTTPClient
+from anilibria.api.http.stream import ListReader
+from anilibria.testing.fixtures import make_title
+
+CHUNK_SIZES = [1, 2, 3, 7, 64, 1000, 64 * 1024]
+
+
+class ChunkedContent:
+    """
+    Отдаёт тело ответа частями не больше ``chunk_size`` байт, как :class:`aiohttp.StreamReader`.
+    """
+
+    def __init__(self, body: bytes) -> None:
+        self.body: bytes = body
+        self.position: int = 0
+
+    async def read(self, size: int) -> bytes:
+        chunk = self.body[self.position : self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+async def _read(body: bytes, chunk_size: int) -> tuple[list, dict]:
+    reader = ListReader(ChunkedContent(body), chunk_size)  # type: ignore
+    return [item async for item in reader], reader.rest
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_reads_items_and_rest_across_chunk_boundaries(chunk_size: int):
+    data = {
+        "pagination": {"pages": 3, "current_page": 1, "items_per_page": 2, "total_items": 6},
+        "list": [
+            make_title(9000),
+            {"id": 1234567890123, "rating": -12.5e-3, "name": "Ёжик в тумане 🦔", "tags": []},
+            12345678901234567890,
+            3.14159,
+            'строка с "кавычками" и \\u0445',
+            None,
+        ],
+        "after": 1672000000,
+    }
+    body = json.dumps(data, ensure_ascii=False, indent=1).encode()
+
+    items, rest = asyncio.run(_read(body, chunk_size))
+
+    assert items == data["list"]
+    assert rest == {"pagination": data["pagination"], "list": [], "after": 1672000000}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_reads_items_with_nested_boundaries(chunk_size: int):
+    # Вложенные объекты заканчиваются так же, как элементы списка, а в строках есть непарные скобки
+    data = {
+        "list": [
+            {"id": 1, "releases": [{"id": 2}, {"id": 3}], "files": [{"id": 4}]},
+            {"id": 5, "description": '}, {"id": 6} ]'},
+            {"id": 7, "description": "{{{"},
+            {"id": 8},
+        ],
+        "pagination": {"pages": 1},
+    }
+    body = json.dumps(data, ensure_ascii=False).encode()
+
+    items, rest = asyncio.run(_read(body, chunk_size))
+
+    assert items == data["list"]
+    assert rest == {"list": [], "pagination": {"pages": 1}}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_reads_top_level_array(chunk_size: int):
+    data = [1, 22, 333, {"ключ": "значение"}, [4, 5]]
+
+    items, rest = asyncio.run(_read(json.dumps(data).encode(), chunk_size))
+
+    assert items == data
+    assert rest == {}
+
+
+@pytest.mark.parametrize("body", [b'{"list": []}', b"[]", b"{}", b' \n{ "list" : [ ] } '])
+def test_reads_empty_responses(body: bytes):
+    items, _ = asyncio.run(_read(body, 1))
+
+    assert items == []
+
+
+def test_rejects_truncated_response():
+    with pytest.raises(ValueError):
+        asyncio.run(_read(b'{"list": [{"id": 1}, {"id"', 4))
+
+
+async def _stream_error_page() -> Exception:
+    async def bad_gateway(_: web.Request) -> web.Response:
+        return web.Response(
+            text="<html>502 Bad Gateway</html>", status=502, content_type="text/html"
+        )
+
+    app = web.Application()
+    app.router.add_get("/title/list", bad_gateway)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    http = HTTPClient(base_url=f"http://127.0.0.1:{port}")
+    try:
+        async for _ in http.stream_titles(id_list=[1]):
+            pass
+    except Exception as error:  # noqa
+        return error
+    finally:
+        await http.session.close()
+        await runner.cleanup()
+
+
+def test_stream_raises_http_exception_for_error_page():
+    error = asyncio.run(_stream_error_page())
+
+    assert isinstance(error, HTTPException)
+    assert "502" in str(error)
@@ -0,0 +1,83 @@
+import asyncio
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from orjson import dumps
+
+from anilibria.api.dispatch import Dispatch
+from anilibria.api.gateway import (
+    FrameRecorder,
+    ProcessDecoder,
+    ReplayPolicy,
+    ReplayTransport,
+    TitleUpdate,
+)
+from anilibria.api.gateway.workers import decode_frame
+from anilibria.api.http import HTTPClient
+from anilibria.testing.fixtures import make_event
+
+handled: list = []
+
+
+def handle_title(event: TitleUpdate):
+    handled.append(event)
+
+
+async def _replay(path, decoder: ProcessDecoder) -> list:
+    received = []
+    dispatch = Dispatch()
+
+    async def on_title_update(event: TitleUpdate):
+        received.append(event)
+
+    async def on_encode_progress(data: dict):
+        received.append(data)
+
+    dispatch.register("on_title_update", on_title_update)
+    dispatch.register("on_encode_progress", on_encode_progress, raw=True)
+
+    gateway = ReplayTransport(
+        HTTPClient(), replay=ReplayPolicy(path, speed=None), dispatch=dispatch, decoder=decoder
+    )
+    await gateway.start()
+    await asyncio.sleep(0)
+    await gateway.close()
+    return received
+
+
+def _record(path, kinds: tuple[str, ...]):
+    recorder = FrameRecorder(path)
+    for kind in kinds:
+        recorder.write(dumps(make_event(kind)).decode())
+    asyncio.run(recorder.close())
+
+
+@pytest.mark.parametrize("min_size", [0, 1 << 20])
+def test_decoder_structures_each_event_once(tmp_path, min_size: int):
+    path = tmp_path / "frames.bin"
+    _record(path, ("title_update", "encode_progress", "title_update"))
+
+    handled.clear()
+    decoder = ProcessDecoder(executor=ThreadPoolExecutor(2), min_size=min_size)
+    decoder.on(TitleUpdate)(handle_title)
+
+    received = asyncio.run(_replay(path, decoder))
+
+    assert len(handled) == 2
+    assert all(isinstance(event, TitleUpdate) for event in handled)
+    assert decoder.offloaded == (3 if min_size == 0 else 0)
+    assert decoder.failed == 0
+    assert [type(event) for event in received] == [TitleUpdate, dict, TitleUpdate]
+    # Обработчики клиента получают тот же объект, что и обработчики процесса
+    assert received[0] is handled[0]
+    assert received[2] is handled[1]
+
+
+def test_decoded_events_can_be_sent_between_processes():
+    text = dumps(make_event("title_update")).decode()
+
+    data, event = decode_frame(text, {}, frozenset({"title_update"}))
+
+    assert isinstance(event, TitleUpdate)
+    assert pickle.loads(pickle.dumps((data, event))) == (data, event)